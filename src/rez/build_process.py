@@ -1,17 +1,21 @@
 from __future__ import print_function
 
-from rez.packages import iter_packages
+from rez.packages import iter_packages, get_last_release_time
 from rez.exceptions import BuildProcessError, BuildContextResolveError, \
     ReleaseHookCancellingError, RezError, ReleaseError, BuildError, \
     ReleaseVCSError, _NeverError
+from rez.utils import json
 from rez.utils.logging_ import print_warning
+from rez.utils.parallel import iter_parallel
 from rez.utils.colorize import heading, Printer
 from rez.resolved_context import ResolvedContext
 from rez.release_hook import create_release_hooks
 from rez.resolver import ResolverStatus
 from rez.config import config
 from rez.vendor.enum import Enum
+from rez.vendor.six import six
 from contextlib import contextmanager
+from hashlib import sha1
 from pipes import quote
 import getpass
 import os.path
@@ -29,7 +33,8 @@ def get_build_process_types():
 
 def create_build_process(process_type, working_dir, build_system, package=None,
                          vcs=None, ensure_latest=True, skip_repo_errors=False,
-                         ignore_existing_tag=False, verbose=False, quiet=False):
+                         ignore_existing_tag=False, verbose=False, quiet=False,
+                         max_workers=None, fresh_context=False):
     """Create a `BuildProcess` instance."""
     from rez.plugin_managers import plugin_manager
     process_types = get_build_process_types()
@@ -46,7 +51,9 @@ def create_build_process(process_type, working_dir, build_system, package=None,
                skip_repo_errors=skip_repo_errors,
                ignore_existing_tag=ignore_existing_tag,
                verbose=verbose,
-               quiet=quiet)
+               quiet=quiet,
+               max_workers=max_workers,
+               fresh_context=fresh_context)
 
 
 class BuildType(Enum):
@@ -71,7 +78,8 @@ class BuildProcess(object):
 
     def __init__(self, working_dir, build_system, package=None, vcs=None,
                  ensure_latest=True, skip_repo_errors=False,
-                 ignore_existing_tag=False, verbose=False, quiet=False):
+                 ignore_existing_tag=False, verbose=False, quiet=False,
+                 max_workers=None, fresh_context=False):
         """Create a BuildProcess.
 
         Args:
@@ -91,6 +99,12 @@ class BuildProcess(object):
                 plugins.release_vcs.check_tag is False, this has no effect.
             verbose (bool): Verbose mode.
             quiet (bool): Quiet mode (overrides `verbose`).
+            max_workers (int): Maximum number of variants to build at once.
+                Each variant is built in its own build directory. If None or
+                1, variants are built one at a time.
+            fresh_context (bool): If True, always resolve build environments,
+                rather than reusing a valid context left in the build directory
+                by a previous build.
         """
         self.verbose = verbose and not quiet
         self.quiet = quiet
@@ -99,6 +113,8 @@ class BuildProcess(object):
         self.ensure_latest = ensure_latest
         self.skip_repo_errors = skip_repo_errors
         self.ignore_existing_tag = ignore_existing_tag
+        self.max_workers = max_workers or 1
+        self.fresh_context = fresh_context
 
         if vcs and vcs.pkg_root != self.working_dir:
             raise BuildProcessError(
@@ -192,6 +208,7 @@ class BuildProcessHelper(BuildProcess):
         # iterate over variants
         results = []
         num_visited = 0
+        parallel_variants = []
 
         for variant in self.package.iter_variants():
             if variants and variant.index not in variants:
@@ -200,13 +217,47 @@ class BuildProcessHelper(BuildProcess):
                     % (variant.index, self._n_of_m(variant)))
                 continue
 
+            if self.max_workers > 1:
+                parallel_variants.append(variant)
+                continue
+
             # visit the variant
             result = func(variant, **kwargs)
             results.append(result)
             num_visited += 1
 
+        if parallel_variants:
+            results = self._visit_variants_parallel(
+                func, parallel_variants, **kwargs)
+            num_visited = len(parallel_variants)
+
         return num_visited, results
 
+    def _visit_variants_parallel(self, func, variants, **kwargs):
+        # If a variant fails, no further variants are started. Variants that
+        # are already building are completed before the error is raised, so
+        # that none are left partially installed.
+        #
+        errors = []
+
+        def _visit(variant):
+            if errors:
+                return None
+
+            try:
+                return func(variant, **kwargs)
+            except:
+                errors.append(sys.exc_info())
+                return None
+
+        it = iter_parallel(_visit, variants, max_workers=self.max_workers)
+        results = [result for _, result in it]
+
+        if errors:
+            six.reraise(*errors[0])
+
+        return results
+
     def get_package_install_path(self, path):
         """Return the installation path for a package (where its payload goes).
 
@@ -250,22 +301,133 @@ class BuildProcessHelper(BuildProcess):
         else:
             package_filter = None
 
-        # create the build context
-        context = ResolvedContext(request,
-                                  package_paths=packages_path,
-                                  package_filter=package_filter,
-                                  building=True)
+        rxt_filepath = os.path.join(build_path, "build.rxt")
+        cache_key = self._get_build_context_key(request, packages_path)
+
+        # reuse the context of a previous build, if still valid
+        context = self._load_cached_build_context(rxt_filepath, cache_key)
+
+        if context is None:
+            self._remove_cached_build_context(rxt_filepath)
+
+            context = ResolvedContext(request,
+                                      package_paths=packages_path,
+                                      package_filter=package_filter,
+                                      building=True)
+        else:
+            self._print("Reusing build environment from previous build")
+
         if self.verbose:
             context.print_info()
 
         # save context before possible fail, so user can debug
-        rxt_filepath = os.path.join(build_path, "build.rxt")
         context.save(rxt_filepath)
 
         if context.status != ResolverStatus.solved:
             raise BuildContextResolveError(context)
+
+        if context.load_path is None:
+            self._save_cached_build_context(context, rxt_filepath, cache_key)
+
         return context, rxt_filepath
 
+    def _get_build_context_key(self, request, packages_path):
+        from rez import __version__
+        from rez.package_repository import package_repository_manager
+
+        repo_uids = [
+            str(package_repository_manager.get_repository(x).uid)
+            for x in packages_path
+        ]
+
+        data = [
+            __version__,
+            [str(x) for x in request],
+            list(self.package.config.implicit_packages),
+            repo_uids,
+            self.package.config.package_filter,
+            self.package.config.package_orderers
+        ]
+
+        return sha1(json.dumps(data).encode("utf-8")).hexdigest()
+
+    def _load_cached_build_context(self, rxt_filepath, cache_key):
+        """Load the context left by a previous build, if it is still valid.
+
+        The same rules as for memcached resolves apply - the context is
+        invalid if any of its packages have been modified, or if a package
+        in any of its families has been released since.
+        """
+        if self.fresh_context or not self.package.config.resolve_caching:
+            return None
+
+        try:
+            with open(rxt_filepath + ".cache") as f:
+                data = json.loads(f.read())
+        except (IOError, OSError, ValueError):
+            return None
+
+        if data.get("key") != cache_key:
+            return None
+
+        release_times = data.get("release_times", {})
+        variant_states = data.get("variant_states", {})
+
+        try:
+            context = ResolvedContext.load(rxt_filepath)
+
+            for variant in context.resolved_packages:
+                time_ = get_last_release_time(variant.name,
+                                              context.package_paths)
+                if time_ != release_times.get(variant.name):
+                    return None
+
+                repo = variant.resource._repository
+                state = repo.get_variant_state_handle(variant.resource)
+                if str(state) != variant_states.get(variant.name):
+                    return None
+
+        except Exception as e:
+            debug_print("Cannot reuse build context %s: %s", rxt_filepath, e)
+            return None
+
+        return context
+
+    @classmethod
+    def _remove_cached_build_context(cls, rxt_filepath):
+        try:
+            os.remove(rxt_filepath + ".cache")
+        except OSError:
+            pass
+
+    def _save_cached_build_context(self, context, rxt_filepath, cache_key):
+        release_times = {}
+        variant_states = {}
+
+        for variant in context.resolved_packages:
+            time_ = get_last_release_time(variant.name, context.package_paths)
+
+            # don't cache if a release time isn't known
+            if time_ == 0:
+                return
+
+            repo = variant.resource._repository
+            release_times[variant.name] = time_
+            variant_states[variant.name] = \
+                str(repo.get_variant_state_handle(variant.resource))
+
+        data = {
+            "key": cache_key,
+            "release_times": release_times,
+            "variant_states": variant_states
+        }
+
+        try:
+            with open(rxt_filepath + ".cache", 'w') as f:
+                f.write(json.dumps(data))
+        except (IOError, OSError) as e:
+            debug_print("Failed to write %s: %s", rxt_filepath + ".cache", e)
+
     def pre_release(self):
         release_settings = self.package.config.plugins.release_vcs
 
@@ -1,4 +1,7 @@
+from contextlib import contextmanager
 import os.path
+import subprocess
+import threading
 
 from rez.build_process import BuildType
 from rez.exceptions import BuildSystemError
@@ -167,6 +170,9 @@ class BuildSystem(object):
 
         self.opts = opts
 
+        # see `log_output`
+        self._log = threading.local()
+
     @classmethod
     def is_valid_root(cls, path):
         """Return True if this build system can build the source in path."""
@@ -199,6 +205,41 @@ class BuildSystem(object):
         """
         pass
 
+    @contextmanager
+    def log_output(self, filepath):
+        """Write the output of build commands run in this thread to a file.
+
+        This is used when variants are built concurrently, so that the output
+        of each build is kept separate.
+
+        Args:
+            filepath (str): Log file to write, any existing file is replaced.
+        """
+        with open(filepath, 'w') as f:
+            self._log.file = f
+            try:
+                yield
+            finally:
+                self._log.file = None
+
+    def get_shell_output_args(self):
+        """Get the output args that build commands should be run with.
+
+        Build systems should pass these to `ResolvedContext.execute_shell`,
+        so that output is written to the log file set by `log_output`.
+
+        Returns:
+            dict: Extra keyword args for `ResolvedContext.execute_shell`.
+        """
+        f = getattr(self._log, "file", None)
+        if f is None:
+            return {}
+
+        return {
+            "stdout": f,
+            "stderr": subprocess.STDOUT
+        }
+
     def build(self, context, variant, build_path, install_path, install=False,
               build_type=BuildType.local):
         """Implement this method to perform the actual build.
@@ -1,18 +1,29 @@
+from contextlib import contextmanager
+from hashlib import sha1
 import os
 import os.path
 import stat
+import time
 
 from rez.package_copy import copy_package
 from rez.exceptions import ContextBundleError
 from rez.utils.logging_ import print_info, print_warning
 from rez.utils.yaml import save_yaml
+from rez.utils.parallel import iter_parallel
 from rez.utils.platform_ import platform_
-from rez.utils.filesystem import is_subdirectory
+from rez.utils.filesystem import is_subdirectory, make_path_writable, \
+    make_tmp_name, replace_file_or_dir
+from rez.utils.formatting import readable_memory_size
 from rez.util import which
 
 
+# number of files passed to each readelf/patchelf call
+elf_batch_size = 64
+
+
 def bundle_context(context, dest_dir, force=False, skip_non_relocatable=False,
-                   quiet=False, patch_libs=False, verbose=False):
+                   quiet=False, patch_libs=False, verbose=False, dedupe=False,
+                   max_workers=None):
     """Bundle a context and its variants into a relocatable dir.
 
     This creates a copy of a context with its variants retargeted to a local
@@ -39,6 +50,13 @@ def bundle_context(context, dest_dir, force=False, skip_non_relocatable=False,
             bundle to patch any references to external packages back to their
             equivalents within the bundle. See the wiki for more details on this.
         verbose (bool): Verbose mode (quiet will override)
+        dedupe (bool): If True, files that are identical across the bundled
+            packages (same contents and permissions) are replaced with
+            hardlinks to a single copy. Note that hardlinked files also share
+            their modification time.
+        max_workers (int): Maximum number of variants to copy, and of
+            readelf/patchelf processes to run, at once. Defaults to
+            `rez.utils.parallel.get_default_max_workers`.
     """
     bundler = _ContextBundler(
         context=context,
@@ -47,7 +65,9 @@ def bundle_context(context, dest_dir, force=False, skip_non_relocatable=False,
         skip_non_relocatable=skip_non_relocatable,
         patch_libs=patch_libs,
         quiet=quiet,
-        verbose=verbose
+        verbose=verbose,
+        dedupe=dedupe,
+        max_workers=max_workers
     )
 
     bundler.bundle()
@@ -57,7 +77,8 @@ class _ContextBundler(object):
     """Performs context bundling.
     """
     def __init__(self, context, dest_dir, force=False, skip_non_relocatable=False,
-                 quiet=False, patch_libs=False, verbose=False):
+                 quiet=False, patch_libs=False, verbose=False, dedupe=False,
+                 max_workers=None):
         if quiet:
             verbose = False
         if force:
@@ -70,9 +91,14 @@ class _ContextBundler(object):
         self.quiet = quiet
         self.patch_libs = patch_libs
         self.verbose = verbose
+        self.dedupe = dedupe
+        self.max_workers = max_workers
 
         self.logs = []
 
+        # list of (stage name, seconds)
+        self.stage_times = []
+
         # dict with:
         # key: package name
         # value: (Variant, Variant) (src and dest variants)
@@ -90,18 +116,35 @@ class _ContextBundler(object):
         self._init_bundle()
 
         # copy the variants from the context into the bundle
-        relocated_package_names = self._copy_variants()
+        with self._stage("copy variants"):
+            relocated_package_names = self._copy_variants()
 
         # write a copy of the context, with refs changed to bundled variants
-        self._write_retargeted_context(relocated_package_names)
+        with self._stage("write context"):
+            self._write_retargeted_context(relocated_package_names)
 
         # apply patching to retarget dynamic linker to bundled packages
         if self.patch_libs:
-            self._patch_libs()
+            with self._stage("patch libs"):
+                self._patch_libs()
+
+        # Hardlink identical files. This is done after patching, because
+        # identical libs may have been patched differently.
+        #
+        if self.dedupe:
+            with self._stage("dedupe files"):
+                self._dedupe_files()
 
         # finalize the bundle
         self._finalize_bundle()
 
+        if not self.quiet:
+            print_info(
+                "Bundled in %.2f secs (%s)",
+                sum(x[1] for x in self.stage_times),
+                ", ".join("%s: %.2f secs" % x for x in self.stage_times)
+            )
+
     @property
     def _repo_path(self):
         return os.path.join(self.dest_dir, "packages")
@@ -117,6 +160,15 @@ class _ContextBundler(object):
         print_warning(msg, *nargs)
         self.logs.append("WARNING: %s" % (msg % nargs))
 
+    @contextmanager
+    def _stage(self, name):
+        t = time.time()
+        yield
+        secs = time.time() - t
+
+        self.stage_times.append((name, secs))
+        self._info("Stage '%s' took %.2f secs", name, secs)
+
     def _init_bundle(self):
         os.mkdir(self.dest_dir)
         os.mkdir(self._repo_path)
@@ -144,6 +196,7 @@ class _ContextBundler(object):
 
     def _copy_variants(self):
         relocated_package_names = []
+        variants = []
 
         for variant in self.context.resolved_packages:
             package = variant.parent
@@ -155,23 +208,32 @@ class _ContextBundler(object):
                 )
                 continue
 
-            result = copy_package(
-                package=package,
+            variants.append(variant)
+
+        def _copy_variant(variant):
+            return copy_package(
+                package=variant.parent,
                 dest_repository=self._repo_path,
                 variants=[variant.index],
                 force=self.force,
                 keep_timestamp=True,
-                verbose=self.verbose
+                verbose=self.verbose,
+                max_workers=1
             )
 
+        # each variant belongs to a different package, so they are copied
+        # concurrently
+        #
+        for variant, result in iter_parallel(_copy_variant, variants,
+                                             max_workers=self.max_workers):
             assert "copied" in result
             assert len(result["copied"]) == 1
             src_variant, dest_variant = result["copied"][0]
 
-            self.copied_variants[package.name] = (src_variant, dest_variant)
+            self.copied_variants[variant.name] = (src_variant, dest_variant)
             self._info("Copied %s to %s", src_variant.uri, dest_variant.uri)
 
-            relocated_package_names.append(package.name)
+            relocated_package_names.append(variant.name)
 
         return relocated_package_names
 
@@ -200,8 +262,12 @@ class _ContextBundler(object):
         Finds elf files, inspects their runpath/rpath, then looks to see if
         those paths map to packages also inside the bundle. If they do, those
         rpath entries are remapped to form "$ORIGIN/{relative-path}".
+
+        Files are inspected and patched in batches (one readelf or patchelf
+        process per batch), and batches are processed concurrently.
         """
-        from rez.utils.elf import get_rpaths, patch_rpaths
+        from rez.utils.elf import get_rpaths_batch, patch_rpaths_batch, \
+            patch_rpaths
 
         elfs = self._find_files(
             executable=True,
@@ -222,63 +288,34 @@ class _ContextBundler(object):
             )
             return
 
-        for elf in elfs:
+        # Get rpaths of all elfs. Note that there can be lots of files that
+        # are not elfs, due to executable shebanged scripts. These are not
+        # present in the result.
+        #
+        def _get_rpaths(elfs_):
             try:
-                rpaths = get_rpaths(elf)
-            except RuntimeError as e:
+                return get_rpaths_batch(elfs_)
+            except (OSError, RuntimeError) as e:
+                return {}, [str(e)]
 
-                # there can be lots of false positives (not an elf) due to
-                # executable shebanged scripts. Ignore these.
-                #
-                msg = str(e)
-                if "Not an ELF file" in msg or \
-                        "Failed to read file header" in msg:
-                    continue
+        all_rpaths = {}
+        for _, (rpaths, errors) in iter_parallel(
+                _get_rpaths, self._batches(elfs),
+                max_workers=self.max_workers):
+            all_rpaths.update(rpaths)
 
-                self._warning(msg)
-                continue
+            for error in errors:
+                self._warning(error)
+
+        # determine the new rpaths of each elf, and group elfs by them
+        elfs_by_rpaths = {}
 
+        for elf in elfs:
+            rpaths = all_rpaths.get(elf)
             if not rpaths:
                 continue  # nothing to do
 
-            # remap rpath entries where equivalent bundled path is found
-            new_rpaths = []
-
-            for rpath in rpaths:
-
-                # leave relpaths as-is, can't do sensible remapping.
-                # Note that os.path.isabs('$ORIGIN/...') equates to False
-                #
-                if not os.path.isabs(rpath):
-                    new_rpaths.append(rpath)
-                    continue
-
-                new_rpath = None
-
-                for (src_variant, dest_variant) in self.copied_variants.values():
-                    if is_subdirectory(rpath, src_variant.root):
-
-                        # rpath is within the payload of another package that
-                        # is present in the bundle. Here we remap to
-                        # '$ORIGIN/{relpath}' form
-                        #
-                        relpath = os.path.relpath(rpath, src_variant.root)
-                        new_rpath_abs = os.path.join(dest_variant.root, relpath)
-
-                        elfpath = os.path.dirname(elf)
-                        new_rel_rpath = os.path.relpath(new_rpath_abs, elfpath)
-
-                        new_rpath = os.path.join("$ORIGIN", new_rel_rpath)
-                        break
-
-                if new_rpath:
-                    new_rpaths.append(new_rpath)
-                    self._info(
-                        "Remapped rpath %s in file %s to %s",
-                        rpath, elf, new_rpath
-                    )
-                else:
-                    new_rpaths.append(rpath)
+            new_rpaths = self._remap_rpaths(elf, rpaths)
 
             if new_rpaths == rpaths:
                 self._info(
@@ -296,30 +333,182 @@ class _ContextBundler(object):
                 )
                 continue
 
+            elfs_by_rpaths.setdefault(tuple(new_rpaths), []).append(elf)
+
+        # patch elfs that share the same new rpaths together
+        def _patch(item):
+            new_rpaths, elfs_ = item
+
             try:
-                patch_rpaths(elf, new_rpaths)
+                patch_rpaths_batch(elfs_, new_rpaths)
+                return elfs_
             except RuntimeError as e:
-                self._warning(str(e))
+                if len(elfs_) == 1:
+                    self._warning(str(e))
+                    return []
+
+            # older patchelf versions only accept a single file
+            patched = []
+            for elf in elfs_:
+                try:
+                    patch_rpaths(elf, new_rpaths)
+                    patched.append(elf)
+                except RuntimeError as e:
+                    self._warning(str(e))
+
+            return patched
+
+        items = []
+        for new_rpaths, elfs_ in sorted(elfs_by_rpaths.items()):
+            for batch in self._batches(elfs_):
+                items.append((list(new_rpaths), batch))
+
+        for (new_rpaths, _), patched in iter_parallel(
+                _patch, items, max_workers=self.max_workers):
+            for elf in patched:
+                self._info(
+                    "Patched rpaths in file %s from [%s] to [%s]",
+                    elf, ':'.join(all_rpaths[elf]), ':'.join(new_rpaths)
+                )
+
+    def _remap_rpaths(self, elf, rpaths):
+        # remap rpath entries where equivalent bundled path is found
+        new_rpaths = []
+
+        for rpath in rpaths:
+
+            # leave relpaths as-is, can't do sensible remapping.
+            # Note that os.path.isabs('$ORIGIN/...') equates to False
+            #
+            if not os.path.isabs(rpath):
+                new_rpaths.append(rpath)
                 continue
 
-            self._info(
-                "Patched rpaths in file %s from [%s] to [%s]",
-                elf, ':'.join(rpaths), ':'.join(new_rpaths)
-            )
+            new_rpath = None
 
-    def _find_files(self, executable=False, filename_substrs=None):
-        found_files = []
+            for (src_variant, dest_variant) in self.copied_variants.values():
+                if is_subdirectory(rpath, src_variant.root):
+
+                    # rpath is within the payload of another package that
+                    # is present in the bundle. Here we remap to
+                    # '$ORIGIN/{relpath}' form
+                    #
+                    relpath = os.path.relpath(rpath, src_variant.root)
+                    new_rpath_abs = os.path.join(dest_variant.root, relpath)
+
+                    elfpath = os.path.dirname(elf)
+                    new_rel_rpath = os.path.relpath(new_rpath_abs, elfpath)
+
+                    new_rpath = os.path.join("$ORIGIN", new_rel_rpath)
+                    break
+
+            if new_rpath:
+                new_rpaths.append(new_rpath)
+                self._info(
+                    "Remapped rpath %s in file %s to %s",
+                    rpath, elf, new_rpath
+                )
+            else:
+                new_rpaths.append(rpath)
+
+        return new_rpaths
+
+    def _dedupe_files(self):
+        """Replace identical files in the bundle with hardlinks.
+
+        Files are compared by size and permissions first, so only files that
+        could be identical are read.
+        """
+        if not hasattr(os, "link"):
+            self._info("Hardlinks not supported, thus no deduplication "
+                       "performed")
+            return
+
+        # group files by size and mode
+        candidates = {}
+
+        for filepath in self._find_files(all_files=True):
+            st = os.lstat(filepath)
+            if not st.st_size:
+                continue
+
+            key = (st.st_size, stat.S_IMODE(st.st_mode))
+            candidates.setdefault(key, []).append(filepath)
+
+        filepaths = []
+        for filepaths_ in candidates.values():
+            if len(filepaths_) > 1:
+                filepaths.extend(filepaths_)
+
+        # group files by content
+        def _hash(filepath):
+            digest = sha1()
+            with open(filepath, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            return digest.hexdigest()
+
+        duplicates = {}
+        for filepath, digest in iter_parallel(_hash, filepaths,
+                                              max_workers=self.max_workers):
+            st = os.lstat(filepath)
+            key = (st.st_size, stat.S_IMODE(st.st_mode), digest)
+            duplicates.setdefault(key, []).append(filepath)
+
+        # replace duplicates with hardlinks
+        num_files = 0
+        num_bytes = 0
+
+        for (size, _, _), filepaths_ in duplicates.items():
+            src_filepath = filepaths_[0]
+            src_st = os.lstat(src_filepath)
+
+            for filepath in filepaths_[1:]:
+                st = os.lstat(filepath)
+                if (st.st_dev, st.st_ino) == (src_st.st_dev, src_st.st_ino):
+                    continue  # already linked
+
+                with make_path_writable(os.path.dirname(filepath)):
+                    with make_tmp_name(filepath) as tmp_filepath:
+                        os.link(src_filepath, tmp_filepath)
+                        replace_file_or_dir(filepath, tmp_filepath)
+
+                self._verbose_info("Hardlinked %s to identical file %s",
+                                   filepath, src_filepath)
+
+                num_files += 1
+                num_bytes += size
+
+        self._info(
+            "Replaced %d duplicate files with hardlinks, saving %s",
+            num_files, readable_memory_size(num_bytes)
+        )
+
+    def _batches(self, items):
+        return [
+            items[i:i + elf_batch_size]
+            for i in range(0, len(items), elf_batch_size)
+        ]
+
+    def _find_files(self, executable=False, filename_substrs=None,
+                    all_files=False):
+
+        # search the payload of each package concurrently
+        def _find(dest_variant):
+            found_files = []
 
-        # iterate over payload of each package
-        for (_, dest_variant) in self.copied_variants.values():
             for root, _, files in os.walk(dest_variant.root):
-                self._verbose_info("Searching for elfs to patch in %s...", root)
+                self._verbose_info("Searching for files in %s...", root)
 
                 for filename in files:
                     filepath = os.path.join(root, filename)
                     if os.path.islink(filepath):
                         continue
 
+                    if all_files:
+                        found_files.append(filepath)
+                        continue
+
                     if executable:
                         st = os.stat(filepath)
                         if st.st_mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH):
@@ -331,4 +520,13 @@ class _ContextBundler(object):
                             found_files.append(filepath)
                             break
 
+            return found_files
+
+        dest_variants = [x[1] for x in self.copied_variants.values()]
+        found_files = []
+
+        for _, files in iter_parallel(_find, dest_variants,
+                                      max_workers=self.max_workers):
+            found_files.extend(files)
+
         return found_files
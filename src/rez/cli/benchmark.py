@@ -28,6 +28,41 @@ def setup_parser(parser, completions=False):
         "--iterations", type=int, default=1, metavar="N",
         help="Run every resolve N times and take the average (default: %(default)s)"
     )
+    parser.add_argument(
+        "-t", "--time", type=str,
+        help="Perform timestamped resolves, ignoring packages released after "
+        "the given time (epoch time, or relative time such as -10d). The "
+        "package cache is not warmed in this mode, so that package loading "
+        "time is included in resolve times"
+    )
+    parser.add_argument(
+        "--no-timestamp-index", action="store_true",
+        help="Do not create or use package timestamp indexes (only relevant "
+        "with --time)"
+    )
+    parser.add_argument(
+        "--filter-rules", type=int, default=0, metavar="N",
+        help="Resolve with a synthetic package filter of N rules, none of "
+        "which exclude any package, and time the filtering of every package "
+        "in the benchmark repo"
+    )
+    parser.add_argument(
+        "--startup", action="store_true",
+        help="Measure the startup latency of rez-env, rez-context and suite "
+        "tool wrappers instead of resolve times. Each command is run "
+        "--iterations times, and per-module import times are recorded"
+    )
+    parser.add_argument(
+        "--env", type=int, default=0, metavar="N",
+        help="Measure the time taken to generate the environment of a "
+        "context of N packages, each of which changes several path variables, "
+        "instead of resolve times"
+    )
+    parser.add_argument(
+        "--top-imports", type=int, default=20, metavar="N",
+        help="Number of most expensive imports to report in --startup mode "
+        "(default: %(default)s)"
+    )
     parser.add_argument(
         "--histogram", action="store_true",
         help="Show an ASCII histogram of resolve times (from results in --out)"
@@ -63,6 +98,99 @@ def load_packages():
     print('')
 
 
+def create_timestamp_indexes():
+    """Index package timestamps, as would have been done on release
+    """
+    from rez.package_repository import package_repository_manager
+
+    print("Creating timestamp indexes...")
+    repo = package_repository_manager.get_repository(pkg_repo_dir)
+
+    for fam in repo.iter_package_families():
+        repo.update_timestamp_index(fam.name)
+
+    repo.clear_caches()
+
+
+def create_package_filter(num_rules):
+    """Create a package filter containing many rules that don't match.
+
+    This mimics large studio-wide filters, without changing resolve results.
+    """
+    from rez.package_filter import PackageFilter, PackageFilterList, Rule, \
+        TimestampRule
+    from rez.packages import iter_package_families
+
+    fams = sorted(x.name for x in iter_package_families(paths=[pkg_repo_dir]))
+    package_filter = PackageFilter()
+
+    for i in range(num_rules):
+        fam = fams[(i // 4) % len(fams)]
+        kind = i % 4
+
+        if kind == 0:
+            rule = Rule.parse_rule("%s-99999.%d+" % (fam, i))
+        elif kind == 1:
+            rule = Rule.parse_rule("%s-*.alpha%d" % (fam, i))
+        elif kind == 2:
+            rule = Rule.parse_rule("regex(.*\\.dev%d$)" % i)
+        else:
+            rule = TimestampRule.after(4000000000 + i, family=fam)
+
+        package_filter.add_exclusion(rule)
+
+    filters = PackageFilterList()
+    filters.add_filter(package_filter)
+    return filters
+
+
+def time_package_filter(package_filter):
+    """Time the filtering of all packages, with compiled and single rules.
+    """
+    from rez.packages import iter_package_families
+
+    packages = []
+    for fam in iter_package_families(paths=[pkg_repo_dir]):
+        packages.extend(fam.iter_packages())
+
+    for pkg in packages:
+        pkg.timestamp  # so package loading doesn't impact filter times
+
+    def _match(rules, package):
+        for rule in rules or []:
+            if rule.match(package):
+                return rule
+        return None
+
+    def _excludes(f, package):
+        excl = (_match(f._excludes.get(package.name), package)
+                or _match(f._excludes.get(None), package))
+        if excl and (_match(f._includes.get(package.name), package)
+                     or _match(f._includes.get(None), package)):
+            excl = None
+        return excl
+
+    print("Filtering %d packages..." % len(packages))
+
+    t = time.time()
+    for pkg in packages:
+        package_filter.excludes(pkg)
+    filter_time = time.time() - t
+
+    t = time.time()
+    for pkg in packages:
+        for f in package_filter.filters:
+            if _excludes(f, pkg):
+                break
+    uncompiled_filter_time = time.time() - t
+
+    return {
+        "filter_num_packages": len(packages),
+        "filter_time": filter_time,
+        "uncompiled_filter_time": uncompiled_filter_time
+    }
+
+
 def get_system_info():
     """Get system info that might affect resolve time.
     """
@@ -112,12 +240,22 @@ def get_system_info():
 def do_resolves():
     from rez import module_root_path
     from rez.resolved_context import ResolvedContext
+    from rez.package_repository import package_repo_stats
     from rez.solver import SolverCallbackReturn
+    from rez.utils.formatting import get_epoch_time_from_str
 
     filepath = os.path.join(module_root_path, "data", "benchmarking", "requests.json")
     with open(filepath) as f:
         requests = json.loads(f.read())
 
+    timestamp = get_epoch_time_from_str(_opts.time) if _opts.time else None
+
+    filter_stats = {}
+    if _opts.filter_rules:
+        package_filter = create_package_filter(_opts.filter_rules)
+    else:
+        package_filter = None
+
     print("Performing %d resolves..." % len(requests))
 
     def callback(solver_state):
@@ -142,24 +280,30 @@ def do_resolves():
         # perform the resolve
         try:
             secs = 0.0
+            load_secs = package_repo_stats.package_load_time
 
             for _ in range(_opts.iterations):
                 t = time.time()
                 ctxt = ResolvedContext(
                     package_requests=request_list,
                     package_paths=[pkg_repo_dir],
+                    timestamp=timestamp,
+                    package_filter=package_filter,
                     add_implicit_packages=False,
                     callback=callback
                 )
                 secs += time.time() - t
 
             resolve_time = secs / _opts.iterations
+            load_time = (package_repo_stats.package_load_time - load_secs) \
+                / _opts.iterations
             print('\n')
 
             if ctxt.success:
                 summary.update({
                     "status": "success",
                     "resolve_time": resolve_time,
+                    "load_time": load_time,
                     "resolved_packages": [
                         os.path.relpath(x.uri, pkg_repo_dir)
                         for x in ctxt.resolved_packages
@@ -168,7 +312,8 @@ def do_resolves():
             else:
                 summary.update({
                     "status": "failed",
-                    "resolve_time": resolve_time
+                    "resolve_time": resolve_time,
+                    "load_time": load_time
                 })
 
         except Exception as e:
@@ -187,6 +332,10 @@ def do_resolves():
 
     # calculate, print results and store to file
     total_secs = time.time() - t_start
+
+    if package_filter is not None:
+        filter_stats = time_package_filter(package_filter)
+        filter_stats["filter_num_rules"] = _opts.filter_rules
     errors = [x for x in summaries if x["status"] == "error"]
     fails = [x for x in summaries if x["status"] == "failed"]
     resolve_times = [
@@ -197,11 +346,16 @@ def do_resolves():
 
     stats = {
         "total_run_time": total_secs,
+        "total_load_time": sum(x.get("load_time", 0.0) for x in summaries),
+        "timestamp": timestamp,
+        "timestamp_index": (timestamp is not None
+                            and not _opts.no_timestamp_index),
         "num_success_resolves": n_resolve_times,
         "num_error_resolves": len(errors),
         "num_failed_resolves": len(fails),
     }
 
+    stats.update(filter_stats)
     stats.update(get_system_info())
 
     if resolve_times:
@@ -232,6 +386,7 @@ def do_resolves():
 
 def run_benchmark():
     from rez import module_root_path
+    from rez.config import config
     from rez.utils.execution import Popen
 
     if os.path.exists(out_dir):
@@ -244,6 +399,14 @@ def run_benchmark():
     os.mkdir(out_dir)
     print("Writing results to %s..." % out_dir)
 
+    if _opts.startup:
+        do_startup()
+        return
+
+    if _opts.env:
+        do_env()
+        return
+
     # extract package repo
     filepath = os.path.join(module_root_path, "data", "benchmarking", "packages.tar.gz")
     proc = Popen(
@@ -252,10 +415,317 @@ def run_benchmark():
     )
     proc.wait()
 
-    load_packages()
+    if _opts.time:
+        if _opts.no_timestamp_index:
+            config.override(
+                "plugins.package_repository.filesystem.timestamp_index", False)
+        else:
+            create_timestamp_indexes()
+    else:
+        load_packages()
+
     do_resolves()
 
 
+def create_startup_environment():
+    """Create a package, context and suite to time startup with.
+
+    Returns:
+        dict: Command name -> (rez subcommand args, extra environ vars).
+    """
+    from rez.resolved_context import ResolvedContext
+    from rez.suite import Suite
+
+    root = os.path.join(pkg_repo_dir, "foo", "1.0.0")
+    bin_path = os.path.join(root, "bin")
+    os.makedirs(bin_path)
+
+    with open(os.path.join(root, "package.py"), 'w') as f:
+        f.write(
+            "name = 'foo'\n"
+            "version = '1.0.0'\n"
+            "tools = ['footool']\n"
+            "def commands():\n"
+            "    env.PATH.append('{root}/bin')\n"
+        )
+
+    tool_filepath = os.path.join(bin_path, "footool")
+    with open(tool_filepath, 'w') as f:
+        f.write("#!/bin/sh\nexit 0\n")
+    os.chmod(tool_filepath, 0o755)
+
+    context = ResolvedContext(
+        package_requests=["foo"],
+        package_paths=[pkg_repo_dir],
+        add_implicit_packages=False
+    )
+
+    context_filepath = os.path.join(out_dir, "foo.rxt")
+    context.save(context_filepath)
+
+    suite = Suite()
+    suite.add_context("foo", context)
+    suite_path = os.path.join(out_dir, "suite")
+    suite.save(suite_path)
+
+    env_args = ["env", "--paths", pkg_repo_dir, "--ni", "foo", "--", "true"]
+
+    return {
+        "rez-env": (env_args, {}),
+        # the same command, run via a subshell rather than directly
+        "rez-env-shell": (env_args, {"REZ_DIRECT_COMMAND_EXECUTION": "0"}),
+        "rez-context": (["context", context_filepath], {}),
+        "suite-tool": (
+            ["forward", os.path.join(suite_path, "bin", "footool")], {}
+        )
+    }
+
+
+def time_startup_command(args, environ=None):
+    """Time a rez command run in a new python process.
+
+    Returns:
+        dict: Wall times, and import times (in seconds) of each module,
+        summed over all iterations.
+    """
+    from rez import module_root_path
+    from rez.utils.execution import Popen
+
+    env = os.environ.copy()
+    pythonpath = [os.path.dirname(module_root_path)]
+    if env.get("PYTHONPATH"):
+        pythonpath.append(env["PYTHONPATH"])
+    env["PYTHONPATH"] = os.pathsep.join(pythonpath)
+    env.update(environ or {})
+
+    # -X importtime is available in python >= 3.7
+    importtime = (sys.version_info[:2] >= (3, 7))
+
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += ["-m", "rez.cli._main"] + args
+
+    wall_times = []
+    import_times = {}
+
+    for _ in range(_opts.iterations):
+        t = time.time()
+        proc = Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+            text=True
+        )
+        _, err = proc.communicate()
+        wall_times.append(time.time() - t)
+
+        if proc.returncode:
+            raise RuntimeError("Command %r failed:\n%s" % (cmd, err))
+
+        # lines are like 'import time: self [us] | cumulative | imported package'
+        for line in err.split('\n'):
+            if not line.startswith("import time:"):
+                continue
+
+            parts = line[len("import time:"):].split('|')
+            try:
+                self_us = int(parts[0])
+            except ValueError:
+                continue  # header
+
+            module = parts[2].strip()
+            import_times[module] = import_times.get(module, 0) \
+                + (self_us / 1000000.0)
+
+        sys.stdout.write('.')
+        sys.stdout.flush()
+
+    return {
+        "wall_times": wall_times,
+        "import_times": import_times if importtime else None
+    }
+
+
+def do_startup():
+    """Measure the startup latency of rez commands.
+    """
+    from rez.config import config
+
+    n = _opts.iterations
+
+    print("Creating startup environment...")
+    commands = create_startup_environment()
+
+    stats = {}
+
+    for name, (args, environ) in sorted(commands.items()):
+        sys.stdout.write("Timing %s" % name)
+        sys.stdout.flush()
+
+        result = time_startup_command(args, environ)
+        print('')
+
+        wall_times = sorted(result["wall_times"])
+        stats[name] = {
+            "median": wall_times[len(wall_times) // 2],
+            "mean": sum(wall_times) / float(n),
+            "min": wall_times[0],
+            "max": wall_times[-1]
+        }
+
+        import_times = result["import_times"]
+        if import_times is not None:
+            top_imports = sorted(
+                import_times.items(), key=lambda x: x[1], reverse=True
+            )[:_opts.top_imports]
+
+            plugin_import_times = [
+                v for k, v in import_times.items()
+                if k.startswith("rezplugins.")
+            ]
+
+            stats[name].update({
+                "num_imports": len(import_times),
+                "import_time": sum(import_times.values()) / n,
+                "num_plugin_imports": len(plugin_import_times),
+                "plugin_import_time": sum(plugin_import_times) / n,
+                "top_imports": [[k, v / n] for k, v in top_imports]
+            })
+
+    stats.update(get_system_info())
+    stats["iterations"] = n
+    stats["plugin_cache"] = bool(config.plugin_cache_path)
+
+    print("\n\nRESULT:")
+    stats_str = json.dumps(stats, indent=2)
+    print(stats_str)
+
+    with open(os.path.join(out_dir, "startup.json"), 'w') as f:
+        f.write(stats_str)
+
+
+def create_env_packages(num_packages):
+    """Create packages whose commands change typical path variables.
+
+    Returns:
+        list of str: Package requests.
+    """
+    requests = []
+
+    for i in range(num_packages):
+        name = "env%04d" % i
+        root = os.path.join(pkg_repo_dir, name, "1.0.0")
+        os.makedirs(root)
+
+        with open(os.path.join(root, "package.py"), 'w') as f:
+            f.write(
+                "name = '%s'\n"
+                "version = '1.0.0'\n"
+                "def commands():\n"
+                "    env.PATH.prepend('{root}/bin')\n"
+                "    env.PYTHONPATH.prepend('{root}/python')\n"
+                "    env.LD_LIBRARY_PATH.append('{root}/lib')\n"
+                "    env.%s_ROOT = '{root}'\n"
+                % (name, name.upper())
+            )
+
+        requests.append(name)
+
+    return requests
+
+
+def do_env():
+    """Measure the time taken to generate a large context's environment.
+    """
+    from rez.config import config
+    from rez.resolved_context import ResolvedContext
+
+    n = _opts.iterations
+
+    print("Creating %d packages..." % _opts.env)
+    requests = create_env_packages(_opts.env)
+
+    # the env cache would otherwise hide the cost of interpreting commands
+    config.override("context_env_cache_path", None)
+
+    context = ResolvedContext(
+        package_requests=requests,
+        package_paths=[pkg_repo_dir],
+        add_implicit_packages=False
+    )
+
+    funcs = {
+        "get_environ": context.get_environ,
+        "get_shell_code": lambda: context.get_shell_code(shell="bash")
+    }
+
+    stats = {}
+
+    for name, func in sorted(funcs.items()):
+        sys.stdout.write("Timing %s" % name)
+        sys.stdout.flush()
+
+        times = []
+        for _ in range(n):
+            t = time.time()
+            func()
+            times.append(time.time() - t)
+
+            sys.stdout.write('.')
+            sys.stdout.flush()
+
+        print('')
+        times = sorted(times)
+        stats[name] = {
+            "median": times[len(times) // 2],
+            "mean": sum(times) / float(n),
+            "min": times[0],
+            "max": times[-1]
+        }
+
+    stats.update(get_system_info())
+    stats["iterations"] = n
+    stats["num_packages"] = _opts.env
+
+    print("\n\nRESULT:")
+    stats_str = json.dumps(stats, indent=2)
+    print(stats_str)
+
+    with open(os.path.join(out_dir, "env.json"), 'w') as f:
+        f.write(stats_str)
+
+
+def compare_startup(filename="startup.json"):
+    out_dir2 = _opts.compare
+
+    with open(os.path.join(out_dir, filename)) as f:
+        summary1 = json.loads(f.read())
+    with open(os.path.join(out_dir2, filename)) as f:
+        summary2 = json.loads(f.read())
+
+    delta_summary = {}
+    for name, stats1 in summary1.items():
+        stats2 = summary2.get(name)
+        if not isinstance(stats1, dict) or not isinstance(stats2, dict):
+            continue
+
+        for field in ("median", "min", "import_time", "plugin_import_time"):
+            if field not in stats1 or field not in stats2:
+                continue
+
+            delta = stats2[field] - stats1[field]
+            pct = 100.0 * (delta / stats1[field])
+            pct_str = "%.2f%%" % pct
+            if not pct_str.startswith('-'):
+                pct_str = '+' + pct_str
+
+            delta_summary["%s_%s_delta" % (name, field)] = (delta, pct_str)
+
+    print(json.dumps(delta_summary, indent=2, sort_keys=True))
+
+
 def print_histogram():
     n_rows = 40
     n_columns = 40
@@ -308,6 +778,14 @@ def print_histogram():
 def compare():
     out_dir2 = _opts.compare
 
+    if os.path.exists(os.path.join(out_dir, "startup.json")):
+        compare_startup()
+        return
+
+    if os.path.exists(os.path.join(out_dir, "env.json")):
+        compare_startup("env.json")
+        return
+
     with open(os.path.join(out_dir, "resolves.json")) as f:
         summaries1 = json.loads(f.read())
     with open(os.path.join(out_dir2, "resolves.json")) as f:
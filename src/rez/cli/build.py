@@ -71,6 +71,11 @@ def setup_parser_common(parser):
         "--cba", "--child-build-args", dest="child_build_args", metavar="ARGS",
         help="arguments to pass to the child build system, if any. "
         "Alternatively, list these after a second '--'.")
+    parser.add_argument(
+        "--parallel", type=int, default=1, metavar="N",
+        help="build up to N variants at once, each in its own build "
+        "directory. The build output of each variant is written to a "
+        "build.log file in its build directory (default: %(default)s).")
 
 
 def setup_parser(parser, completions=False):
@@ -93,6 +98,10 @@ def setup_parser(parser, completions=False):
         help="create build scripts rather than performing the full build. "
         "Running these scripts will place you into a build environment, where "
         "you can invoke the build system directly.")
+    parser.add_argument(
+        "--fresh-context", action="store_true",
+        help="resolve the build environments, rather than reusing those of "
+        "the previous build when they are still valid.")
     parser.add_argument(
         "--view-pre", action="store_true",
         help="just view the preprocessed package definition, and exit.")
@@ -148,7 +157,9 @@ def command(opts, parser, extra_arg_groups=None):
     builder = create_build_process(opts.process,
                                    working_dir,
                                    build_system=buildsys,
-                                   verbose=True)
+                                   verbose=True,
+                                   max_workers=opts.parallel,
+                                   fresh_context=opts.fresh_context)
 
     try:
         builder.build(install_path=opts.prefix,
@@ -19,6 +19,13 @@ def setup_parser(parser, completions=False):
     group.add_argument(
         "-n", "--no-lib-patch", action="store_true",
         help="don't apply library patching within the bundle")
+    parser.add_argument(
+        "-d", "--dedupe", action="store_true",
+        help="replace files that are identical across bundled packages with "
+        "hardlinks")
+    parser.add_argument(
+        "-j", "--threads", type=int, metavar="N",
+        help="number of variants to copy, and of files to patch, at once")
     parser.add_argument(
         "RXT",
         help="context to bundle")
@@ -48,5 +55,7 @@ def command(opts, parser, extra_arg_groups=None):
         force=opts.force,
         skip_non_relocatable=opts.skip_non_relocatable,
         verbose=opts.verbose,
-        patch_libs=(not opts.no_lib_patch)
+        patch_libs=(not opts.no_lib_patch),
+        dedupe=opts.dedupe,
+        max_workers=opts.threads
     )
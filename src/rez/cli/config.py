@@ -15,8 +15,9 @@ def setup_parser(parser, completions=False):
         "--search-list", dest="search_list", action="store_true",
         help="list the config files searched")
     parser.add_argument(
-        "--source-list", dest="source_list", action="store_true",
-        help="list the config files sourced")
+        "--source-list", "--sources", dest="source_list", action="store_true",
+        help="list the config files sourced, and whether they were read from "
+        "the config cache (see $REZ_CONFIG_CACHE_PATH)")
     FIELD_action = parser.add_argument(
         "FIELD", type=str, nargs='?',
         help="print the value of a specific setting")
@@ -39,6 +40,11 @@ def command(opts, parser, extra_arg_groups=None):
     if opts.source_list:
         for filepath in config.sourced_filepaths:
             print(filepath)
+
+        cache = config._cache
+        if cache is not None:
+            print("# config cache %s: %s"
+                  % ("hit" if cache.hit else "miss", cache.filepath))
         return
 
     data = config.data
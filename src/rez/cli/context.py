@@ -86,6 +86,12 @@ def setup_parser(parser, completions=False):
     parser.add_argument(
         "--no-env", dest="no_env", action="store_true",
         help="interpret the context in an empty environment")
+    parser.add_argument(
+        "--freeze-env", dest="freeze_env", action="store_true",
+        help="evaluate the environment of the context and store it in the "
+        "context file, so that it is not interpreted again when used. Shell "
+        "code is stored for the shell given by --format. Only use this on "
+        "contexts whose packages will not change")
     diff_action = parser.add_argument(
         "--diff", type=str, metavar="RXT",
         help="diff the current context against the given context")
@@ -110,7 +116,6 @@ def command(opts, parser, extra_arg_groups=None):
     from rez.status import status
     from rez.utils.formatting import columnise, PackageRequest
     from rez.resolved_context import ResolvedContext
-    from rez.utils.graph_utils import save_graph, view_graph, prune_graph
     from pprint import pformat
 
     rxt_file = opts.RXT if opts.RXT else status.context_file
@@ -135,6 +140,21 @@ def command(opts, parser, extra_arg_groups=None):
 
     parent_env = {} if opts.no_env else None
 
+    if opts.freeze_env:
+        if rxt_file == '-':
+            print("cannot freeze a context read from stdin.", file=sys.stderr)
+            sys.exit(1)
+
+        from rez.shells import get_shell_types
+
+        rxt_file = os.path.abspath(rxt_file)
+        rc.set_load_path(rxt_file)
+
+        shells = [opts.format] if opts.format in get_shell_types() else None
+        rc.freeze_env(shells=shells, parent_environ=parent_env)
+        rc.save(rxt_file)
+        return
+
     if not opts.interpret:
         if opts.print_request:
             print_items(rc.requested_packages(False))
@@ -164,6 +184,9 @@ def command(opts, parser, extra_arg_groups=None):
             gstr = _graph()
             print(gstr)
         elif opts.graph or opts.dependency_graph or opts.write_graph:
+            from rez.utils.graph_utils import save_graph, view_graph, \
+                prune_graph
+
             gstr = _graph()
             if opts.prune_pkg:
                 req = PackageRequest(opts.prune_pkg)
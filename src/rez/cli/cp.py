@@ -37,6 +37,14 @@ def setup_parser(parser, completions=False):
         "-k", "--keep-timestamp", action="store_true",
         help="keep timestamp of source package. Note that this is ignored if "
         "you're copying variant(s) into an existing package.")
+    parser.add_argument(
+        "--link", dest="link_mode", choices=("hardlink", "reflink"),
+        help="link payload files rather than copying them, where the source "
+        "and destination are on the same device. Note that hardlinked files "
+        "share their contents and permissions with the source package.")
+    parser.add_argument(
+        "-j", "--threads", type=int, metavar="N",
+        help="number of variant payloads to copy at once")
     parser.add_argument(
         "-f", "--force", action="store_true",
         help="copy package even if it isn't relocatable (use at your own risk)")
@@ -161,7 +169,9 @@ def command(opts, parser, extra_arg_groups=None):
         keep_timestamp=opts.keep_timestamp,
         force=opts.force,
         verbose=opts.verbose,
-        dry_run=opts.dry_run
+        dry_run=opts.dry_run,
+        link_mode=opts.link_mode,
+        max_workers=opts.threads
     )
 
     # Print info about the result.
@@ -29,8 +29,16 @@ def setup_parser(parser, completions=False):
     parser.add_argument(
         "-q", "--quiet", action="store_true",
         help="don't print progress bar or depth indicators")
+    parser.add_argument(
+        "--no-index", dest="no_index", action="store_true",
+        help="load the latest package of every family, rather than using the "
+        "reverse dependency index (see 'depends_index_path' config setting)")
+    parser.add_argument(
+        "--rebuild-index", dest="rebuild_index", action="store_true",
+        help="rebuild the reverse dependency index of every package "
+        "repository in the search path, then exit")
     PKG_action = parser.add_argument(
-        "PKG",
+        "PKG", nargs='?',
         help="package that other packages depend on")
 
     if completions:
@@ -55,12 +63,28 @@ def command(opts, parser, extra_arg_groups=None):
         pkg_paths = opts.paths.split(os.pathsep)
         pkg_paths = [os.path.expanduser(x) for x in pkg_paths if x]
 
+    if opts.rebuild_index:
+        from rez.utils.depends_index import depends_index
+
+        if not depends_index.enabled:
+            parser.error("the reverse dependency index is not enabled "
+                         "(see 'depends_index_path' config setting)")
+
+        for path in (config.packages_path if pkg_paths is None else pkg_paths):
+            num_families = depends_index.rebuild(path)
+            print("Indexed %d families in %s" % (num_families, path))
+        return 0
+
+    if not opts.PKG:
+        parser.error("PKG is required")
+
     pkgs_list, g = get_reverse_dependency_tree(
         package_name=opts.PKG,
         depth=opts.depth,
         paths=pkg_paths,
         build_requires=opts.build_requires,
-        private_build_requires=opts.private_build_requires)
+        private_build_requires=opts.private_build_requires,
+        use_index=(False if opts.no_index else None))
 
     if opts.graph or opts.print_graph or opts.write_graph:
         gstr = write_dot(g)
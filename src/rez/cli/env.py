@@ -113,6 +113,10 @@ def setup_parser(parser, completions=False):
     parser.add_argument(
         "--no-pkg-cache", action="store_true",
         help="Disable package caching")
+    parser.add_argument(
+        "--profile-solve", type=str, metavar="FILE",
+        help="record solver events (extractions, reductions, package loads "
+        "etc) and write them to FILE as a Chrome trace-event json file")
     parser.add_argument(
         "--pre-command", type=str, help=SUPPRESS)
     PKG_action = parser.add_argument(
@@ -181,6 +185,11 @@ def command(opts, parser, extra_arg_groups=None):
         context = None
 
     if context is None:
+        tracer = None
+        if opts.profile_solve:
+            from rez.utils.tracing import Tracer
+            tracer = Tracer(name="rez-env")
+
         # create package filters
         if opts.no_filters:
             package_filter = PackageFilterList()
@@ -209,9 +218,13 @@ def command(opts, parser, extra_arg_groups=None):
             caching=(not opts.no_cache),
             suppress_passive=opts.no_passive,
             print_stats=opts.stats,
-            package_caching=(not opts.no_pkg_cache)
+            package_caching=(not opts.no_pkg_cache),
+            tracer=tracer
         )
 
+        if tracer:
+            tracer.save(opts.profile_solve)
+
     success = (context.status == ResolverStatus.solved)
 
     if not success:
@@ -14,6 +14,14 @@ def setup_parser(parser, completions=False):
     parser.add_argument(
         "-f", "--force", action="store_true",
         help="move package even if it isn't relocatable (use at your own risk)")
+    parser.add_argument(
+        "--link", dest="link_mode", choices=("hardlink", "reflink"),
+        help="link payload files rather than copying them, where the source "
+        "and destination are on the same device. Note that hardlinked files "
+        "share their contents and permissions with the source package.")
+    parser.add_argument(
+        "-j", "--threads", type=int, metavar="N",
+        help="number of variant payloads to copy at once")
     pkg_action = parser.add_argument(
         "PKG",
         help="package to move (eg 'foo-1.2.3')")
@@ -73,5 +81,7 @@ def command(opts, parser, extra_arg_groups=None):
         dest_repository=opts.dest_path,
         keep_timestamp=opts.keep_timestamp,
         force=opts.force,
-        verbose=opts.verbose
+        verbose=opts.verbose,
+        link_mode=opts.link_mode,
+        max_workers=opts.threads
     )
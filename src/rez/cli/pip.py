@@ -29,6 +29,10 @@ def setup_parser(parser, completions=False):
     parser.add_argument(
         "-p", "--prefix", type=str, metavar='PATH',
         help="install to a custom package repository path.")
+    parser.add_argument(
+        "-j", "--threads", type=int, metavar="N",
+        help="number of installed distributions to convert into rez packages "
+        "at once")
     parser.add_argument(
         "PACKAGE",
         help="package to install or archive/url to install from")
@@ -73,7 +77,8 @@ def command(opts, parser, extra_arg_groups=None):
         python_version=opts.py_ver,
         release=opts.release,
         prefix=opts.prefix,
-        extra_args=opts.extra)
+        extra_args=opts.extra,
+        max_workers=opts.threads)
 
 # Copyright 2013-2016 Allan Johns.
 #
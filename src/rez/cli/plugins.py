@@ -1,5 +1,5 @@
 """
-Get a list of a package's plugins.
+Get a list of a package's plugins, or of rez's own plugins.
 """
 from __future__ import print_function
 
@@ -9,8 +9,9 @@ def setup_parser(parser, completions=False):
         "--paths", type=str, default=None,
         help="set package search path")
     PKG_action = parser.add_argument(
-        "PKG", type=str,
-        help="package to list plugins for")
+        "PKG", type=str, nargs='?',
+        help="package to list plugins for. If not provided, rez plugins are "
+        "listed instead, along with the time taken to load them")
 
     if completions:
         from rez.cli._complete_util import PackageFamilyCompleter
@@ -24,6 +25,11 @@ def command(opts, parser, extra_arg_groups=None):
     import os.path
     import sys
 
+    if not opts.PKG:
+        from rez.plugin_managers import plugin_manager
+        print(plugin_manager.get_summary_string(load_times=True))
+        return
+
     config.override("warn_none", True)
 
     if opts.paths is None:
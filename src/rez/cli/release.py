@@ -73,7 +73,8 @@ def command(opts, parser, extra_arg_groups=None):
                                    ensure_latest=(not opts.no_latest),
                                    skip_repo_errors=opts.skip_repo_errors,
                                    ignore_existing_tag=opts.ignore_existing_tag,
-                                   verbose=True)
+                                   verbose=True,
+                                   max_workers=opts.parallel)
 
     # get release message
     release_msg = opts.message
@@ -56,6 +56,13 @@ def setup_parser(parser, completions=False):
     parser.add_argument(
         "-s", "--sort", action="store_true",
         help="print results in sorted order (deprecated)")
+    parser.add_argument(
+        "--unordered", action="store_true",
+        help="print the results of each package family as soon as they are "
+        "found, rather than in alphabetical order of family")
+    parser.add_argument(
+        "-j", "--threads", type=int, metavar="N",
+        help="number of threads to search package repositories with")
     PKG_action = parser.add_argument(
         "PKG", type=str, nargs='?',
         help="packages to search, glob-style patterns are supported")
@@ -97,28 +104,29 @@ def command(opts, parser, extra_arg_groups=None):
         latest=opts.latest,
         after_time=after_time,
         before_time=before_time,
-        validate=(opts.validate or opts.errors)
+        validate=(opts.validate or opts.errors),
+        max_workers=opts.threads
     )
 
-    resource_type, search_results = searcher.search(opts.PKG)
+    resource_type, search_results = searcher.iter_resources(
+        opts.PKG, ordered=(not opts.unordered))
 
     if opts.errors:
-        search_results = [x for x in search_results if x.validation_error]
-
-        if not search_results:
-            print("No matching erroneous %s found." % resource_type, file=sys.stderr)
-            sys.exit(1)
-
-    elif not search_results:
-        print("No matching %s found." % resource_type, file=sys.stderr)
-        sys.exit(1)
+        search_results = (x for x in search_results if x.validation_error)
 
     formatter = ResourceSearchResultFormatter(
         output_format=opts.format,
         suppress_newlines=opts.no_newlines
     )
 
-    formatter.print_search_results(search_results)
+    num_results = formatter.print_search_results(search_results)
+
+    if not num_results:
+        if opts.errors:
+            print("No matching erroneous %s found." % resource_type, file=sys.stderr)
+        else:
+            print("No matching %s found." % resource_type, file=sys.stderr)
+        sys.exit(1)
 
 
 # Copyright 2013-2016 Allan Johns.
@@ -15,6 +15,10 @@ def setup_parser(parser, completions=False):
     parser.add_argument(
         "-s", "--stop-on-fail", action="store_true",
         help="stop on first test failure")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, metavar="N",
+        help="run up to N tests at once. The output of each test is "
+        "prefixed with its name and variant index (default: %(default)s)")
     parser.add_argument(
         "--inplace", action="store_true",
         help="run tests in the current environment. Any test whose requirements "
@@ -99,13 +103,7 @@ def command(opts, parser, extra_arg_groups=None):
             )
             sys.exit(0)
 
-    exitcode = 0
-
-    for test_name in run_test_names:
-        if not runner.stopped_on_fail:
-            ret = runner.run_test(test_name)
-            if ret and not exitcode:
-                exitcode = ret
+    exitcode = runner.run_tests(run_test_names, max_workers=opts.jobs)
 
     print("\n")
     runner.print_summary()
@@ -5,19 +5,22 @@ from rez.utils.data_utils import AttrDictWrapper, RO_AttrDictWrapper, \
     deep_update, ModifyList, DelayLoad
 from rez.utils.formatting import expandvars, expanduser
 from rez.utils.logging_ import get_debug_printer
+from rez.utils.filesystem import get_json_cache_filename, read_json_file, \
+    write_json_file
 from rez.utils.scope import scoped_format
 from rez.exceptions import ConfigurationError
 from rez import module_root_path
 from rez.system import system
 from rez.vendor.schema.schema import Schema, SchemaError, And, Or, Use
-from rez.vendor import yaml
 from rez.vendor.six import six
-from rez.vendor.yaml.error import YAMLError
 from rez.backport.lru_cache import lru_cache
+from rez.utils import json
 from contextlib import contextmanager
 from inspect import ismodule
+import atexit
 import os
 import re
+import sys
 import copy
 
 
@@ -354,6 +357,7 @@ config_schema = Schema({
     "memcached_uri":                                OptionalStrList,
     "pip_extra_args":                               OptionalStrList,
     "pip_install_remaps":                           PipInstallRemaps,
+    "pip_wheel_cache_path":                         OptionalStr,
     "local_packages_path":                          Str,
     "release_packages_path":                        Str,
     "dot_image_format":                             Str,
@@ -364,6 +368,13 @@ config_schema = Schema({
     "create_executable_script_mode":                ExecutableScriptMode_,
     "suite_alias_prefix_char":                      Char,
     "cache_packages_path":                          OptionalStr,
+    "compiled_code_cache_path":                     OptionalStr,
+    "host_facts_cache_path":                        OptionalStr,
+    "plugin_cache_path":                            OptionalStr,
+    "config_cache_path":                            OptionalStr,
+    "context_env_cache_path":                       OptionalStr,
+    "depends_index_path":                           OptionalStr,
+    "completion_index_path":                        OptionalStr,
     "package_definition_python_path":               OptionalStr,
     "tmpdir":                                       OptionalStr,
     "context_tmpdir":                               OptionalStr,
@@ -396,6 +407,7 @@ config_schema = Schema({
     "package_preprocess_function":                  OptionalStrOrFunction,
     "package_preprocess_mode":                      PreprocessMode_,
     "context_tracking_host":                        OptionalStr,
+    "amqp_spool_path":                              OptionalStr,
     "variant_shortlinks_dirname":                   OptionalStr,
     "build_thread_count":                           BuildThreadCount_,
     "resource_caching_maxsize":                     Int,
@@ -422,6 +434,7 @@ config_schema = Schema({
     "all_parent_variables":                         Bool,
     "all_resetting_variables":                      Bool,
     "package_commands_sourced_first":               Bool,
+    "direct_command_execution":                     Bool,
     "use_variant_shortlinks":                       Bool,
     "warn_shell_startup":                           Bool,
     "warn_untimestamped":                           Bool,
@@ -484,6 +497,126 @@ _plugin_config_dict = {
 # Config
 # -----------------------------------------------------------------------------
 
+class _ConfigCache(object):
+    """On-disk cache of merged config data (see `config_cache_path`).
+
+    The cache file is specific to the config's search filepaths, the host,
+    user, rez and python versions, and to any $REZ_<SETTING> environment
+    variable overrides. It stores the merged data of the sourced config files,
+    along with the validated value of each setting accessed so far. The cache
+    is refreshed when any config file (searched or sourced) changes.
+
+    Config data that does not serialize to JSON (such as functions defined in
+    a rezconfig.py) is not cached.
+    """
+    def __init__(self, path, filepaths, schema_keys):
+        self.filepaths = filepaths
+        self.hit = False
+        self._entry = None
+        self._new_values = {}
+        self._atexit_registered = False
+
+        env = []
+        for key in sorted(schema_keys):
+            for varname in ("REZ_%s" % key.upper(), "REZ_%s_JSON" % key.upper()):
+                value = os.getenv(varname)
+                if value is not None:
+                    env.append([varname, value])
+
+        filename = get_json_cache_filename([
+            sys.version, system.hostname, system.user, filepaths, env
+        ])
+        self.filepath = os.path.join(os.path.expanduser(path), filename)
+
+    def load(self):
+        """Load cached config data.
+
+        Returns:
+            2-tuple: Merged config data (dict), and the sourced filepaths; or
+            None if there is no valid cache entry.
+        """
+        entry = read_json_file(self.filepath)
+        if entry.get("stamps") != self._stamps():
+            return None
+
+        self._entry = entry
+        self.hit = True
+        return entry["data"], entry["sourced_filepaths"]
+
+    def save(self, data, sourced_filepaths):
+        """Cache merged config data."""
+        if not self._serializable(data):
+            return
+
+        self._entry = {
+            "stamps": self._stamps(),
+            "data": data,
+            "sourced_filepaths": sourced_filepaths,
+            "values": {}
+        }
+        self._write()
+
+    def get_value(self, key):
+        """Get a cached validated setting value, or `KeyError`."""
+        if self._entry is None:
+            raise KeyError(key)
+        return copy.deepcopy(self._entry["values"][key])
+
+    def set_value(self, key, value, raw_value):
+        """Cache a validated setting value. Values are written to disk when
+        the process exits.
+
+        Values that depend on environment variables other than the setting's
+        own $REZ_<SETTING> variable are not cached. These are values with a
+        programmatic default (eg 'tmpdir'), and values that reference
+        environment variables (which are expanded).
+        """
+        if self._entry is None or raw_value is None \
+                or not self._serializable(value) \
+                or '$' in json.dumps(raw_value):
+            return
+
+        self._entry["values"][key] = value
+        self._new_values[key] = value
+
+        if not self._atexit_registered:
+            atexit.register(self._write)
+            self._atexit_registered = True
+
+    @classmethod
+    def _serializable(cls, value):
+        try:
+            return (json.loads(json.dumps(value)) == value)
+        except (TypeError, ValueError):
+            return False
+
+    def _stamps(self):
+        stamps = []
+        for filepath in self.filepaths:
+            for filepath_ in (os.path.splitext(filepath)[0] + ".py", filepath):
+                try:
+                    st = os.stat(filepath_)
+                    stamps.append([filepath_, st.st_mtime, st.st_size])
+                except OSError:
+                    stamps.append([filepath_, None, None])
+        return stamps
+
+    def _write(self):
+        entry = self._entry
+        if entry is None:
+            return
+
+        # keep values that other processes have cached for the same config
+        entry_ = read_json_file(self.filepath)
+        if entry_.get("stamps") == entry["stamps"] \
+                and isinstance(entry_.get("values"), dict):
+            entry_["values"].update(self._new_values)
+            entry = entry_
+
+        self._new_values = {}
+        write_json_file(self.filepath, entry, description="config cache")
+
+
 class Config(six.with_metaclass(LazyAttributeMeta, object)):
     """Rez configuration settings.
 
@@ -672,6 +805,19 @@ class Config(six.with_metaclass(LazyAttributeMeta, object)):
         self.__dict__, other.__dict__ = other.__dict__, self.__dict__
 
     def _validate_key(self, key, value, key_schema):
+        # validated values depend on environment variables, which locked
+        # configs ignore
+        cache = self._cache
+        if self.locked or key in self.overrides:
+            cache = None
+
+        if cache is not None:
+            try:
+                return cache.get_value(key)
+            except KeyError:
+                pass
+
+        raw_value = value
         if isinstance(value, DelayLoad):
             value = value.get_value()
 
@@ -680,11 +826,35 @@ class Config(six.with_metaclass(LazyAttributeMeta, object)):
         elif not isinstance(key_schema, Schema):
             key_schema = Schema(key_schema)
 
-        return key_schema.validate(value)
+        value = key_schema.validate(value)
+
+        if cache is not None:
+            cache.set_value(key, value, raw_value)
+        return value
+
+    @cached_property
+    def _cache(self):
+        # this setting can only be set in the environment, since it is needed
+        # before any config file is loaded
+        path = os.getenv("REZ_CONFIG_CACHE_PATH")
+        if not path:
+            return None
+
+        return _ConfigCache(path, self.filepaths, self._schema_keys)
 
     @cached_property
     def _data_without_overrides(self):
+        cache = self._cache
+        if cache is not None:
+            result = cache.load()
+            if result is not None:
+                data, self._sourced_filepaths = result
+                return data
+
         data, self._sourced_filepaths = _load_config_from_filepaths(self.filepaths)
+
+        if cache is not None:
+            cache.save(data, self._sourced_filepaths)
         return data
 
     @cached_property
@@ -923,6 +1093,9 @@ def _load_config_py(filepath):
 
 @lru_cache()
 def _load_config_yaml(filepath):
+    from rez.vendor import yaml
+    from rez.vendor.yaml.error import YAMLError
+
     with open(filepath) as f:
         content = f.read()
     try:
@@ -1,6 +1,7 @@
 from functools import partial
 import os.path
 import shutil
+import threading
 import time
 
 from rez.config import config
@@ -13,17 +14,25 @@ from rez.utils.base26 import create_unique_base26_symlink
 from rez.utils.sourcecode import IncludeModuleManager
 from rez.utils.logging_ import print_info, print_warning
 from rez.utils.filesystem import replacing_symlink, replacing_copy, \
-    safe_makedirs, additive_copytree, make_path_writable, get_existing_path
+    safe_makedirs, additive_copytree, make_path_writable, \
+    make_shared_path_writable, get_existing_path, link_file
+from rez.utils.formatting import readable_memory_size
+from rez.utils.parallel import iter_parallel
 from rez.vendor.six import six
 
 
 basestring = six.string_types[0]
 
+# variants are installed into package definitions one at a time, even when
+# packages are copied concurrently (see `bundle_context`)
+_install_lock = threading.Lock()
+
 
 def copy_package(package, dest_repository, variants=None, shallow=False,
                  dest_name=None, dest_version=None, overwrite=False, force=False,
                  follow_symlinks=False, dry_run=False, keep_timestamp=False,
-                 skip_payload=False, overrides=None, verbose=False):
+                 skip_payload=False, overrides=None, verbose=False,
+                 link_mode=None, max_workers=None):
     """Copy a package from one package repository to another.
 
     This copies the package definition and payload. The package can also be
@@ -81,6 +90,11 @@ def copy_package(package, dest_repository, variants=None, shallow=False,
         verbose (bool): Verbose mode.
         dry_run (bool): Dry run mode. Dest variants in the result will be None
             in this case.
+        link_mode (str): If "hardlink" or "reflink", payload files are linked
+            rather than copied, where the source and destination are on the
+            same device (see `rez.utils.filesystem.link_file`).
+        max_workers (int): Maximum number of variant payloads to copy at
+            once. Defaults to `rez.utils.parallel.get_default_max_workers`.
 
     Returns:
         Dict: See comments above.
@@ -166,42 +180,69 @@ def copy_package(package, dest_repository, variants=None, shallow=False,
 
     src_variants = new_src_variants
 
-    # Install each variant and associated payload.
+    # Copy the payload of each variant. Payloads are copied concurrently, and
+    # variants are then installed into the package definition one at a time.
     #
-    for i, src_variant in enumerate(src_variants):
-        if verbose:
+    if src_variants and not dry_run and not skip_payload:
+        # Perform pre-install steps. For eg, a "building" marker file is
+        # created in the filesystem pkg repo, so that the package dir
+        # (which doesn't have variants copied into it yet) is not picked
+        # up as a valid package.
+        #
+        for src_variant in src_variants:
+            dest_pkg_repo.pre_variant_install(src_variant.resource)
+
+        # copy include modules before the first variant install
+        _copy_package_include_modules(
+            src_variants[0].parent,
+            dest_pkg_repo,
+            overrides=overrides
+        )
+
+        def _copy_payload(src_variant):
+            if verbose:
+                print_info("Copying source variant %s into repository %s...",
+                           src_variant.uri, str(dest_pkg_repo))
+
+            t = time.time()
+
+            num_bytes = _copy_variant_payload(
+                src_variant=src_variant,
+                dest_pkg_repo=dest_pkg_repo,
+                shallow=shallow,
+                follow_symlinks=follow_symlinks,
+                overrides=overrides,
+                verbose=verbose,
+                link_mode=link_mode
+            )
+
+            if verbose:
+                _print_copy_stats("Copied payload of source variant %s"
+                                  % src_variant.uri, num_bytes, t)
+
+            return num_bytes
+
+        t = time.time()
+        total_bytes = 0
+
+        for _, num_bytes in iter_parallel(_copy_payload, src_variants,
+                                          max_workers=max_workers):
+            total_bytes += num_bytes
+
+        if verbose and len(src_variants) > 1:
+            _print_copy_stats("Copied payload of %d source variants"
+                              % len(src_variants), total_bytes, t)
+
+    # Install each variant.
+    #
+    for src_variant in src_variants:
+        if verbose and (dry_run or skip_payload):
             print_info("Copying source variant %s into repository %s...",
                        src_variant.uri, str(dest_pkg_repo))
 
         if dry_run:
             dest_variant = None
         else:
-            if not skip_payload:
-                # Perform pre-install steps. For eg, a "building" marker file is
-                # created in the filesystem pkg repo, so that the package dir
-                # (which doesn't have variants copied into it yet) is not picked
-                # up as a valid package.
-                #
-                dest_pkg_repo.pre_variant_install(src_variant.resource)
-
-                # copy include modules before the first variant install
-                if i == 0:
-                    _copy_package_include_modules(
-                        src_variant.parent,
-                        dest_pkg_repo,
-                        overrides=overrides
-                    )
-
-                # copy the variant's payload
-                _copy_variant_payload(
-                    src_variant=src_variant,
-                    dest_pkg_repo=dest_pkg_repo,
-                    shallow=shallow,
-                    follow_symlinks=follow_symlinks,
-                    overrides=overrides,
-                    verbose=verbose
-                )
-
             # construct overrides
             overrides_ = overrides.copy()
 
@@ -209,10 +250,11 @@ def copy_package(package, dest_repository, variants=None, shallow=False,
                 overrides_["timestamp"] = int(time.time())
 
             # install the variant into the package definition
-            dest_variant_resource = dest_pkg_repo.install_variant(
-                variant_resource=src_variant.resource,
-                overrides=overrides_
-            )
+            with _install_lock:
+                dest_variant_resource = dest_pkg_repo.install_variant(
+                    variant_resource=src_variant.resource,
+                    overrides=overrides_
+                )
 
             dest_variant = Variant(dest_variant_resource)
 
@@ -226,7 +268,8 @@ def copy_package(package, dest_repository, variants=None, shallow=False,
 
 
 def _copy_variant_payload(src_variant, dest_pkg_repo, shallow=False,
-                          follow_symlinks=False, overrides=None, verbose=False):
+                          follow_symlinks=False, overrides=None, verbose=False,
+                          link_mode=None):
     # Get payload path of source variant. For some types (eg from a "memory"
     # type repo) there may not be a root.
     #
@@ -265,8 +308,15 @@ def _copy_variant_payload(src_variant, dest_pkg_repo, shallow=False,
         variant_install_path = dest_pkg_payload_path
 
     # get ready for copy/symlinking
+    num_bytes = [0]
+
+    def _copy_file(src, dest):
+        link_file(src, dest, link_mode=link_mode)
+        num_bytes[0] += os.path.getsize(dest)
+
     copy_func = partial(replacing_copy,
-                        follow_symlinks=follow_symlinks)
+                        follow_symlinks=follow_symlinks,
+                        copy_function=_copy_file)
 
     if shallow:
         maybe_symlink = replacing_symlink
@@ -279,7 +329,7 @@ def _copy_variant_payload(src_variant, dest_pkg_repo, shallow=False,
         topmost_path=os.path.dirname(dest_pkg_payload_path))
 
     if last_dir and config.make_package_temporarily_writable:
-        ctxt = make_path_writable(last_dir)
+        ctxt = make_shared_path_writable(last_dir)
     else:
         ctxt = with_noop()
 
@@ -287,6 +337,17 @@ def _copy_variant_payload(src_variant, dest_pkg_repo, shallow=False,
     with ctxt:
         safe_makedirs(variant_install_path)
 
+        # files can only be linked within the same device
+        if link_mode and not shallow and \
+                os.stat(variant_root).st_dev != \
+                os.stat(variant_install_path).st_dev:
+            if verbose:
+                print_info(
+                    "Copying rather than linking payload of %s - source and "
+                    "destination are on different devices", src_variant.uri
+                )
+            link_mode = None
+
         # determine files not to copy
         skip_files = []
 
@@ -378,6 +439,16 @@ def _copy_variant_payload(src_variant, dest_pkg_repo, shallow=False,
                 variant_install_path, e.__class__.__name__, e
             )
 
+    return num_bytes[0]
+
+
+def _print_copy_stats(msg, num_bytes, start_time):
+    secs = max(time.time() - start_time, 0.001)
+    rate = readable_memory_size(int(num_bytes / secs))
+
+    print_info("%s (%s in %.2f secs, %s/s)", msg,
+               readable_memory_size(num_bytes), secs, rate)
+
 
 def _get_overlapped_variant_dirs(src_variant):
     package = src_variant.parent
@@ -25,6 +25,20 @@ class PackageFilterBase(object):
         """
         raise NotImplementedError
 
+    def excludes_family(self, name):
+        """Determine if the filter excludes every package in a family.
+
+        This is a conservative test - a filter may still exclude every package
+        in the family, even if this returns None.
+
+        Args:
+            name (str): Name of the package family.
+
+        Returns:
+            `Rule` object that excludes the family, or None.
+        """
+        return None
+
     def add_exclusion(self, rule):
         """Add an exclusion rule.
 
@@ -63,6 +77,9 @@ class PackageFilterBase(object):
         Returns:
             `Package` iterator.
         """
+        if self.excludes_family(name):
+            return
+
         for package in iter_packages(name, range_, paths):
             if not self.excludes(package):
                 yield package
@@ -87,40 +104,44 @@ class PackageFilter(PackageFilterBase):
     Rules can be added as 'exclusion' or 'inclusion' rules. A package is only
     excluded iff it matches one or more exclusion rules, and does not match any
     inclusion rules.
+
+    Rules are compiled per package family on first use (see `_RuleMatcher`),
+    so the cost of testing a package does not grow with the number of rules.
     """
     def __init__(self):
         self._excludes = {}
         self._includes = {}
+        self._matchers = {}
 
     def excludes(self, package):
         if not self._excludes:
             return None  # quick out
 
-        def _match(rules):
-            if rules:
-                for rule in rules:
-                    if rule.match(package):
-                        return rule
-            return None
-
-        excludes = self._excludes.get(package.name)
-        excl = _match(excludes)
-        if not excl:
-            excludes = self._excludes.get(None)
-            excl = _match(excludes)
+        excl = (self._match("excludes", package.name, package)
+                or self._match("excludes", None, package))
 
         if excl:
-            includes = self._includes.get(package.name)
-            incl = _match(includes)
-            if incl:
+            if self._match("includes", package.name, package) \
+                    or self._match("includes", None, package):
                 excl = None
-            else:
-                includes = self._includes.get(None)
-                if _match(includes):
-                    excl = None
 
         return excl
 
+    def excludes_family(self, name):
+        if not self._excludes:
+            return None
+
+        # an inclusion rule may let some packages through
+        if self._includes.get(name) or self._includes.get(None):
+            return None
+
+        for family in (name, None):
+            for rule in self._excludes.get(family, []):
+                if rule.match_family(name):
+                    return rule
+
+        return None
+
     def add_exclusion(self, rule):
         self._add_rule(self._excludes, rule)
 
@@ -135,6 +156,7 @@ class PackageFilter(PackageFilterBase):
         other = PackageFilter.__new__(PackageFilter)
         other._excludes = self._excludes.copy()
         other._includes = self._includes.copy()
+        other._matchers = self._matchers.copy()
         return other
 
     def __and__(self, other):
@@ -199,6 +221,24 @@ class PackageFilter(PackageFilterBase):
         rules_dict[family] = sorted(rules_ + [rule], key=lambda x: x.cost())
         cached_property.uncache(self, "cost")
 
+        self._matchers.pop(("excludes", family), None)
+        self._matchers.pop(("includes", family), None)
+
+    def _match(self, namespace, family, package):
+        key = (namespace, family)
+        matcher = self._matchers.get(key)
+
+        if matcher is None:
+            rules_dict = self._excludes if namespace == "excludes" else self._includes
+            rules = rules_dict.get(family)
+            if not rules:
+                return None
+
+            matcher = _RuleMatcher(rules)
+            self._matchers[key] = matcher
+
+        return matcher.match(package)
+
     def __str__(self):
         def sortkey(rule_items):
             family, rules = rule_items
@@ -253,6 +293,13 @@ class PackageFilterList(PackageFilterBase):
                 return rule
         return None
 
+    def excludes_family(self, name):
+        for f in self.filters:
+            rule = f.excludes_family(name)
+            if rule:
+                return rule
+        return None
+
     def copy(self):
         """Return a copy of the filter list.
 
@@ -295,6 +342,96 @@ class PackageFilterList(PackageFilterBase):
 no_filter = PackageFilterList()
 
 
+class _RuleMatcher(object):
+    """A list of rules, compiled for fast matching.
+
+    Rules are grouped by type - exact qualified names go into a set, regex and
+    glob patterns are merged into a single regex, range rules are merged into a
+    single version range, and timestamp rules reduce to a single before/after
+    timestamp pair. A package is first tested against these; only if it
+    matches is the original rule list searched, so that the same rule (the
+    cheapest matching one) is returned as when testing rules one by one.
+    """
+    def __init__(self, rules):
+        self.rules = rules
+        self.names = set()
+        self.regex = None
+        self.range = None
+        self.before = None
+        self.after = None
+        self.other_rules = []
+
+        patterns = []
+        ranges = []
+
+        for rule in rules:
+            if isinstance(rule, GlobRule) and not GlobRule.meta_re.search(rule.txt):
+                self.names.add(rule.txt)
+            elif isinstance(rule, RegexRuleBase) and self._mergeable(rule):
+                patterns.append(rule.regex.pattern)
+            elif isinstance(rule, RangeRule) and \
+                    rule._requirement.range is not None:
+                range_ = rule._requirement.range
+                if rule._requirement.conflict:
+                    range_ = range_.inverse()
+                if range_ is not None:
+                    ranges.append(range_)
+            elif isinstance(rule, TimestampRule):
+                if rule.reverse:
+                    if self.after is None or rule.timestamp < self.after:
+                        self.after = rule.timestamp
+                elif self.before is None or rule.timestamp > self.before:
+                    self.before = rule.timestamp
+            else:
+                self.other_rules.append(rule)
+
+        if patterns:
+            self.regex = re.compile('|'.join("(?:%s)" % x for x in patterns))
+        if ranges:
+            self.range = ranges[0].union(ranges[1:])
+
+    def match(self, package):
+        if self._may_match(package):
+            for rule in self.rules:
+                if rule.match(package):
+                    return rule
+        return None
+
+    def _may_match(self, package):
+        if self.names or self.regex:
+            qualified_name = package.qualified_name
+            if qualified_name in self.names:
+                return True
+            if self.regex and self.regex.match(qualified_name):
+                return True
+
+        if self.range and package.version in self.range:
+            return True
+
+        for rule in self.other_rules:
+            if rule.match(package):
+                return True
+
+        # timestamps last, since these may cause a package load
+        if self.before is not None or self.after is not None:
+            timestamp = package.timestamp
+            if self.before is not None and timestamp <= self.before:
+                return True
+            if self.after is not None and timestamp > self.after:
+                return True
+
+        return False
+
+    @classmethod
+    def _mergeable(cls, rule):
+        # patterns with groups (backrefs would be renumbered) or inline flags
+        # (which must appear at the start of a pattern) are matched separately
+        regex = rule.regex
+        return (regex.groups == 0 and regex.flags == cls._default_flags)
+
+    _default_flags = re.compile('').flags
+
+
 class Rule(object):
     name = None
 
@@ -315,6 +452,20 @@ class Rule(object):
         package family, otherwise None."""
         return self._family
 
+    def match_family(self, name):
+        """Determine if the rule matches every package in a family.
+
+        Rules return False if this cannot be determined without testing
+        individual packages.
+
+        Args:
+            name (str): Name of the package family.
+
+        Returns:
+            bool: True if every package in the family matches the rule.
+        """
+        return False
+
     def cost(self):
         """Relative cost of filter. Cheaper filters are applied first."""
         raise NotImplementedError
@@ -442,6 +593,16 @@ class GlobRule(RegexRuleBase):
         self._family = self._extract_family(s)
         self.regex = re.compile(fnmatch.translate(s))
 
+    def match_family(self, name):
+        # 'foo*' matches all of 'foo', 'foo-1' etc
+        if self.txt.endswith('*'):
+            prefix = self.txt[:-1]
+            if not self.meta_re.search(prefix):
+                return name.startswith(prefix)
+        return False
+
+    meta_re = re.compile(r"[*?\[]")
+
 
 class RangeRule(Rule):
     """A rule that matches a package if that package does not conflict with a
@@ -459,6 +620,11 @@ class RangeRule(Rule):
         o = VersionedObject.construct(package.name, package.version)
         return not self._requirement.conflicts_with(o)
 
+    def match_family(self, name):
+        return (name == self._family
+                and not self._requirement.conflict
+                and self._requirement.range.is_any())
+
     def cost(self):
         return 10
 
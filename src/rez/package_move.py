@@ -9,7 +9,7 @@ basestring = six.string_types[0]
 
 
 def move_package(package, dest_repository, keep_timestamp=False, force=False,
-                 verbose=False):
+                 verbose=False, link_mode=None, max_workers=None):
     """Move a package.
 
     Moving a package means copying the package to a destination repo, and
@@ -28,6 +28,8 @@ def move_package(package, dest_repository, keep_timestamp=False, force=False,
             Use at your own risk (there is no guarantee the resulting package
             will be functional).
         verbose (bool): Verbose mode.
+        link_mode (str): See `copy_package`.
+        max_workers (int): See `copy_package`.
 
     Returns:
         `Package`: The newly created package in the destination repo.
@@ -71,7 +73,9 @@ def move_package(package, dest_repository, keep_timestamp=False, force=False,
             dest_repository=dest_pkg_repo,
             force=force,
             keep_timestamp=keep_timestamp,
-            verbose=verbose
+            verbose=verbose,
+            link_mode=link_mode,
+            max_workers=max_workers
         )
     finally:
         # 3.
@@ -35,6 +35,40 @@ class PackageOrder(object):
         """
         raise NotImplementedError
 
+    def get_sort_keys(self, packages):
+        """Get the position of each package in the reordered list.
+
+        Results are cached per process, keyed by this orderer's sha1 and the
+        given packages, so that repeated ordering of the same packages (across
+        solver phases, and across resolves) is only performed once.
+
+        Args:
+            packages (list of `Package`): Packages of the same family.
+
+        Returns:
+            dict: Mapping of package version to sort position (lowest first),
+            or None if this orderer does not reorder the given packages (see
+            `reorder`).
+        """
+        key = (self.sha1, tuple(x.uri for x in packages))
+
+        try:
+            return _sort_keys_cache[key]
+        except KeyError:
+            pass
+
+        ordered = self.reorder(packages)
+        if ordered is None:
+            sort_keys = None
+        else:
+            sort_keys = dict((x.version, i) for i, x in enumerate(ordered))
+
+        if len(_sort_keys_cache) >= _sort_keys_cache_size:
+            _sort_keys_cache.clear()
+
+        _sort_keys_cache[key] = sort_keys
+        return sort_keys
+
     def to_pod(self):
         raise NotImplementedError
 
@@ -452,6 +486,11 @@ class PackageOrderList(list):
         return cls.from_pod(config.package_orderers)
 
 
+# cache for `PackageOrder.get_sort_keys`
+_sort_keys_cache = {}
+_sort_keys_cache_size = 10000
+
+
 def to_pod(orderer):
     data = {"type": orderer.name}
     data.update(orderer.to_pod())
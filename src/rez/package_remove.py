@@ -1,4 +1,5 @@
 from rez.package_repository import package_repository_manager
+from rez.utils.depends_index import depends_index
 from rez.vendor.version.version import Version
 from rez.utils.logging_ import print_info
 from rez.vendor.six import six
@@ -27,7 +28,12 @@ def remove_package(name, version, path):
         version = Version(version)
 
     repo = package_repository_manager.get_repository(path)
-    return repo.remove_package(name, version)
+    removed = repo.remove_package(name, version)
+
+    if removed:
+        depends_index.update_family(path, name)
+
+    return removed
 
 
 def remove_packages_ignored_since(days, paths=None, dry_run=False, verbose=False):
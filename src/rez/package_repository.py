@@ -37,17 +37,28 @@ class PackageRepositoryGlobalStats(threading.local):
         # repositories, since process start
         self.package_load_time = 0.0
 
+        # callables that are notified of each package load. Each is called
+        # with args (uri, start_time, duration, source)
+        self.load_listeners = []
+
     @contextmanager
-    def package_loading(self):
+    def package_loading(self, uri=None):
         """Use this around code in your package repository that is loading a
         package, for example from file or cache.
+
+        Yields a dict that the repository can update with details about the
+        load. Currently only the 'source' key is used (eg 'disk', 'memcache').
         """
+        info = {}
         t1 = time.time()
-        yield None
+        yield info
 
         t2 = time.time()
         self.package_load_time += t2 - t1
 
+        for listener in self.load_listeners:
+            listener(uri, t1, t2 - t1, info.get("source"))
+
 
 package_repo_stats = PackageRepositoryGlobalStats()
 
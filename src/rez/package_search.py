@@ -16,15 +16,19 @@ from rez.util import ProgressBar
 from rez.utils.colorize import critical, info, error, Printer
 from rez.vendor.pygraph.classes.digraph import digraph
 from rez.utils.formatting import expand_abbreviations
+from rez.utils.depends_index import depends_index
+from rez.utils.parallel import iter_parallel
 
 from rez.config import config
 
 from rez.vendor.version.requirement import Requirement
+from rez.vendor.version.version import Version
 
 
 def get_reverse_dependency_tree(package_name, depth=None, paths=None,
                                 build_requires=False,
-                                private_build_requires=False):
+                                private_build_requires=False,
+                                use_index=None):
     """Find packages that depend on the given package.
 
     This is a reverse dependency lookup. A tree is constructed, showing what
@@ -40,6 +44,9 @@ def get_reverse_dependency_tree(package_name, depth=None, paths=None,
         build_requires (bool): If True, includes packages' build_requires.
         private_build_requires (bool): If True, include `package_name`'s
             private_build_requires.
+        use_index (bool): If True, use the reverse dependency index (see
+            `config.depends_index_path`) rather than loading the latest package
+            of every family. If None, the index is used if it is enabled.
 
     Returns:
         A 2-tuple:
@@ -53,41 +60,64 @@ def get_reverse_dependency_tree(package_name, depth=None, paths=None,
     g.add_node(package_name)
 
     # build reverse lookup
-    it = iter_package_families(paths)
-    package_names = set(x.name for x in it)
+    if use_index is None:
+        use_index = depends_index.enabled
+
+    if use_index:
+        entries = _get_latest_depends_entries(paths)
+        package_names = set(entries.keys())
+    else:
+        it = iter_package_families(paths)
+        package_names = set(x.name for x in it)
+
     if package_name not in package_names:
         raise PackageFamilyNotFoundError("No such package family %r" % package_name)
 
     if depth == 0:
         return pkgs_list, g
 
-    bar = ProgressBar("Searching", len(package_names))
     lookup = defaultdict(set)
 
-    for i, package_name_ in enumerate(package_names):
-        it = iter_packages(name=package_name_, paths=paths)
-        packages = list(it)
-        if not packages:
-            continue
+    if use_index:
+        for package_name_, entry in entries.items():
+            if entry["version"] is None:
+                continue
 
-        pkg = max(packages, key=lambda x: x.version)
-        requires = []
+            names = list(entry["requires"])
+            if build_requires:
+                names += entry["build_requires"]
+            if private_build_requires and package_name_ == package_name:
+                names += entry["private_build_requires"]
 
-        for variant in pkg.iter_variants():
-            pbr = (private_build_requires and pkg.name == package_name)
+            for name in names:
+                lookup[name].add(package_name_)
+    else:
+        bar = ProgressBar("Searching", len(package_names))
 
-            requires += variant.get_requires(
-                build_requires=build_requires,
-                private_build_requires=pbr
-            )
+        for i, package_name_ in enumerate(package_names):
+            it = iter_packages(name=package_name_, paths=paths)
+            packages = list(it)
+            if not packages:
+                continue
 
-        for req in requires:
-            if not req.conflict:
-                lookup[req.name].add(package_name_)
+            pkg = max(packages, key=lambda x: x.version)
+            requires = []
 
-        bar.next()
+            for variant in pkg.iter_variants():
+                pbr = (private_build_requires and pkg.name == package_name)
 
-    bar.finish()
+                requires += variant.get_requires(
+                    build_requires=build_requires,
+                    private_build_requires=pbr
+                )
+
+            for req in requires:
+                if not req.conflict:
+                    lookup[req.name].add(package_name_)
+
+            bar.next()
+
+        bar.finish()
 
     # perform traversal
     n = 0
@@ -121,13 +151,16 @@ def get_reverse_dependency_tree(package_name, depth=None, paths=None,
     return pkgs_list, g
 
 
-def get_plugins(package_name, paths=None):
+def get_plugins(package_name, paths=None, use_index=None):
     """Find packages that are plugins of the given package.
 
     Args:
         package_name (str): Name of the package.
         paths (list of str): Paths to search for packages, defaults to
             `config.packages_path`.
+        use_index (bool): If True, use the reverse dependency index (see
+            `config.depends_index_path`). If None, the index is used if it is
+            enabled.
 
     Returns:
         list of str: The packages that are plugins of the given package.
@@ -136,6 +169,17 @@ def get_plugins(package_name, paths=None):
     if not pkg.has_plugins:
         return []
 
+    if use_index is None:
+        use_index = depends_index.enabled
+
+    if use_index:
+        entries = _get_latest_depends_entries(paths)
+
+        return [
+            name for name, entry in entries.items()
+            if name != package_name and pkg.name in entry["plugin_for"]
+        ]
+
     it = iter_package_families(paths)
     package_names = set(x.name for x in it)
     bar = ProgressBar("Searching", len(package_names))
@@ -157,6 +201,30 @@ def get_plugins(package_name, paths=None):
     return plugin_pkgs
 
 
+def _get_latest_depends_entries(paths=None):
+    """Get the depends index entry of the latest package of each family.
+
+    Returns:
+        dict: Family name -> entry (see `DependsIndex`). Families with no
+        packages have an entry whose "version" is None.
+    """
+    entries = {}
+    versions = {}
+
+    for path in (config.packages_path if paths is None else paths):
+        for name, entry in depends_index.get_families(path).items():
+            if entry["version"] is None:
+                entries.setdefault(name, entry)
+                continue
+
+            version = Version(entry["version"])
+            if name not in versions or version > versions[name]:
+                entries[name] = entry
+                versions[name] = version
+
+    return entries
+
+
 class ResourceSearchResult(object):
     """Items from a search.
 
@@ -172,7 +240,8 @@ class ResourceSearcher(object):
     """Search for resources (packages, variants or package families).
     """
     def __init__(self, package_paths=None, resource_type=None, no_local=False,
-                 latest=False, after_time=None, before_time=None, validate=False):
+                 latest=False, after_time=None, before_time=None, validate=False,
+                 max_workers=None):
         """Create resource search.
 
         Args:
@@ -189,6 +258,9 @@ class ResourceSearcher(object):
                 epoch time
             validate (bool): Validate each resource that is found. If False,
                 results are not validated (ie, `validation_error` is None).
+            max_workers (int): Number of threads to search package
+                repositories and families with. If None, see
+                `get_default_max_workers`.
 
         Returns:
             List of `ResourceSearchResult` objects
@@ -199,6 +271,7 @@ class ResourceSearcher(object):
         self.after_time = after_time
         self.before_time = before_time
         self.validate = validate
+        self.max_workers = max_workers
 
         if package_paths:
             self.package_paths = package_paths
@@ -207,12 +280,19 @@ class ResourceSearcher(object):
         else:
             self.package_paths = None
 
-    def iter_resources(self, resources_request=None):
+    def iter_resources(self, resources_request=None, ordered=True):
         """Iterate over matching resources.
 
+        Package families are listed in each repository, and then matching
+        families are searched, in a pool of threads (see `max_workers`).
+        Results are yielded as soon as each family has been searched.
+
         Args:
             resources_request (str): Resource to search, glob-style patterns
                 are supported. If None, returns all matching resource types.
+            ordered (bool): If False, results of each family are yielded as
+                soon as they are found, rather than in alphabetical order of
+                family.
 
         Returns:
             2-tuple:
@@ -222,28 +302,23 @@ class ResourceSearcher(object):
               packages or variants.
         """
 
-    def search(self, resources_request=None):
-        """Search for resources.
-
-        Args:
-            resources_request (str): Resource to search, glob-style patterns
-                are supported. If None, returns all matching resource types.
-
-        Returns:
-            2-tuple:
-            - str: resource type (family, package, variant);
-            - List of `ResourceSearchResult`: Matching resources. Will be in
-              alphabetical order if families, and version ascending for
-              packages or variants.
-        """
-
         # Find matching package families
         name_pattern, version_range = self._parse_request(resources_request)
 
-        family_names = set(
-            x.name for x in iter_package_families(paths=self.package_paths)
-            if fnmatch.fnmatch(x.name, name_pattern)
-        )
+        paths = self.package_paths
+        if paths is None:
+            paths = config.packages_path
+
+        def _list_families(path):
+            return [
+                x.name for x in iter_package_families(paths=[path])
+                if fnmatch.fnmatch(x.name, name_pattern)
+            ]
+
+        family_names = set()
+        for _, names in iter_parallel(_list_families, paths,
+                                      max_workers=self.max_workers):
+            family_names.update(names)
 
         family_names = sorted(family_names)
 
@@ -255,69 +330,95 @@ class ResourceSearcher(object):
         else:
             resource_type = "family"
 
-        if not family_names:
-            return resource_type, []
-
-        # return list of family names (validation is n/a in this case)
+        # return family names (validation is n/a in this case)
         if resource_type == "family":
-            results = [ResourceSearchResult(x, "family") for x in family_names]
+            results = (ResourceSearchResult(x, "family") for x in family_names)
             return "family", results
 
-        results = []
+        def _search_family(name):
+            return self._search_family(name, version_range, resource_type)
 
-        # iterate over packages/variants
-        for name in family_names:
-            it = iter_packages(name, version_range, paths=self.package_paths)
-            packages = sorted(it, key=lambda x: x.version)
+        def _iter_results():
+            it = iter_parallel(_search_family, family_names,
+                               max_workers=self.max_workers, ordered=ordered)
 
-            if self.latest and packages:
-                packages = [packages[-1]]
+            for _, results in it:
+                for result in results:
+                    yield result
 
-            for package in packages:
-                # validate and check time (accessing timestamp may cause
-                # validation fail)
-                try:
-                    if package.timestamp:
-                        if self.after_time and package.timestamp < self.after_time:
-                            continue
-                        if self.before_time and package.timestamp >= self.before_time:
-                            continue
+        return resource_type, _iter_results()
 
-                    if self.validate:
-                        package.validate_data()
+    def search(self, resources_request=None):
+        """Search for resources.
 
-                except ResourceContentError as e:
-                    if resource_type == "package":
-                        result = ResourceSearchResult(package, "package", str(e))
-                        results.append(result)
+        Args:
+            resources_request (str): Resource to search, glob-style patterns
+                are supported. If None, returns all matching resource types.
 
-                    continue
+        Returns:
+            2-tuple:
+            - str: resource type (family, package, variant);
+            - List of `ResourceSearchResult`: Matching resources. Will be in
+              alphabetical order if families, and version ascending for
+              packages or variants.
+        """
+        resource_type, it = self.iter_resources(resources_request)
+        return resource_type, list(it)
 
+    def _search_family(self, name, version_range, resource_type):
+        results = []
+
+        it = iter_packages(name, version_range, paths=self.package_paths)
+        packages = sorted(it, key=lambda x: x.version)
+
+        if self.latest and packages:
+            packages = [packages[-1]]
+
+        for package in packages:
+            # validate and check time (accessing timestamp may cause
+            # validation fail)
+            try:
+                if package.timestamp:
+                    if self.after_time and package.timestamp < self.after_time:
+                        continue
+                    if self.before_time and package.timestamp >= self.before_time:
+                        continue
+
+                if self.validate:
+                    package.validate_data()
+
+            except ResourceContentError as e:
                 if resource_type == "package":
-                    result = ResourceSearchResult(package, "package")
+                    result = ResourceSearchResult(package, "package", str(e))
                     results.append(result)
-                    continue
 
-                # iterate variants
-                try:
-                    for variant in package.iter_variants():
-                        if self.validate:
-                            try:
-                                variant.validate_data()
-                            except ResourceContentError as e:
-                                result = ResourceSearchResult(
-                                    variant, "variant", str(e))
-                                results.append(result)
-                                continue
+                continue
 
-                        result = ResourceSearchResult(variant, "variant")
-                        results.append(result)
+            if resource_type == "package":
+                result = ResourceSearchResult(package, "package")
+                results.append(result)
+                continue
 
-                except ResourceContentError:
-                    # this may happen if 'variants' in package is malformed
-                    continue
+            # iterate variants
+            try:
+                for variant in package.iter_variants():
+                    if self.validate:
+                        try:
+                            variant.validate_data()
+                        except ResourceContentError as e:
+                            result = ResourceSearchResult(
+                                variant, "variant", str(e))
+                            results.append(result)
+                            continue
 
-        return resource_type, results
+                    result = ResourceSearchResult(variant, "variant")
+                    results.append(result)
+
+            except ResourceContentError:
+                # this may happen if 'variants' in package is malformed
+                continue
+
+        return results
 
     @classmethod
     def _parse_request(cls, resources_request):
@@ -362,14 +463,26 @@ class ResourceSearchResultFormatter(object):
     def print_search_results(self, search_results, buf=sys.stdout):
         """Print formatted search results.
 
+        Each result is printed as soon as it is available, so this can be used
+        with the iterator returned by `ResourceSearcher.iter_resources`.
+
         Args:
-            search_results (list of `ResourceSearchResult`): Search to format.
+            search_results (iterable of `ResourceSearchResult`): Search to
+                format.
+
+        Returns:
+            int: Number of results printed.
         """
-        formatted_lines = self.format_search_results(search_results)
         pr = Printer(buf)
+        num_results = 0
+
+        for search_result in search_results:
+            for txt, style in self._format_search_result(search_result):
+                pr(txt, style)
+
+            num_results += 1
 
-        for txt, style in formatted_lines:
-            pr(txt, style)
+        return num_results
 
     def format_search_results(self, search_results):
         """Format search results.
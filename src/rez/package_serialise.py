@@ -9,7 +9,6 @@ from rez.utils.sourcecode import SourceCode
 from rez.utils.formatting import PackageRequest, indent, \
     dict_to_attributes_code, as_block_string
 from rez.utils.schema import Required
-from rez.utils.yaml import dump_yaml
 from pprint import pformat
 from rez.vendor.six import six
 
@@ -165,6 +164,8 @@ def _commented_old_command_annotations(sourcecode):
 
 
 def _dump_package_data_yaml(items, buf):
+    from rez.utils.yaml import dump_yaml
+
     for i, (key, value) in enumerate(items):
         if isinstance(value, SourceCode) \
                 and key in ("commands", "pre_commands", "post_commands"):
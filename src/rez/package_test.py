@@ -5,9 +5,12 @@ from rez.exceptions import RezError, PackageNotFoundError, PackageTestError
 from rez.utils.data_utils import RO_AttrDictWrapper
 from rez.utils.colorize import heading, Printer
 from rez.utils.logging_ import print_info, print_warning, print_error
+from rez.utils.parallel import iter_parallel
 from rez.vendor.six import six
 from rez.vendor.version.requirement import Requirement, RequirementList
 from pipes import quote
+import subprocess
+import threading
 import time
 import sys
 import os
@@ -93,6 +96,10 @@ class PackageTestRunner(object):
         self.contexts = {}
         self.stopped_on_fail = False
 
+        # see `run_tests`
+        self._context_lock = threading.Lock()
+        self._output_lock = threading.RLock()
+
         # use a common timestamp across all tests - this ensures that tests
         # don't pick up new packages halfway through (ie from one test to another)
         self.timestamp = int(time.time())
@@ -268,27 +275,169 @@ class PackageTestRunner(object):
             target_variants = self._get_target_variants(test_name)
 
         for variant in target_variants:
-
-            # get test info for this variant. If None, that just means that this
-            # variant doesn't provide this test. That's ok - 'tests' might be
-            # implemented as a late function attribute that provides some tests
-            # for some variants and not others
-            #
             test_info = self._get_test_info(test_name, variant)
-            if not test_info:
-                self._add_test_result(
+            status, exitcode_ = self._run_test_on_variant(
+                test_name, variant, test_info)
+
+            if status == "failed":
+                if not exitcode:
+                    exitcode = exitcode_
+
+                if self.stop_on_fail:
+                    self.stopped_on_fail = True
+                    return exitcode
+
+            # just test against one variant in this case
+            elif status == "success" and test_info["on_variants"] is False:
+                break
+
+        return exitcode
+
+    def run_tests(self, test_names, max_workers=None):
+        """Run several tests.
+
+        If `max_workers` is greater than one, tests are run concurrently, as
+        are the runs of a test on different variants (unless the test is only
+        run on one variant). The output of each test command is prefixed with
+        the test name and variant index. Test results are recorded in the
+        same order as they would be if run one at a time.
+
+        Args:
+            test_names (list of str): Names of tests to run.
+            max_workers (int): Maximum number of tests to run at once. If None
+                or 1, tests are run one at a time. Ignored if
+                `use_current_env` is True.
+
+        Returns:
+            int: Exit code of the first failed test, or 0 if none failed. See
+                `run_test`.
+        """
+        exitcode = 0
+
+        if not max_workers or max_workers <= 1 or self.use_current_env:
+            for test_name in test_names:
+                if not self.stopped_on_fail:
+                    ret = self.run_test(test_name)
+                    if ret and not exitcode:
+                        exitcode = ret
+
+            return exitcode
+
+        package = self.get_package()
+
+        # Each job is a test to run on a list of variants. A test that runs on
+        # just one variant is tried on each variant in turn until it succeeds,
+        # so these variants are not run concurrently.
+        #
+        jobs = []
+
+        for test_name in test_names:
+            if test_name not in self.get_test_names():
+                raise PackageTestError("Test '%s' not found in package %s"
+                                       % (test_name, package.uri))
+
+            target_variants = self._get_target_variants(test_name)
+
+            test_infos = [
+                self._get_test_info(test_name, x) for x in target_variants
+            ]
+
+            if any(x and x["on_variants"] is False for x in test_infos):
+                jobs.append((test_name, target_variants))
+            else:
+                jobs.extend((test_name, [x]) for x in target_variants)
+
+        def _run_job(job):
+            test_name, variants = job
+            results = []
+            exitcode_ = 0
+
+            def _add_result(*nargs):
+                results.append(nargs)
+
+            for variant in variants:
+                if self.stopped_on_fail:
+                    break
+
+                if variant.index is None:
+                    output_prefix = "[%s] " % test_name
+                else:
+                    output_prefix = "[%s:%d] " % (test_name, variant.index)
+
+                test_info = self._get_test_info(test_name, variant)
+                status, ret = self._run_test_on_variant(
                     test_name,
                     variant,
-                    "skipped",
-                    "The test is not declared in this variant"
+                    test_info,
+                    add_result=_add_result,
+                    output_prefix=output_prefix
                 )
-                continue
 
-            command = test_info["command"]
-            requires = test_info["requires"]
-            on_variants = test_info["on_variants"]
+                if status == "failed":
+                    if not exitcode_:
+                        exitcode_ = ret
+
+                    if self.stop_on_fail:
+                        self.stopped_on_fail = True
+                        break
+
+                elif status == "success" and test_info["on_variants"] is False:
+                    break
+
+            return results, exitcode_
+
+        for _, (results, ret) in iter_parallel(_run_job, jobs,
+                                               max_workers=max_workers):
+            for result in results:
+                self._add_test_result(*result)
+
+            if ret and not exitcode:
+                exitcode = ret
+
+        return exitcode
+
+    def _run_test_on_variant(self, test_name, variant, test_info,
+                             add_result=None, output_prefix=None):
+        """Run a test on a single variant.
 
-            # show progress
+        Args:
+            test_name (str): Name of test to run.
+            variant (`Variant`): Variant to run the test on.
+            test_info (dict): See `_get_test_info`.
+            add_result (callable): Called with the test result, defaults to
+                `_add_test_result`.
+            output_prefix (str): If not None, the test command's output is
+                captured, and written to `self.stdout` with this prefix on
+                each line.
+
+        Returns:
+            2-tuple: Status ('success', 'failed' or 'skipped'), and exit code.
+            The exit code is -1 if the test failed because it was not able to
+            run (eg its environment could not be configured).
+        """
+        package = self.get_package()
+        add_result = add_result or self._add_test_result
+
+        # If there is no test info, that just means that this variant doesn't
+        # provide this test. That's ok - 'tests' might be implemented as a late
+        # function attribute that provides some tests for some variants and
+        # not others
+        #
+        if not test_info:
+            add_result(
+                test_name,
+                variant,
+                "skipped",
+                "The test is not declared in this variant"
+            )
+            return "skipped", 0
+
+        command = test_info["command"]
+        requires = test_info["requires"]
+        on_variants = test_info["on_variants"]
+
+        # show progress
+        with self._output_lock:
             if self.verbose > 1:
                 self._print_header(
                     "\nRunning test: %s\nPackage: %s\n%s\n",
@@ -300,133 +449,127 @@ class PackageTestRunner(object):
                     test_name, '-' * 80
                 )
 
-            # apply variant selection filter if specified
-            if isinstance(on_variants, dict):
-                filter_type = on_variants["type"]
-                func = getattr(self, "_on_variant_" + filter_type)
-                do_test = func(variant, on_variants)
+        # apply variant selection filter if specified
+        if isinstance(on_variants, dict):
+            filter_type = on_variants["type"]
+            func = getattr(self, "_on_variant_" + filter_type)
+            do_test = func(variant, on_variants)
 
-                if not do_test:
-                    reason = (
-                        "Test skipped as specified by on_variants '%s' filter"
-                        % filter_type
-                    )
-
-                    print_info(reason)
-
-                    self._add_test_result(
-                        test_name,
-                        variant,
-                        "skipped",
-                        reason
-                    )
+            if not do_test:
+                reason = (
+                    "Test skipped as specified by on_variants '%s' filter"
+                    % filter_type
+                )
 
-                    continue
+                print_info(reason)
 
-            # add requirements to force the current variant to be resolved.
-            # TODO this is not perfect, and will need to be updated when
-            # explicit variant selection is added to rez (this is a new
-            # feature). Until then, there's no guarantee that we'll resolve to
-            # the variant we want, so we take that into account here.
-            #
-            requires.extend(map(str, variant.variant_requires))
-
-            # create test runtime env
-            exc = None
-            try:
-                context = self._get_context(requires)
-            except RezError as e:
-                exc = e
-
-            fail_reason = None
-            if exc is not None:
-                fail_reason = "The test environment failed to resolve: %s" % exc
-            elif context is None:
-                fail_reason = "The current environment does not meet test requirements"
-            elif not context.success:
-                fail_reason = "The test environment failed to resolve"
-
-            if fail_reason:
-                self._add_test_result(
+                add_result(
                     test_name,
                     variant,
-                    "failed",
-                    fail_reason
+                    "skipped",
+                    reason
                 )
 
-                print_error(fail_reason)
+                return "skipped", 0
 
-                if not exitcode:
-                    exitcode = -1
+        # add requirements to force the current variant to be resolved.
+        # TODO this is not perfect, and will need to be updated when
+        # explicit variant selection is added to rez (this is a new
+        # feature). Until then, there's no guarantee that we'll resolve to
+        # the variant we want, so we take that into account here.
+        #
+        requires.extend(map(str, variant.variant_requires))
+
+        # create test runtime env
+        exc = None
+        try:
+            context = self._get_context(requires)
+        except RezError as e:
+            exc = e
+
+        fail_reason = None
+        if exc is not None:
+            fail_reason = "The test environment failed to resolve: %s" % exc
+        elif context is None:
+            fail_reason = "The current environment does not meet test requirements"
+        elif not context.success:
+            fail_reason = "The test environment failed to resolve"
+
+        if fail_reason:
+            add_result(
+                test_name,
+                variant,
+                "failed",
+                fail_reason
+            )
 
-                if self.stop_on_fail:
-                    self.stopped_on_fail = True
-                    return exitcode
+            print_error(fail_reason)
+            return "failed", -1
 
-                continue
+        # check that this has actually resolved the variant we want
+        resolved_variant = context.get_resolved_package(package.name)
+        assert resolved_variant
 
-            # check that this has actually resolved the variant we want
-            resolved_variant = context.get_resolved_package(package.name)
-            assert resolved_variant
+        if resolved_variant.handle != variant.handle:
+            print_warning(
+                "Could not resolve environment for this variant (%s). This "
+                "is a known issue and will be fixed once 'explicit variant "
+                "selection' is added to rez.", variant.uri
+            )
 
-            if resolved_variant.handle != variant.handle:
-                print_warning(
-                    "Could not resolve environment for this variant (%s). This "
-                    "is a known issue and will be fixed once 'explicit variant "
-                    "selection' is added to rez.", variant.uri
-                )
+            add_result(
+                test_name,
+                variant,
+                "skipped",
+                "Could not resolve to variant (known issue)"
+            )
+            return "skipped", 0
 
-                self._add_test_result(
-                    test_name,
-                    variant,
-                    "skipped",
-                    "Could not resolve to variant (known issue)"
-                )
-                continue
+        # expand refs like {root} in commands
+        if isinstance(command, basestring):
+            command = variant.format(command)
+        else:
+            command = map(variant.format, command)
 
-            # expand refs like {root} in commands
+        # run the test in the context
+        if self.verbose:
             if isinstance(command, basestring):
-                command = variant.format(command)
+                cmd_str = command
             else:
-                command = map(variant.format, command)
+                cmd_str = ' '.join(map(quote, command))
 
-            # run the test in the context
-            if self.verbose:
+            with self._output_lock:
                 if self.verbose > 1:
                     context.print_info(self.stdout)
                     print('')
 
-                if isinstance(command, basestring):
-                    cmd_str = command
-                else:
-                    cmd_str = ' '.join(map(quote, command))
-
                 self._print_header("Running test command: %s", cmd_str)
 
-            if self.dry_run:
-                self._add_test_result(
-                    test_name,
-                    variant,
-                    "skipped",
-                    "Dry run mode"
-                )
-                continue
+        if self.dry_run:
+            add_result(
+                test_name,
+                variant,
+                "skipped",
+                "Dry run mode"
+            )
+            return "skipped", 0
 
-            def _pre_test_commands(executor):
-                # run package.py:pre_test_commands() if present
-                pre_test_commands = getattr(variant, "pre_test_commands")
-                if not pre_test_commands:
-                    return
+        def _pre_test_commands(executor):
+            # run package.py:pre_test_commands() if present
+            pre_test_commands = getattr(variant, "pre_test_commands")
+            if not pre_test_commands:
+                return
 
-                test_ns = {
-                    "name": test_name
-                }
+            test_ns = {
+                "name": test_name
+            }
 
-                with executor.reset_globals():
-                    executor.bind("this", variant)
-                    executor.bind("test", RO_AttrDictWrapper(test_ns))
-                    executor.execute_code(pre_test_commands)
+            with executor.reset_globals():
+                executor.bind("this", variant)
+                executor.bind("test", RO_AttrDictWrapper(test_ns))
+                executor.execute_code(pre_test_commands)
 
+        if output_prefix is None:
             retcode, _, _ = context.execute_shell(
                 command=command,
                 actions_callback=_pre_test_commands,
@@ -434,43 +577,56 @@ class PackageTestRunner(object):
                 stderr=self.stderr,
                 block=True
             )
+        else:
+            retcode = self._execute_shell_prefixed(
+                context,
+                output_prefix,
+                command=command,
+                actions_callback=_pre_test_commands
+            )
 
-            if retcode:
-                print_warning("Test command exited with code %d", retcode)
-
-                self._add_test_result(
-                    test_name,
-                    variant,
-                    "failed",
-                    "Test failed with exit code %d" % retcode
-                )
-
-                if not exitcode:
-                    exitcode = retcode
+        if retcode:
+            print_warning("Test command exited with code %d", retcode)
 
-                if self.stop_on_fail:
-                    self.stopped_on_fail = True
-                    return exitcode
-
-                continue
-
-            # test passed
-            self._add_test_result(
+            add_result(
                 test_name,
                 variant,
-                "success",
-                "Test succeeded"
+                "failed",
+                "Test failed with exit code %d" % retcode
             )
 
-            # just test against one variant in this case
-            if on_variants is False:
-                break
+            return "failed", retcode
 
-        return exitcode
+        # test passed
+        add_result(
+            test_name,
+            variant,
+            "success",
+            "Test succeeded"
+        )
+
+        return "success", 0
 
     def print_summary(self):
         self.test_results.print_summary()
 
+    def _execute_shell_prefixed(self, context, output_prefix, **kwargs):
+        p = context.execute_shell(
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            block=False,
+            **kwargs
+        )
+
+        for line in iter(p.stdout.readline, ''):
+            with self._output_lock:
+                self.stdout.write(output_prefix + line)
+                self.stdout.flush()
+
+        p.stdout.close()
+        return p.wait()
+
     def _add_test_result(self, *nargs, **kwargs):
         self.test_results.add_test_result(*nargs, **kwargs)
 
@@ -572,27 +728,30 @@ class PackageTestRunner(object):
             else:
                 return None
 
-        # create context or use cached context
+        # create context or use cached context. Tests that are run
+        # concurrently wait for a context that another test is resolving
         key = tuple(requires)
-        context = self.contexts.get(key)
 
-        if context is None:
-            if self.verbose and not quiet:
-                self._print_header(
-                    "Resolving test environment: %s\n",
-                    ' '.join(map(quote, requires))
-                )
+        with self._context_lock:
+            context = self.contexts.get(key)
 
-            with open(os.devnull, 'w') as f:
-                context = ResolvedContext(
-                    package_requests=requires,
-                    package_paths=self.package_paths,
-                    buf=(f if quiet else None),
-                    timestamp=self.timestamp,
-                    **self.context_kwargs
-                )
+            if context is None:
+                if self.verbose and not quiet:
+                    self._print_header(
+                        "Resolving test environment: %s\n",
+                        ' '.join(map(quote, requires))
+                    )
+
+                with open(os.devnull, 'w') as f:
+                    context = ResolvedContext(
+                        package_requests=requires,
+                        package_paths=self.package_paths,
+                        buf=(f if quiet else None),
+                        timestamp=self.timestamp,
+                        **self.context_kwargs
+                    )
 
-            self.contexts[key] = context
+                self.contexts[key] = context
 
         if not context.success and not quiet:
             context.print_info(buf=self.stderr)
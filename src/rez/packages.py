@@ -6,6 +6,7 @@ from rez.package_serialise import dump_package_data
 from rez.utils import reraise
 from rez.utils.sourcecode import SourceCode
 from rez.utils.data_utils import cached_property
+from rez.utils.depends_index import depends_index
 from rez.utils.formatting import StringFormatMixin, StringFormatType
 from rez.utils.schema import schema_keys
 from rez.utils.resources import ResourceHandle, ResourceWrapper
@@ -453,7 +454,11 @@ class Variant(PackageBaseResourceWrapper):
                                         overrides=overrides)
         if resource is None:
             return None
-        elif resource is self.resource:
+
+        if not dry_run:
+            depends_index.update_family(path, resource.name)
+
+        if resource is self.resource:
             return self
         else:
             return Variant(resource)
@@ -864,8 +869,8 @@ def get_completions(prefix, paths=None, family_only=False):
 
     words = set()
     if not fam:
-        words = set(x.name for x in iter_package_families(paths=paths)
-                    if x.name.startswith(prefix))
+        words = set(x for x in _iter_completion_family_names(paths)
+                    if x.startswith(prefix))
         if len(words) == 1:
             fam = next(iter(words))
 
@@ -873,9 +878,8 @@ def get_completions(prefix, paths=None, family_only=False):
         return words
 
     if fam:
-        it = iter_packages(fam, paths=paths)
-        words.update(x.qualified_name for x in it
-                     if x.qualified_name.startswith(prefix))
+        it = _iter_completion_qualified_names(fam, paths)
+        words.update(x for x in it if x.startswith(prefix))
 
     if op:
         words = set(op + x for x in words)
@@ -927,6 +931,36 @@ def get_latest_package_from_string(txt, paths=None, error=False):
                               error=error)
 
 
+def _iter_completion_family_names(paths=None):
+    from rez.utils.completion_index import completion_index
+
+    for path in (paths or config.packages_path):
+        names = None
+        if completion_index.enabled:
+            names = completion_index.get_family_names(path)
+
+        if names is None:
+            names = (x.name for x in iter_package_families(paths=[path]))
+
+        for name in names:
+            yield name
+
+
+def _iter_completion_qualified_names(name, paths=None):
+    from rez.utils.completion_index import completion_index
+
+    for path in (paths or config.packages_path):
+        names = None
+        if completion_index.enabled:
+            names = completion_index.get_qualified_names(path, name)
+
+        if names is None:
+            names = (x.qualified_name for x in iter_packages(name, paths=[path]))
+
+        for qualified_name in names:
+            yield qualified_name
+
+
 def _get_families(name, paths=None):
     entries = []
     for path in (paths or config.packages_path):
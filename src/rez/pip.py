@@ -13,6 +13,7 @@ from rez.utils.pip import get_rez_requirements, pip_to_rez_package_name, \
     pip_to_rez_version
 from rez.utils.logging_ import print_debug, print_info, print_error, \
     print_warning
+from rez.utils.parallel import iter_parallel
 from rez.exceptions import BuildError, PackageFamilyNotFoundError, \
     PackageNotFoundError, RezSystemError
 from rez.package_maker import make_package
@@ -26,6 +27,7 @@ import shutil
 import subprocess
 import sys
 from tempfile import mkdtemp
+import time
 from textwrap import dedent
 
 
@@ -228,9 +230,50 @@ def find_pip_from_context(python_version, pip_version=None):
     return py_exe, pip_version, context
 
 
+def get_pip_install_command(py_exe, source_name, targetpath,
+                            mode=InstallMode.min_deps, extra_args=None):
+    """Get the pip command that installs a package into a target directory.
+
+    Args:
+        py_exe (str): Python executable to run pip with.
+        source_name (str): Name of package or archive/url containing the pip
+            package source.
+        targetpath (str): Directory to install into, unless a target is
+            given in the extra args.
+        mode (`InstallMode`): Installation mode.
+        extra_args (List[str]): Additional options to the pip install command,
+            defaults to config.pip_extra_args.
+
+    Returns:
+        List of str: The pip command.
+    """
+    cmd = [py_exe, "-m", "pip", "install"]
+
+    _extra_args = extra_args or config.pip_extra_args or []
+
+    if "--no-use-pep517" not in _extra_args:
+        cmd.append("--use-pep517")
+
+    if not _option_present(_extra_args, "-t", "--target"):
+        cmd.append("--target=%s" % targetpath)
+
+    if mode == InstallMode.no_deps and "--no-deps" not in _extra_args:
+        cmd.append("--no-deps")
+
+    # reuse downloaded and built wheels across installs
+    if config.pip_wheel_cache_path and \
+            not _option_present(_extra_args, "--cache-dir", "--no-cache-dir"):
+        cache_path = os.path.expanduser(config.pip_wheel_cache_path)
+        cmd.append("--cache-dir=%s" % cache_path)
+
+    cmd.extend(_extra_args)
+    cmd.append(source_name)
+    return cmd
+
+
 def pip_install_package(source_name, pip_version=None, python_version=None,
                         mode=InstallMode.min_deps, release=False, prefix=None,
-                        extra_args=None):
+                        extra_args=None, max_workers=None):
     """Install a pip-compatible python package as a rez package.
     Args:
         source_name (str): Name of package or archive/url containing the pip
@@ -245,6 +288,9 @@ def pip_install_package(source_name, pip_version=None, python_version=None,
         release (bool): If True, install as a released package; otherwise, it
             will be installed as a local package.
         extra_args (List[str]): Additional options to the pip install command.
+        max_workers (int): Maximum number of distributions to convert into
+            rez packages at once. If None, see
+            `rez.utils.parallel.get_default_max_workers`.
 
     Returns:
         2-tuple:
@@ -276,22 +322,13 @@ def pip_install_package(source_name, pip_version=None, python_version=None,
         context.print_info(buf)
         _log(buf.getvalue())
 
-    # Build pip commandline
-    cmd = [py_exe, "-m", "pip", "install"]
-
-    _extra_args = extra_args or config.pip_extra_args or []
-
-    if "--no-use-pep517" not in _extra_args:
-        cmd.append("--use-pep517")
-
-    if not _option_present(_extra_args, "-t", "--target"):
-        cmd.append("--target=%s" % targetpath)
-
-    if mode == InstallMode.no_deps and "--no-deps" not in _extra_args:
-        cmd.append("--no-deps")
-
-    cmd.extend(_extra_args)
-    cmd.append(source_name)
+    cmd = get_pip_install_command(
+        py_exe,
+        source_name,
+        targetpath,
+        mode=mode,
+        extra_args=extra_args
+    )
 
     # run pip
     #
@@ -333,8 +370,9 @@ def pip_install_package(source_name, pip_version=None, python_version=None,
                 suffix = (' (%s)' % variant.subpath) if variant.subpath else ''
                 print_(template.format(**locals()))
 
-    # get list of package and dependencies
-    for distribution in distributions:
+    def convert_distribution(distribution):
+        start_time = time.time()
+
         # convert pip requirements into rez requirements
         rez_requires = get_rez_requirements(
             installed_dist=distribution,
@@ -358,13 +396,6 @@ def pip_install_package(source_name, pip_version=None, python_version=None,
         # determine where pip files need to be copied into rez package
         src_dst_lut = _get_distribution_files_mapping(distribution, targetpath)
 
-        # build tools list
-        tools = []
-        for relpath in src_dst_lut.values():
-            dir_, filename = os.path.split(relpath)
-            if dir_ == "bin":
-                tools.append(filename)
-
         # Sanity warning to see if any files will be copied
         if not src_dst_lut:
             message = 'No source files exist for {}!'
@@ -372,22 +403,57 @@ def pip_install_package(source_name, pip_version=None, python_version=None,
                 message += '\nTry again with rez-pip --verbose ...'
             print_warning(message.format(distribution.name_and_version))
 
-        def make_root(variant, path):
-            """Using distlib to iterate over all installed files of the current
-            distribution to copy files to the target directory of the rez package
-            variant
-            """
-            for rel_src, rel_dest in src_dst_lut.items():
-                src = os.path.join(targetpath, rel_src)
-                dest = os.path.join(path, rel_dest)
+        return rez_requires, src_dst_lut, time.time() - start_time
+
+    def copy_payload(payload):
+        """Copy the installed files of a distribution into a rez package
+        variant's root.
+        """
+        _, src_dst_lut, path = payload
+        start_time = time.time()
 
-                if not os.path.exists(os.path.dirname(dest)):
-                    os.makedirs(os.path.dirname(dest))
+        for rel_src, rel_dest in src_dst_lut.items():
+            src = os.path.join(targetpath, rel_src)
+            dest = os.path.join(path, rel_dest)
 
-                shutil.copyfile(src, dest)
+            if not os.path.exists(os.path.dirname(dest)):
+                os.makedirs(os.path.dirname(dest))
 
-                if _is_exe(src):
-                    shutil.copystat(src, dest)
+            shutil.copyfile(src, dest)
+
+            if _is_exe(src):
+                shutil.copystat(src, dest)
+
+        return time.time() - start_time
+
+    # Converting distributions (reading their records and requirements) and
+    # copying their files is done concurrently. Package definitions are
+    # installed into the repository one at a time.
+    #
+    conversions = iter_parallel(convert_distribution, distributions,
+                                max_workers=max_workers)
+
+    payloads = []
+    timings = {}
+
+    # get list of package and dependencies
+    for distribution, (rez_requires, src_dst_lut, secs) in conversions:
+        timings[distribution.name_and_version] = [secs, 0, 0.0]
+
+        # build tools list
+        tools = []
+        for relpath in src_dst_lut.values():
+            dir_, filename = os.path.split(relpath)
+            if dir_ == "bin":
+                tools.append(filename)
+
+        def make_root(variant, path):
+            """Files are copied to the target directory of the rez package
+            variant once all the packages are installed (see `copy_payload`).
+            """
+            name_and_version = distribution.name_and_version
+            payloads.append((name_and_version, src_dst_lut, path))
+            timings[name_and_version][1] += len(src_dst_lut)
 
         # create the rez package
         name = pip_to_rez_package_name(distribution.name)
@@ -455,6 +521,17 @@ def pip_install_package(source_name, pip_version=None, python_version=None,
 
         log_append_pkg_variants(pkg)
 
+    for payload, secs in iter_parallel(copy_payload, payloads,
+                                       max_workers=max_workers):
+        timings[payload[0]][2] += secs
+
+    for distribution in distributions:
+        secs, num_files, copy_secs = timings[distribution.name_and_version]
+        _log(
+            "%s: converted in %.2f secs, %d files copied in %.2f secs"
+            % (distribution.name_and_version, secs, num_files, copy_secs)
+        )
+
     # cleanup
     shutil.rmtree(targetpath)
 
@@ -6,11 +6,16 @@ from rez.utils.formatting import columnise
 from rez.utils.schema import dict_to_schema
 from rez.utils.data_utils import LazySingleton, cached_property, deep_update
 from rez.utils.logging_ import print_debug, print_warning
+from rez.utils.filesystem import get_json_cache_filename, read_json_file, \
+    write_json_file
 from rez.vendor.six import six
 from rez.exceptions import RezPluginError
+from rez.utils import json
+from threading import Lock
 import pkgutil
 import os.path
 import sys
+import time
 
 
 basestring = six.string_types[0]
@@ -78,6 +83,134 @@ def uncache_rezplugins_module_paths(instance=None):
     cached_property.uncache(instance, "rezplugins_module_paths")
 
 
+class PluginCache(object):
+    """A cache of plugin discovery results (see `config.plugin_cache_path`).
+
+    Discovering plugins involves scanning every plugin path, importing every
+    plugin module, and loading the 'rezconfig' file of every plugin path. The
+    cache stores the name and path of each plugin, and the merged plugin
+    configuration, so that subsequent processes only import plugins when they
+    are first requested.
+
+    Cache entries are invalidated when the modification time of any plugin
+    path or plugin 'rezconfig' file changes (or of any directory on
+    `sys.path`, for new-style plugins). Plugins that failed to load are
+    retried when they are requested by name. The cache file is specific to
+    the python interpreter, `sys.path` and `config.plugin_path`.
+    """
+    def __init__(self):
+        self._filepath = None
+        self._data = {}
+
+    @property
+    def filepath(self):
+        path = config.plugin_cache_path
+        if not path:
+            return None
+
+        filename = get_json_cache_filename(
+            [sys.executable, sys.path, config.plugin_path])
+        return os.path.join(os.path.expanduser(path), filename)
+
+    def get_module_paths(self, func):
+        """Get the paths of python packages containing new-style plugins.
+
+        Args:
+            func (callable): Function that finds the paths.
+
+        Returns:
+            List of str.
+        """
+        stamps = self._stamps(sys.path)
+        entry = self._get("module_paths", stamps)
+        if entry is not None:
+            return entry["paths"]
+
+        paths = func()
+        self._set("module_paths", {"stamps": stamps, "paths": paths})
+        return paths
+
+    def get_plugin_type(self, type_name, paths):
+        """Get the cached plugins of the given type.
+
+        Returns:
+            dict: Containing "plugins" (plugin name -> path), "failed" (plugin
+            name -> error message) and "config_data", or None if there is no
+            valid cache entry.
+        """
+        stamps = self._plugin_type_stamps(paths)
+        return self._get("types." + type_name, stamps)
+
+    def set_plugin_type(self, type_name, paths, plugins, failed_plugins,
+                        config_data):
+        """Cache the plugins of the given type."""
+        try:
+            cacheable = (json.loads(json.dumps(config_data)) == config_data)
+        except (TypeError, ValueError):
+            cacheable = False
+
+        if not cacheable:
+            return
+
+        self._set("types." + type_name, {
+            "stamps": self._plugin_type_stamps(paths),
+            "plugins": plugins,
+            "failed": failed_plugins,
+            "config_data": config_data
+        })
+
+    def clear(self):
+        """Clear entries cached in memory."""
+        self._filepath = None
+        self._data = {}
+
+    @classmethod
+    def _stamps(cls, paths):
+        stamps = []
+        for path in paths:
+            try:
+                stamps.append([path, os.stat(path).st_mtime])
+            except (OSError, TypeError):
+                stamps.append([path, None])
+        return stamps
+
+    @classmethod
+    def _plugin_type_stamps(cls, paths):
+        filepaths = []
+        for path in paths:
+            filepaths.append(path)
+            filepaths.append(os.path.join(path, "rezconfig"))
+            filepaths.append(os.path.join(path, "rezconfig.py"))
+        return cls._stamps(filepaths)
+
+    def _get(self, key, stamps):
+        filepath = self.filepath
+        if not filepath:
+            return None
+
+        if filepath != self._filepath:
+            self._filepath = filepath
+            self._data = read_json_file(filepath)
+
+        entry = self._data.get(key)
+        if entry and entry.get("stamps") == stamps:
+            return entry
+        return None
+
+    def _set(self, key, entry):
+        filepath = self.filepath
+        if not filepath:
+            return
+
+        # re-read, so that plugin types cached by other processes are kept
+        data = read_json_file(filepath)
+        data[key] = entry
+        self._filepath = filepath
+        self._data = data
+
+        write_json_file(filepath, data, description="plugin cache")
+
+
 class RezPluginType(object):
     """An abstract base class representing a single type of plugin.
 
@@ -94,11 +227,17 @@ class RezPluginType(object):
         self.plugin_classes = {}
         self.failed_plugins = {}
         self.plugin_modules = {}
+        self.plugin_paths = {}
+        self.attempted_plugins = set()
+        self.load_times = {}
+        self.discovery_time = 0.0
         self.config_data = {}
+        self.from_cache = False
+        self.lock = Lock()
         self.load_plugins()
 
     def __repr__(self):
-        return '%s(%s)' % (self.__class__.__name__, self.plugin_classes.keys())
+        return '%s(%s)' % (self.__class__.__name__, self.plugin_paths.keys())
 
     def register_plugin(self, plugin_name, plugin_class, plugin_module):
         # TODO: check plugin_class to ensure it is a sub-class of expected base-class?
@@ -108,8 +247,8 @@ class RezPluginType(object):
         self.plugin_modules[plugin_name] = plugin_module
 
     def load_plugins(self):
-        import pkgutil
         from rez.backport.importlib import import_module
+        t = time.time()
         type_module_name = 'rezplugins.' + self.type_name
         package = import_module(type_module_name)
 
@@ -121,11 +260,19 @@ class RezPluginType(object):
         paths = [package.__path__] if isinstance(package.__path__, basestring) \
             else package.__path__
 
+        # plugins found by a previous process are imported on first use
+        entry = plugin_cache.get_plugin_type(self.type_name, paths)
+        if entry is not None:
+            self.plugin_paths = entry["plugins"]
+            self.failed_plugins = entry["failed"]
+            self.config_data = entry["config_data"]
+            self.from_cache = True
+            self.discovery_time = time.time() - t
+            return
+
         # reverse plugin path order, so that custom plugins have a chance to
         # be found before the builtin plugins (from /rezplugins).
-        paths = reversed(paths)
-
-        for path in paths:
+        for path in reversed(paths):
             if config.debug("plugins"):
                 print_debug("searching plugin path %s...", path)
 
@@ -149,63 +296,113 @@ class RezPluginType(object):
                                       % (self.type_name, path, modname))
                     continue
 
-                if config.debug("plugins"):
-                    print_debug("loading %s plugin at %s: %s..."
-                                % (self.type_name, path, modname))
-                try:
-                    # nerdvegas/rez#218
-                    # load_module will force reload the module if it's
-                    # already loaded, so check for that
-                    plugin_module = sys.modules.get(modname)
-                    if plugin_module is None:
-                        loader = importer.find_module(modname)
-                        plugin_module = loader.load_module(modname)
-
-                    elif os.path.dirname(plugin_module.__file__) != path:
-                        if config.debug("plugins"):
-                            # this should not happen but if it does, tell why.
-                            print_warning(
-                                "plugin module %s is not loaded from current "
-                                "load path but reused from previous imported "
-                                "path: %s" % (modname, plugin_module.__file__))
-
-                    if (hasattr(plugin_module, "register_plugin")
-                            and callable(plugin_module.register_plugin)):
-
-                        plugin_class = plugin_module.register_plugin()
-                        if plugin_class is not None:
-                            self.register_plugin(plugin_name,
-                                                 plugin_class,
-                                                 plugin_module)
-                        else:
-                            if config.debug("plugins"):
-                                print_warning(
-                                    "'register_plugin' function at %s: %s did "
-                                    "not return a class." % (path, modname))
-                    else:
-                        if config.debug("plugins"):
-                            print_warning(
-                                "no 'register_plugin' function at %s: %s"
-                                % (path, modname))
-
-                        # delete from sys.modules?
-
-                except Exception as e:
-                    nameish = modname.split('.')[-1]
-                    self.failed_plugins[nameish] = str(e)
-                    if config.debug("plugins"):
-                        import traceback
-                        from rez.vendor.six.six import StringIO
-                        out = StringIO()
-                        traceback.print_exc(file=out)
-                        print_debug(out.getvalue())
+                self._load_plugin(importer, modname, path)
 
             # load config
             data, _ = _load_config_from_filepaths([os.path.join(path, "rezconfig")])
             deep_update(self.config_data, data)
 
+        self.discovery_time = time.time() - t
+
+        plugin_cache.set_plugin_type(self.type_name, paths, self.plugin_paths,
+                                     self.failed_plugins, self.config_data)
+
+    def _load_plugin(self, importer, modname, path):
+        """Import a plugin module and register its plugin class."""
+        if config.debug("plugins"):
+            print_debug("loading %s plugin at %s: %s..."
+                        % (self.type_name, path, modname))
+
+        plugin_name = modname.split('.')[-1]
+        self.attempted_plugins.add(plugin_name)
+        t = time.time()
+
+        try:
+            # nerdvegas/rez#218
+            # load_module will force reload the module if it's
+            # already loaded, so check for that
+            plugin_module = sys.modules.get(modname)
+            if plugin_module is None:
+                loader = importer.find_module(modname)
+                plugin_module = loader.load_module(modname)
+
+            elif os.path.dirname(plugin_module.__file__) != path:
+                if config.debug("plugins"):
+                    # this should not happen but if it does, tell why.
+                    print_warning(
+                        "plugin module %s is not loaded from current "
+                        "load path but reused from previous imported "
+                        "path: %s" % (modname, plugin_module.__file__))
+
+            if (hasattr(plugin_module, "register_plugin")
+                    and callable(plugin_module.register_plugin)):
+
+                plugin_class = plugin_module.register_plugin()
+                if plugin_class is not None:
+                    self.register_plugin(plugin_name,
+                                         plugin_class,
+                                         plugin_module)
+                    self.plugin_paths[plugin_name] = path
+                    self.failed_plugins.pop(plugin_name, None)
+                else:
+                    if config.debug("plugins"):
+                        print_warning(
+                            "'register_plugin' function at %s: %s did "
+                            "not return a class." % (path, modname))
+            else:
+                if config.debug("plugins"):
+                    print_warning(
+                        "no 'register_plugin' function at %s: %s"
+                        % (path, modname))
+
+                # delete from sys.modules?
+
+        except Exception as e:
+            nameish = modname.split('.')[-1]
+            self.failed_plugins[nameish] = str(e)
+            self.plugin_paths.setdefault(nameish, path)
+            if config.debug("plugins"):
+                import traceback
+                from rez.vendor.six.six import StringIO
+                out = StringIO()
+                traceback.print_exc(file=out)
+                print_debug(out.getvalue())
+
+        self.load_times[plugin_name] = time.time() - t
+
+    def _load_cached_plugin(self, plugin_name):
+        """Import a plugin found via the plugin cache, if not yet imported.
+
+        Plugins that failed to load in the process that wrote the cache are
+        retried (once).
+        """
+        if plugin_name in self.attempted_plugins \
+                or plugin_name not in self.plugin_paths:
+            return
+
+        with self.lock:
+            if plugin_name in self.attempted_plugins:
+                return
+
+            path = self.plugin_paths[plugin_name]
+            modname = "rezplugins.%s.%s" % (self.type_name, plugin_name)
+            importer = pkgutil.get_importer(path)
+            self._load_plugin(importer, modname, path)
+
+    def load_all_plugins(self):
+        """Import all plugins of this type that have not been imported yet."""
+        for plugin_name in list(self.plugin_paths.keys()):
+            self._load_cached_plugin(plugin_name)
+
+    def get_plugin_names(self):
+        """Returns the names of the plugins of this type, without importing
+        them."""
+        return [x for x in self.plugin_paths if x not in self.failed_plugins]
+
     def get_plugin_class(self, plugin_name):
         """Returns the class registered under the given plugin name."""
+        self._load_cached_plugin(plugin_name)
+
         try:
             return self.plugin_classes[plugin_name]
         except KeyError:
@@ -214,6 +411,8 @@ class RezPluginType(object):
 
     def get_plugin_module(self, plugin_name):
         """Returns the module containing the plugin of the given name."""
+        self._load_cached_plugin(plugin_name)
+
         try:
             return self.plugin_modules[plugin_name]
         except KeyError:
@@ -227,6 +426,8 @@ class RezPluginType(object):
         from rez.config import _plugin_config_dict
         d = _plugin_config_dict.get(self.type_name, {})
 
+        self.load_all_plugins()
+
         for name, plugin_class in self.plugin_classes.items():
             if hasattr(plugin_class, "schema_dict") \
                     and plugin_class.schema_dict:
@@ -297,6 +498,10 @@ class RezPluginManager(object):
 
     @cached_property
     def rezplugins_module_paths(self):
+        return plugin_cache.get_module_paths(self._find_rezplugins_module_paths)
+
+    @classmethod
+    def _find_rezplugins_module_paths(cls):
         paths = []
         for importer, name, ispkg in pkgutil.iter_modules():
             if not ispkg:
@@ -334,7 +539,7 @@ class RezPluginManager(object):
     def get_plugins(self, plugin_type):
         """Return a list of the registered names available for the given plugin
         type."""
-        return self._get_plugin_type(plugin_type).plugin_classes.keys()
+        return self._get_plugin_type(plugin_type).get_plugin_names()
 
     def get_plugin_class(self, plugin_type, plugin_name):
         """Return the class registered under the given plugin name."""
@@ -371,19 +576,47 @@ class RezPluginManager(object):
         plugin_type = self._get_plugin_type(plugin_type)
         return plugin_type.create_instance(plugin_name, **instance_kwargs)
 
-    def get_summary_string(self):
-        """Get a formatted string summarising the plugins that were loaded."""
+    def get_summary_string(self, load_times=False):
+        """Get a formatted string summarising the plugins that were loaded.
+
+        Args:
+            load_times (bool): If True, include the time taken to discover the
+                plugins of each type, and to import each plugin.
+        """
         rows = [["PLUGIN TYPE", "NAME", "DESCRIPTION", "STATUS"],
                 ["-----------", "----", "-----------", "------"]]
+        if load_times:
+            rows[0].append("LOAD TIME")
+            rows[1].append("---------")
+
+        def _ms(secs):
+            return "%.1fms" % (secs * 1000.0)
+
         for plugin_type in sorted(self.get_plugin_types()):
+            plugin = self._get_plugin_type(plugin_type)
+            plugin.load_all_plugins()
             type_name = plugin_type.replace('_', ' ')
+
+            if load_times:
+                status = "cached" if plugin.from_cache else "scanned"
+                rows.append([type_name, '-', "(plugin discovery)", status,
+                             _ms(plugin.discovery_time)])
+
             for name in sorted(self.get_plugins(plugin_type)):
                 module = self.get_plugin_module(plugin_type, name)
                 desc = (getattr(module, "__doc__", None) or '').strip()
-                rows.append((type_name, name, desc, "loaded"))
+                row = [type_name, name, desc, "loaded"]
+                if load_times:
+                    row.append(_ms(plugin.load_times.get(name, 0.0)))
+                rows.append(row)
+
             for (name, reason) in sorted(self.get_failed_plugins(plugin_type)):
                 msg = "FAILED: %s" % reason
-                rows.append((type_name, name, '', msg))
+                row = [type_name, name, '', msg]
+                if load_times:
+                    row.append(_ms(plugin.load_times.get(name, 0.0)))
+                rows.append(row)
+
         return '\n'.join(columnise(rows))
 
 
@@ -433,6 +666,8 @@ class CommandPluginType(RezPluginType):
     type_name = "command"
 
 
+plugin_cache = PluginCache()
+
 plugin_manager = RezPluginManager()
 
 
@@ -17,7 +17,7 @@ from rez.utils.filesystem import TempDirs, is_subdirectory, canonical_path
 from rez.utils.memcached import pool_memcached_connections
 from rez.utils.logging_ import print_error, print_warning
 from rez.backport.shutilwhich import which
-from rez.rex import RexExecutor, Python, OutputStyle
+from rez.rex import RexExecutor, Python, OutputStyle, literal
 from rez.rex_bindings import VersionBinding, VariantBinding, \
     VariantsBinding, RequirementsBinding, EphemeralsBinding, intersects
 from rez import package_order
@@ -28,16 +28,11 @@ from rez.package_cache import PackageCache
 from rez.shells import create_shell
 from rez.exceptions import ResolvedContextError, PackageCommandError, \
     RezError, _NeverError, PackageCacheError, PackageNotFoundError
-from rez.utils.graph_utils import write_dot, write_compacted, \
-    read_graph_from_string
-from rez.utils.resolve_graph import failure_detail_from_graph
 from rez.vendor.six import six
 from rez.vendor.version.version import VersionRange
 from rez.vendor.version.requirement import Requirement
 from rez.vendor.enum import Enum
-from rez.vendor import yaml
 from rez.utils import json
-from rez.utils.yaml import dump_yaml
 from rez.utils.platform_ import platform_
 
 from contextlib import contextmanager
@@ -116,6 +111,36 @@ def get_lock_request(name, version, patch_lock, weak=True):
     return PackageRequest(s)
 
 
+class _ReplayedCallback(object):
+    """An actions callback that is only run once.
+
+    The first call runs the callback, and records the actions that it adds to
+    the executor. Later calls add the same actions to the given executor,
+    rather than running the callback again.
+    """
+    def __init__(self, callback):
+        self.callback = callback
+        self.actions = None
+
+    def __call__(self, executor):
+        if self.actions is None:
+            num_actions = len(executor.actions)
+            self.callback(executor)
+            self.actions = executor.actions[num_actions:]
+            return
+
+        # the action args have already been formatted
+        manager = executor.manager
+        formatter = manager.formatter
+        manager.formatter = lambda x: x
+
+        try:
+            for action in self.actions:
+                getattr(manager, action.name)(*action.args)
+        finally:
+            manager.formatter = formatter
+
+
 class ResolvedContext(object):
     """A class that resolves, stores and spawns Rez environments.
 
@@ -127,7 +152,7 @@ class ResolvedContext(object):
     command within a configured python namespace, without spawning a child
     shell.
     """
-    serialize_version = (4, 7)
+    serialize_version = (4, 8)
     tmpdir_manager = TempDirs(config.context_tmpdir, prefix="rez_context_")
     context_tracking_payload = None
     context_tracking_lock = threading.Lock()
@@ -160,7 +185,7 @@ class ResolvedContext(object):
                  package_filter=None, package_orderers=None, max_fails=-1,
                  add_implicit_packages=True, time_limit=-1, callback=None,
                  package_load_callback=None, buf=None, suppress_passive=False,
-                 print_stats=False, package_caching=None):
+                 print_stats=False, package_caching=None, tracer=None):
         """Perform a package resolve, and store the result.
 
         Args:
@@ -199,6 +224,8 @@ class ResolvedContext(object):
             package_caching (bool|None): If True, apply package caching settings
                 as per the config. If None, enable as determined by config
                 setting 'package_cache_during_build'.
+            tracer (`Tracer`): If provided, solver events are recorded to this
+                tracer. See `rez.utils.tracing`.
         """
         self.load_path = None
 
@@ -279,6 +306,10 @@ class ResolvedContext(object):
         self.parent_suite_path = None
         self.suite_context_name = None
 
+        # environments stored by `freeze_env`
+        self.frozen_env = None
+        self._path_listings = {}
+
         # perform the solve
         callback_ = self.Callback(buf=buf,
                                   max_fails=max_fails,
@@ -305,7 +336,8 @@ class ResolvedContext(object):
                             verbosity=verbosity,
                             buf=buf,
                             suppress_passive=suppress_passive,
-                            print_stats=print_stats)
+                            print_stats=print_stats,
+                            tracer=tracer)
 
         resolver.solve()
 
@@ -616,6 +648,8 @@ class ResolvedContext(object):
             A string or `pygraph.digraph` object, or None if there is no graph
             associated with the resolve.
         """
+        from rez.utils.graph_utils import write_dot, read_graph_from_string
+
         if not self.has_graph:
             return None
 
@@ -647,6 +681,7 @@ class ResolvedContext(object):
         doc = self.to_dict()
 
         if config.rxt_as_yaml:
+            from rez.utils.yaml import dump_yaml
             content = dump_yaml(doc)
         else:
             content = json.dumps(doc, indent=4, separators=(",", ": "),
@@ -840,6 +875,7 @@ class ResolvedContext(object):
             _pr()
 
             if self.package_filter:
+                from rez.utils.yaml import dump_yaml
                 data = self.package_filter.to_pod()
                 txt = dump_yaml(data)
                 _pr("package filters:", heading)
@@ -872,6 +908,7 @@ class ResolvedContext(object):
                 % self.failure_description, critical)
 
             _pr()
+            from rez.utils.resolve_graph import failure_detail_from_graph
             _pr(failure_detail_from_graph(self.graph(as_dot=False)))
             _pr()
             _pr("To see a graph of the failed resolution, add --fail-graph "
@@ -1057,6 +1094,7 @@ class ResolvedContext(object):
             `pygraph.digraph` object.
         """
         from rez.vendor.pygraph.classes.digraph import digraph
+        from rez.utils.graph_utils import write_dot
 
         # add nodes
         nodes = {}
@@ -1108,10 +1146,14 @@ class ResolvedContext(object):
         @returns The environment dict generated by this context, when
             interpreted in a python rex interpreter.
         """
-        interp = Python(target_environ={}, passive=True)
-        executor = self._create_executor(interp, parent_environ)
-        self._execute(executor)
-        return executor.get_output()
+        def _get_environ(parent_environ_, cached_roots):
+            interp = Python(target_environ={}, passive=True)
+            executor = self._create_executor(interp, parent_environ_)
+            self._execute(executor, cached_roots=cached_roots)
+            return executor.get_output()
+
+        return self._get_env_output(_get_environ, parent_environ,
+                                    output="environ")
 
     @_on_success
     def get_key(self, key, request_only=False):
@@ -1204,14 +1246,25 @@ class ResolvedContext(object):
                 defaults to os.environ if None.
             style (): Style to format shell code in.
         """
-        executor = self._create_executor(interpreter=create_shell(shell),
-                                         parent_environ=parent_environ)
+        sh = create_shell(shell)
 
         if self.load_path and os.path.isfile(self.load_path):
-            executor.env.REZ_RXT_FILE = self.load_path
+            rxt_file = self.load_path
+        else:
+            rxt_file = None
 
-        self._execute(executor)
-        return executor.get_output(style)
+        def _get_shell_code(parent_environ_, cached_roots):
+            executor = self._create_executor(interpreter=sh,
+                                             parent_environ=parent_environ_)
+            if rxt_file:
+                executor.env.REZ_RXT_FILE = rxt_file
+
+            self._execute(executor, cached_roots=cached_roots)
+            return executor.get_output(style)
+
+        return self._get_env_output(_get_shell_code, parent_environ,
+                                    output="shell_code", shell=sh.name(),
+                                    style=style.name, rxt_file=rxt_file)
 
     @_on_success
     def get_actions(self, parent_environ=None):
@@ -1230,6 +1283,70 @@ class ResolvedContext(object):
         self._execute(executor)
         return executor.actions
 
+    @_on_success
+    def freeze_env(self, shells=None, parent_environ=None):
+        """Store the environment of this context, for faster activation.
+
+        The environ dict and the shell code for each of the given shells are
+        evaluated and stored in the context (so they are written out when the
+        context is saved). Later, `get_environ`, `get_shell_code` and commands
+        run via `execute_shell` use the stored environment rather than
+        interpreting the context again, as long as the parent environment
+        variables that the package commands read have the same values, and
+        the package payloads still exist.
+
+        Only freeze contexts whose packages do not change, such as published
+        contexts. Changes to package definitions are not detected.
+
+        Args:
+            shells (list of str): Shell types to store shell code for. If
+                None, the current shell type is used.
+            parent_environ (dict): Environment to interpret the context within,
+                defaults to os.environ if None.
+        """
+        if shells is None:
+            shells = [system.shell]
+        if parent_environ is None:
+            parent_environ = os.environ
+
+        if self.load_path and os.path.isfile(self.load_path):
+            rxt_file = self.load_path
+        else:
+            rxt_file = None
+
+        self.frozen_env = None
+        self._frozen_entries = []
+
+        try:
+            env = self.get_environ(parent_environ=parent_environ)
+            paths = [env.get("PATH", os.defpath)]
+
+            for shell in shells:
+                sh = create_shell(shell)
+                self.get_shell_code(shell=shell, parent_environ=parent_environ)
+                self._get_context_file_code(shell, parent_environ)
+
+                if rxt_file:
+                    changes = self._get_direct_environ(sh, parent_environ,
+                                                       rxt_file)
+                    if changes and "PATH" in changes["environ"]:
+                        paths.append(changes["environ"]["PATH"])
+
+            # listings of package directories in PATH, see _which
+            self._path_listings = {}
+            for path in dedup(paths):
+                self._get_path_listings(path)
+
+            entries = self._frozen_entries
+        finally:
+            self._frozen_entries = None
+
+        self.frozen_env = {
+            "fingerprint": self._get_frozen_env_fingerprint(
+                self._get_cached_roots()),
+            "entries": json.loads(json.dumps(entries))
+        }
+
     @_on_success
     def apply(self, parent_environ=None):
         """Apply the context to the current python session.
@@ -1261,7 +1378,7 @@ class ResolvedContext(object):
             Path to the program, or None if the program was not found.
         """
         env = self.get_environ(parent_environ=parent_environ)
-        path = which(cmd, env=env)
+        path = self._which(cmd, env)
         if fallback and path is None:
             path = which(cmd)
         return path
@@ -1301,6 +1418,20 @@ class ResolvedContext(object):
 
         executor = self._create_executor(interpreter, parent_environ)
         self._execute(executor)
+
+        # find the program here, rather than have every PATH entry searched.
+        # The program is passed as the executable, so that argv[0] is
+        # unchanged
+        if is_non_string_iterable(args) and args and \
+                "executable" not in Popen_args and \
+                self._use_path_listings(args[0]):
+            env = target_environ.copy()
+            env.update(executor.get_output())
+
+            program = self._which(args[0], env)
+            if program:
+                Popen_args["executable"] = program
+
         return interpreter.subprocess(args, **Popen_args)
 
     @_on_success
@@ -1384,6 +1515,13 @@ class ResolvedContext(object):
         """
         sh = create_shell(shell)
 
+        # run the command without a shell, if possible
+        if config.direct_command_execution and not \
+                (stdin or rcfile or detached or pre_command or context_filepath):
+            direct_args = self._get_direct_command_args(sh, command)
+        else:
+            direct_args = None
+
         if is_non_string_iterable(command):
             command = sh.join(command)
 
@@ -1412,6 +1550,30 @@ class ResolvedContext(object):
             rxt_file = os.path.join(tmpdir, "context.rxt")
             self.save(rxt_file)
 
+        if direct_args:
+            # if the context needs a shell after all, the actions that the
+            # callbacks added are reused, so that they are only run once
+            if actions_callback:
+                actions_callback = _ReplayedCallback(actions_callback)
+            if post_actions_callback:
+                post_actions_callback = _ReplayedCallback(post_actions_callback)
+
+            p = self._execute_command_directly(
+                direct_args,
+                sh=sh,
+                parent_environ=parent_environ,
+                rxt_file=rxt_file,
+                actions_callback=actions_callback,
+                post_actions_callback=post_actions_callback,
+                **Popen_args)
+
+            if p is not None:
+                if block:
+                    stdout, stderr = p.communicate()
+                    return p.returncode, stdout, stderr
+                else:
+                    return p
+
         context_file = context_filepath or \
             os.path.join(tmpdir, "context.%s" % sh.file_extension())
 
@@ -1420,23 +1582,42 @@ class ResolvedContext(object):
         executor.env.REZ_RXT_FILE = rxt_file
         executor.env.REZ_CONTEXT_FILE = context_file
 
-        if actions_callback:
-            header_comment(executor, "pre-actions-callback")
-            actions_callback(executor)
+        def _set_shell_init_vars(executor_):
+            executor_.env.REZ_SHELL_INIT_TIMESTAMP = str(int(time.time()))
+            executor_.env.REZ_SHELL_INTERACTIVE = "1" if command is None else "0"
 
-        self._execute(executor)
+        if actions_callback or post_actions_callback or \
+                self._get_bundle_post_commands_filepath():
+            if actions_callback:
+                header_comment(executor, "pre-actions-callback")
+                actions_callback(executor)
+
+            self._execute(executor)
+            _set_shell_init_vars(executor)
 
-        executor.env.REZ_SHELL_INIT_TIMESTAMP = str(int(time.time()))
-        executor.env.REZ_SHELL_INTERACTIVE = "1" if command is None else "0"
+            if post_actions_callback:
+                header_comment(executor, "post-actions-callback")
+                post_actions_callback(executor)
 
-        if post_actions_callback:
-            header_comment(executor, "post-actions-callback")
-            post_actions_callback(executor)
+            self._execute_bundle_post_actions_callback(executor)
+            context_code = executor.get_output()
+        else:
+            # The code that interprets the context does not depend on the
+            # files above, so it is cached (see `_get_context_file_code`).
+            # Each part of the file is written by a separate interpreter.
+            #
+            code = [
+                executor.get_output(),
+                self._get_context_file_code(sh.name(), parent_environ)
+            ]
 
-        self._execute_bundle_post_actions_callback(executor)
+            executor = self._create_executor(create_shell(sh.name()),
+                                             parent_environ, shebang=False)
+            _set_shell_init_vars(executor)
+            code.append(executor.get_output())
+            context_code = ''.join(code)
 
         # write out the native context file
-        context_code = executor.get_output()
         with open(context_file, 'w') as f:
             f.write(context_code)
 
@@ -1460,6 +1641,241 @@ class ResolvedContext(object):
         else:
             return p
 
+    # shell builtins that change the state of the shell, rather than running a
+    # program, even if a program of the same name exists
+    _shell_builtins = frozenset([
+        '.', "alias", "bg", "builtin", "cd", "command", "declare", "dirs",
+        "eval", "exec", "exit", "export", "fg", "hash", "jobs", "let", "local",
+        "logout", "popd", "pushd", "read", "readonly", "rehash", "return",
+        "set", "setenv", "shift", "shopt", "source", "trap", "type", "typeset",
+        "ulimit", "umask", "unalias", "unset", "unsetenv", "wait"
+    ])
+
+    # characters that have special meaning to a shell
+    _shell_chars = frozenset("|&;<>()$`\\\"' \t\n*?[]#~{}!")
+
+    @classmethod
+    def _get_direct_command_args(cls, sh, command):
+        """Get the args of a command, if it can run without a shell.
+
+        Returns:
+            List of str, or None if the command needs to run in a shell.
+        """
+        from rez.shells import UnixShell
+
+        if not command or not isinstance(sh, UnixShell):
+            return None
+
+        if is_non_string_iterable(command):
+            # args containing '$' are not quoted by shell.join, see shlex_join
+            args = list(command)
+            if any('$' in x for x in args):
+                return None
+        else:
+            args = command.split()
+            if any((set(x) & cls._shell_chars) for x in args):
+                return None
+
+        # note that 'FOO=bah cmd' sets a variable
+        if not args or args[0] in cls._shell_builtins or \
+                (set(args[0]) & cls._shell_chars) or '=' in args[0]:
+            return None
+
+        # the shell would source startup scripts (such as $BASH_ENV)
+        d = sh.get_startup_sequence(None, False, False, sh.join(args))
+        if d["command"] is None or d["files"]:
+            return None
+
+        return args
+
+    def _execute_command_directly(self, args, sh, parent_environ, rxt_file,
+                                  actions_callback=None,
+                                  post_actions_callback=None, **Popen_args):
+        """Run a command in the context, without a shell.
+
+        This applies the context to an environ dict in the same way that the
+        shell code written by `execute_shell` would, then runs the command
+        directly.
+
+        Returns:
+            A subprocess.Popen object, or None if the context needs shell
+            features (such as aliases), and so the command could not be run.
+        """
+        if parent_environ is None:
+            parent_environ = os.environ
+
+        changes = self._get_direct_environ(
+            sh, parent_environ, rxt_file,
+            actions_callback=actions_callback,
+            post_actions_callback=post_actions_callback)
+
+        if not changes:
+            return None
+
+        env = parent_environ.copy()
+        env.update(changes["environ"])
+        for key in changes["unsets"]:
+            env.pop(key, None)
+
+        env["REZ_SHELL_INIT_TIMESTAMP"] = str(int(time.time()))
+
+        # find the program as the shell would
+        if os.sep in args[0]:
+            program = args[0]
+        elif os.path.exists(args[0]):
+            return None  # which() would find this, but the shell wouldn't
+        else:
+            program = self._which(args[0], env)
+            if not program:
+                return None
+
+        interp = Python(target_environ=env, passive=True)
+        return interp.subprocess([program] + args[1:], **Popen_args)
+
+    def _get_direct_environ(self, sh, parent_environ, rxt_file,
+                            actions_callback=None, post_actions_callback=None):
+        """Get the environ changes that running a command directly applies.
+
+        Returns:
+            dict: Containing "environ" (the variables set by the context) and
+            "unsets" (the parent variables it removes), or an empty dict if
+            the context needs shell features, such as aliases.
+        """
+        from rez.rex import Alias, Command, Error, Info, Source, Unsetenv
+
+        def _get_direct_environ(parent_environ_, cached_roots):
+            interp = Python(target_environ={}, passive=True)
+            executor = self._create_executor(interp, parent_environ_)
+            executor.env.REZ_RXT_FILE = rxt_file
+
+            if sh.settings.prompt:
+                newprompt = parent_environ_.get("REZ_ENV_PROMPT", '') \
+                    + sh.settings.prompt
+                executor.env.REZ_ENV_PROMPT = literal(newprompt)
+
+            if actions_callback:
+                actions_callback(executor)
+
+            # note that system paths are those of the shell the command would
+            # otherwise have run in
+            self._execute(executor, cached_roots=cached_roots,
+                          shell=sh.name())
+
+            executor.env.REZ_SHELL_INTERACTIVE = "0"
+
+            if post_actions_callback:
+                post_actions_callback(executor)
+
+            self._execute_bundle_post_actions_callback(executor)
+
+            # these actions only have an effect in a shell
+            shell_actions = (Alias, Command, Error, Info, Source)
+            if any(isinstance(x, shell_actions) for x in executor.actions):
+                return {}
+
+            environ = executor.get_output()
+            unsets = [
+                x.key for x in executor.actions
+                if isinstance(x, Unsetenv) and x.key not in environ
+            ]
+
+            return {"environ": environ, "unsets": unsets}
+
+        # callbacks and bundle post-commands are not part of the cache key
+        if actions_callback or post_actions_callback or \
+                self._get_bundle_post_commands_filepath():
+            return _get_direct_environ(parent_environ, None)
+
+        return self._get_env_output(_get_direct_environ, parent_environ,
+                                    output="direct_environ", shell=sh.name(),
+                                    rxt_file=rxt_file)
+
+    def _which(self, cmd, env):
+        """Find a program in the given environ.
+
+        This gives the same result as `which`, but package directories in
+        PATH are looked up in listings of their contents (see
+        `_get_path_listings`), rather than checked for the program one by one.
+        The listings are only used if they can be stored - that is, if the
+        context is frozen, or the context env cache is enabled.
+        """
+        if not self._use_path_listings(cmd):
+            return which(cmd, env=env)
+
+        path = env.get("PATH", os.defpath)
+        listings = self._get_path_listings(path)
+        seen = set()
+
+        for dir_ in path.split(os.pathsep):
+            dir_ = os.path.normcase(dir_)
+            if dir_ in seen:
+                continue
+
+            seen.add(dir_)
+            names = listings.get(dir_)
+            if names is not None and cmd not in names:
+                continue
+
+            filepath = os.path.expandvars(os.path.join(dir_, cmd))
+            if os.access(filepath, os.F_OK | os.X_OK) and \
+                    not os.path.isdir(filepath):
+                return filepath
+
+        return None
+
+    def _use_path_listings(self, cmd):
+        """Get whether `_which` would look up `cmd` in PATH listings."""
+        from rez.utils.context_env_cache import context_env_cache
+
+        return not (
+            platform_.name == "windows"
+            or os.sep in cmd
+            or os.path.exists(cmd)
+            or not (self.frozen_env or context_env_cache.enabled)
+        )
+
+    def _get_path_listings(self, path):
+        """Get the contents of the package directories in a PATH value.
+
+        Package payloads do not change, so their listings are cached along
+        with the context's environment (see `_get_env_output`).
+
+        Returns:
+            dict: Directory -> set of filenames, for each directory in `path`
+            that is within the root of a resolved variant.
+        """
+        listings = self._path_listings.get(path)
+        if listings is not None:
+            return listings
+
+        def _get_path_listings(parent_environ_, cached_roots):
+            roots = []
+            for pkg in (self.resolved_packages or []):
+                root = cached_roots.get(pkg.name) or pkg.root
+                if root:
+                    roots.append(os.path.normcase(root).rstrip(os.sep) + os.sep)
+
+            listings_ = {}
+            for dir_ in path.split(os.pathsep):
+                dir_ = os.path.normcase(dir_)
+                if dir_ in listings_ or \
+                        not any((dir_ + os.sep).startswith(x) for x in roots):
+                    continue
+
+                try:
+                    listings_[dir_] = sorted(os.listdir(dir_))
+                except OSError:
+                    listings_[dir_] = []
+
+            return listings_
+
+        listings = self._get_env_output(_get_path_listings, os.environ,
+                                        output="path_listings", path=path)
+
+        listings = dict((k, set(v)) for k, v in listings.items())
+        self._path_listings[path] = listings
+        return listings
+
     @_on_success
     def get_resolve_as_exact_requests(self):
         """Convert to a package request list of exact resolved package versions.
@@ -1528,6 +1944,7 @@ class ResolvedContext(object):
             if self.graph_string and self.graph_string.startswith('{'):
                 graph_str = self.graph_string  # already in compact format
             else:
+                from rez.utils.graph_utils import write_compacted
                 g = self.graph()
                 graph_str = write_compacted(g)
 
@@ -1559,6 +1976,8 @@ class ResolvedContext(object):
             parent_suite_path=self.parent_suite_path,
             suite_context_name=self.suite_context_name,
 
+            frozen_env=self.frozen_env,
+
             status=self.status_.name,
             failure_description=self.failure_description,
 
@@ -1700,6 +2119,11 @@ class ResolvedContext(object):
             req = Requirement(eph_str)
             r._resolved_ephemerals.append(req)
 
+        # -- SINCE SERIALIZE VERSION 4.8
+
+        r.frozen_env = d.get("frozen_env")
+        r._path_listings = {}
+
         # <END SERIALIZATION>
 
         # track context usage
@@ -1719,25 +2143,32 @@ class ResolvedContext(object):
         In bundles, you can drop a 'post_commands.py' file (rex) alongside the
         'bundle.yaml' file, and it will be sourced after all package commands.
         """
-        if not self.load_path:
+        rex_filepath = self._get_bundle_post_commands_filepath()
+        if not rex_filepath:
             return
 
+        # load the rex code an execute it within the executor
+        with open(rex_filepath) as f:
+            rex_py = f.read()
+
+        header_comment(executor, "bundle post-commands")
+        executor.execute_code(rex_py)
+
+    def _get_bundle_post_commands_filepath(self):
+        if not self.load_path:
+            return None
+
         with self._detect_bundle(self.load_path):
             bundle_dir = self._get_bundle_path()
 
         if not bundle_dir:
-            return
+            return None
 
         rex_filepath = os.path.join(bundle_dir, "post_commands.py")
         if not os.path.exists(rex_filepath):
-            return
-
-        # load the rex code an execute it within the executor
-        with open(rex_filepath) as f:
-            rex_py = f.read()
+            return None
 
-        header_comment(executor, "bundle post-commands")
-        executor.execute_code(rex_py)
+        return rex_filepath
 
     @classmethod
     @contextmanager
@@ -1905,6 +2336,7 @@ class ResolvedContext(object):
         if content.startswith('{'):  # assume json content
             doc = json.loads(content)
         else:
+            from rez.vendor import yaml
             doc = yaml.load(content, Loader=yaml.FullLoader)
 
         context = cls.from_dict(doc, identifier_str)
@@ -1922,13 +2354,181 @@ class ResolvedContext(object):
         self.parent_suite_path = suite_path
         self.suite_context_name = context_name
 
-    def _create_executor(self, interpreter, parent_environ):
+    def _create_executor(self, interpreter, parent_environ, shebang=True):
         parent_vars = True if config.all_parent_variables \
             else config.parent_variables
 
         return RexExecutor(interpreter=interpreter,
                            parent_environ=parent_environ,
-                           parent_variables=parent_vars)
+                           parent_variables=parent_vars,
+                           shebang=shebang)
+
+    def _get_context_file_code(self, shell, parent_environ):
+        """Get the shell code that `execute_shell` writes to the context file,
+        minus the variables that refer to temporary files.
+        """
+        def _get_context_file_code(parent_environ_, cached_roots):
+            executor = self._create_executor(create_shell(shell),
+                                             parent_environ_, shebang=False)
+            self._execute(executor, cached_roots=cached_roots)
+            return executor.get_output()
+
+        return self._get_env_output(_get_context_file_code, parent_environ,
+                                    output="context_file_code", shell=shell)
+
+    def _get_env_output(self, func, parent_environ, **key_data):
+        """Get the output of `func`, from the context env cache if possible.
+
+        Args:
+            func (callable): Function with signature (parent_environ,
+                cached_roots) that interprets this context.
+            parent_environ (dict): Environment to interpret the context within,
+                defaults to os.environ if None.
+            key_data: Extra json-compatible data that the output depends on.
+        """
+        from rez.utils.context_env_cache import context_env_cache, \
+            TrackedEnviron
+
+        cached_roots = self._get_cached_roots()
+
+        # see freeze_env
+        frozen_entries = getattr(self, "_frozen_entries", None)
+        if frozen_entries is not None:
+            environ = TrackedEnviron(parent_environ)
+            output = func(environ, cached_roots)
+            if not environ.all_keys_read:
+                frozen_entries.append({
+                    "key": key_data,
+                    "reads": environ.reads,
+                    "output": output
+                })
+            return output
+
+        if self.frozen_env:
+            output = self._get_frozen_env_output(
+                key_data, os.environ if parent_environ is None else parent_environ,
+                cached_roots)
+            if output is not None:
+                return output
+
+        if not context_env_cache.enabled:
+            return func(parent_environ, cached_roots)
+
+        if parent_environ is None:
+            parent_environ = os.environ
+
+        key = self._get_env_cache_key(cached_roots)
+        key.update(key_data)
+
+        output = context_env_cache.get(key, parent_environ)
+        if output is not None:
+            return output
+
+        environ = TrackedEnviron(parent_environ)
+        output = func(environ, cached_roots)
+        context_env_cache.set(key, environ, output)
+        return output
+
+    def _get_frozen_env_output(self, key_data, parent_environ, cached_roots):
+        if self.frozen_env.get("fingerprint") != \
+                self._get_frozen_env_fingerprint(cached_roots):
+            return None
+
+        key_data = json.loads(json.dumps(key_data))
+
+        for entry in self.frozen_env.get("entries", []):
+            if entry.get("key") != key_data:
+                continue
+
+            reads = entry.get("reads", {})
+            if all(parent_environ.get(k) == v for k, v in reads.items()):
+                break
+        else:
+            return None
+
+        # the payloads the environment refers to must still be present
+        for pkg in (self.resolved_packages or []):
+            root = cached_roots.get(pkg.name) or pkg.root
+            if root and not os.path.isdir(root):
+                return None
+
+        return entry.get("output")
+
+    def _get_frozen_env_fingerprint(self, cached_roots):
+        from hashlib import sha1
+
+        # a frozen context's packages are assumed to be immutable, and the
+        # environment is reused on other hosts
+        key = self._get_env_cache_key(cached_roots, package_stamps=False)
+        del key["host"]
+
+        data = [__version__, key]
+        return sha1(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _get_env_cache_key(self, cached_roots, package_stamps=True):
+        # everything that _execute depends on, other than the parent environ
+        fields = (
+            "resolved_packages", "resolved_ephemerals", "timestamp",
+            "requested_timestamp", "building", "implicit_packages",
+            "package_requests", "package_paths", "append_sys_path",
+            "rez_version", "rez_path", "parent_suite_path",
+            "suite_context_name"
+        )
+
+        settings = (
+            "parent_variables", "all_parent_variables",
+            "rez_1_environment_variables", "disable_rez_1_compatibility",
+            "env_var_separators", "catch_rex_errors", "rez_tools_visibility",
+            "suite_visibility"
+        )
+
+        stamps = []
+        for pkg in (self.resolved_packages or []):
+            if not package_stamps:
+                break
+
+            filepath = getattr(pkg.parent.resource, "filepath", None)
+            try:
+                mtime = os.stat(filepath).st_mtime if filepath else None
+            except OSError:
+                mtime = None
+            stamps.append([filepath, mtime])
+
+        if SuiteVisibility[config.suite_visibility] == SuiteVisibility.never:
+            suite_paths = []
+        else:
+            from rez.suite import Suite
+            suite_paths = Suite.visible_suite_paths()
+
+        return {
+            "context": self.to_dict(fields=fields),
+            "cached_roots": cached_roots,
+            "package_stamps": stamps,
+            "settings": dict((k, getattr(config, k)) for k in settings),
+            "suite_paths": suite_paths,
+            "host": socket.gethostname(),
+            "user": system.user,
+            "rez_bin_path": system.rez_bin_path
+        }
+
+    def _get_cached_roots(self):
+        # get the package cache location of each resolved variant, if any
+        cached_roots = {}
+
+        if self.package_caching and \
+                config.cache_packages_path and \
+                config.read_package_cache:
+            pkgcache = self._get_package_cache()
+        else:
+            pkgcache = None
+
+        if pkgcache:
+            for pkg in (self.resolved_packages or []):
+                cached_root = pkgcache.get_cached_root(pkg)
+                if cached_root:
+                    cached_roots[pkg.name] = cached_root
+
+        return cached_roots
 
     def _get_pre_resolve_bindings(self):
         if self.pre_resolve_bindings is None:
@@ -1943,7 +2543,7 @@ class ResolvedContext(object):
         return self.pre_resolve_bindings
 
     @pool_memcached_connections
-    def _execute(self, executor):
+    def _execute(self, executor, cached_roots=None, shell=None):
         # bind various info to the execution context
         resolved_pkgs = self.resolved_packages or []
         ephemerals = self.resolved_ephemerals or []
@@ -1988,19 +2588,11 @@ class ResolvedContext(object):
         #
         variant_bindings = {}
 
-        if self.package_caching and \
-                config.cache_packages_path and \
-                config.read_package_cache:
-            pkgcache = self._get_package_cache()
-        else:
-            pkgcache = None
+        if cached_roots is None:
+            cached_roots = self._get_cached_roots()
 
         for pkg in resolved_pkgs:
-            if pkgcache:
-                cached_root = pkgcache.get_cached_root(pkg)
-            else:
-                cached_root = None
-
+            cached_root = cached_roots.get(pkg.name)
             variant_binding = VariantBinding(pkg, cached_root=cached_root)
             variant_bindings[pkg.name] = variant_binding
 
@@ -2106,7 +2698,7 @@ class ResolvedContext(object):
 
         # append system paths
         if self.append_sys_path:
-            executor.append_system_paths()
+            executor.append_system_paths(shell)
 
         # add rez path so that rez commandline tools are still available within
         # the resolved environment
@@ -9,6 +9,7 @@ from rez.vendor.enum import Enum
 from rez.vendor.version.requirement import Requirement
 from contextlib import contextmanager
 from hashlib import sha1
+import time
 
 
 class ResolverStatus(Enum):
@@ -34,7 +35,7 @@ class Resolver(object):
     def __init__(self, context, package_requests, package_paths, package_filter=None,
                  package_orderers=None, timestamp=0, callback=None, building=False,
                  verbosity=False, buf=None, package_load_callback=None, caching=True,
-                 suppress_passive=False, print_stats=False):
+                 suppress_passive=False, print_stats=False, tracer=None):
         """Create a Resolver.
 
         Args:
@@ -51,6 +52,8 @@ class Resolver(object):
             caching: If True, cache(s) may be used to speed the resolve. If
                 False, caches will not be used.
             print_stats (bool): If true, print advanced solver stats at the end.
+            tracer (`Tracer`): If provided, resolve events are recorded to
+                this tracer. See `Solver`.
         """
         self.context = context
         self.package_requests = package_requests
@@ -65,6 +68,7 @@ class Resolver(object):
         self.buf = buf
         self.suppress_passive = suppress_passive
         self.print_stats = print_stats
+        self.tracer = tracer
 
         # store hash of package orderers. This is used in the memcached key
         if package_orderers:
@@ -108,9 +112,14 @@ class Resolver(object):
     def solve(self):
         """Perform the solve.
         """
+        t = time.time()
         with log_duration(self._print, "memcache get (resolve) took %s"):
             solver_dict = self._get_cached_solve()
 
+        if self.tracer:
+            self.tracer.add_span("memcache_get", "resolver", t, time.time() - t,
+                                 hit=bool(solver_dict))
+
         if solver_dict:
             self.from_cache = True
             self._set_result(solver_dict)
@@ -400,7 +409,8 @@ class Resolver(object):
                         prune_unfailed=config.prune_failed_graph,
                         buf=self.buf,
                         suppress_passive=self.suppress_passive,
-                        print_stats=self.print_stats)
+                        print_stats=self.print_stats,
+                        tracer=self.tracer)
         solver.solve()
 
         return solver
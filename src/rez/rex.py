@@ -14,7 +14,8 @@ from rez.exceptions import RexError, RexUndefinedVariableError, \
 from rez.util import shlex_join, is_non_string_iterable
 from rez.utils import reraise
 from rez.utils.execution import Popen
-from rez.utils.sourcecode import SourceCode, SourceCodeError
+from rez.utils.sourcecode import SourceCode, SourceCodeError, \
+    compiled_code_cache
 from rez.utils.data_utils import AttrDictWrapper
 from rez.utils.formatting import expandvars
 from rez.utils.platform_ import platform_
@@ -205,6 +206,12 @@ class ActionManager(object):
         self.formatter = formatter or str
         self.actions = []
 
+        # Changes to path-like variables that have not yet been passed to the
+        # interpreter, as {expanded-key: [key, values, refs]}, where refs is the
+        # text of the values that may refer to other variables. See `_pendenv`.
+        self._pending = {}
+        self._pending_keys = []
+
         self._env_sep_map = env_sep_map if env_sep_map is not None \
             else config.env_var_separators
 
@@ -272,8 +279,61 @@ class ActionManager(object):
         return unexpanded_value, expanded_value
 
     def get_output(self, style=OutputStyle.file):
+        self.flush()
         return self.interpreter.get_output(style=style)
 
+    def flush(self, keys=None):
+        """Pass pending changes of variables to the interpreter.
+
+        Consecutive appends and prepends to a variable are batched into a
+        single setenv, for interpreters that would otherwise set the variable
+        on every change. This must be done before the interpreter can refer to
+        the variables, for eg before a command is run, or before another
+        variable is set to a value that references them.
+
+        Args:
+            keys (list of str): Variables to flush, all if None.
+        """
+        if not self._pending:
+            return
+
+        for expanded_key in list(self._pending_keys):
+            if keys is not None and expanded_key not in keys:
+                continue
+
+            key, values, _ = self._pending.pop(expanded_key)
+            self._pending_keys.remove(expanded_key)
+
+            value = EscapedString.join(self._env_sep(expanded_key), values)
+            self.interpreter.setenv(key, value)
+
+    def _flush_referenced(self, expanded_key, value):
+        # Flush pending variables that would be affected by changing
+        # `expanded_key` to `value`. These are variables that `value` may refer
+        # to, and variables whose pending values may refer to `expanded_key`.
+        # Note that this errs on the side of flushing.
+        if not self._pending:
+            return
+
+        value = str(value)
+        keys = [
+            k for k in self._pending_keys
+            if (k in value)
+            or (k != expanded_key and expanded_key in self._pending[k][2])
+        ]
+
+        if keys:
+            self.flush(keys)
+
+    def _implements(self, name):
+        # True if the interpreter implements the given optional method
+        for cls in type(self.interpreter).__mro__:
+            if cls is ActionInterpreter:
+                return False
+            if name in vars(cls):
+                return True
+        return False
+
     # -- Commands
 
     def undefined(self, key):
@@ -304,6 +364,9 @@ class ActionManager(object):
         unexpanded_key, expanded_key = self._key(key)
         unexpanded_value, expanded_value = self._value(value)
 
+        self.flush([expanded_key])
+        self._flush_referenced(expanded_key, unexpanded_value)
+
         # TODO: check if value has already been set by another package
         self.actions.append(Setenv(unexpanded_key, unexpanded_value))
         self.environ[expanded_key] = str(expanded_value)
@@ -316,6 +379,8 @@ class ActionManager(object):
 
     def unsetenv(self, key):
         unexpanded_key, expanded_key = self._key(key)
+        self.flush([expanded_key])
+        self._flush_referenced(expanded_key, '')
         self.actions.append(Unsetenv(unexpanded_key))
 
         if expanded_key in self.environ:
@@ -330,6 +395,9 @@ class ActionManager(object):
         unexpanded_key, expanded_key = self._key(key)
         unexpanded_value, expanded_value = self._value(value)
 
+        self.flush([expanded_key])
+        self._flush_referenced(expanded_key, unexpanded_value)
+
         action = Resetenv(unexpanded_key, unexpanded_value, friends)
         self.actions.append(action)
         self.environ[expanded_key] = str(expanded_value)
@@ -344,6 +412,8 @@ class ActionManager(object):
         unexpanded_key, expanded_key = self._key(key)
         unexpanded_value, expanded_value = self._value(value)
 
+        self._flush_referenced(expanded_key, unexpanded_value)
+
         # expose env-vars from parent env if explicitly told to do so
         if (expanded_key not in self.environ) and \
                 ((self.parent_variables is True) or (expanded_key in self.parent_variables)):
@@ -354,45 +424,59 @@ class ActionManager(object):
                 key_ = unexpanded_key
             self.interpreter._saferefenv(key_)
 
+        if self.interpreter.expand_env_vars:
+            key_, value_ = expanded_key, expanded_value
+        else:
+            key_, value_ = unexpanded_key, unexpanded_value
+
         # *pend or setenv depending on whether this is first reference to the var
         if expanded_key in self.environ:
-            env_sep = self._env_sep(expanded_key)
             self.actions.append(action(unexpanded_key, unexpanded_value))
 
-            values = addfunc(unexpanded_value, [self._keytoken(expanded_key)])
-            unexpanded_values = EscapedString.join(env_sep, values)
-
-            parts = self.environ[expanded_key].split(env_sep)
-            values = addfunc(expanded_value, parts)
-            expanded_values = EscapedString.join(env_sep, values)
-
+            env_sep = self._env_sep(expanded_key)
+            prev_value = self.environ[expanded_key]
+            parts = prev_value.split(env_sep)
             self.environ[expanded_key] = \
                 env_sep.join(addfunc(str(expanded_value), parts))
+
+            if self._implements(interpfunc.__name__):
+                self.flush([expanded_key])
+                try:
+                    interpfunc(key_, value_)
+                    return
+                except NotImplementedError:
+                    pass
+
+            # the interpreter sets the entire value, so batch consecutive
+            # changes into a single setenv (see `flush`)
+            pending = self._pending.get(expanded_key)
+            if pending is None:
+                if self.interpreter.expand_env_vars:
+                    base = prev_value
+                else:
+                    base = self._keytoken(expanded_key)
+
+                pending = [key_, [base], '']
+                self._pending[expanded_key] = pending
+                self._pending_keys.append(expanded_key)
+
+            pending[1] = addfunc(value_, pending[1])
         else:
             self.actions.append(Setenv(unexpanded_key, unexpanded_value))
             self.environ[expanded_key] = str(expanded_value)
-            unexpanded_values = unexpanded_value
-            expanded_values = expanded_value
-            interpfunc = None
 
-        applied = False
-        if interpfunc:
-            if self.interpreter.expand_env_vars:
-                key, value = expanded_key, expanded_value
-            else:
-                key, value = unexpanded_key, unexpanded_value
-            try:
-                interpfunc(key, value)
-                applied = True
-            except NotImplementedError:
-                pass
+            # interpreters that apply each change themselves (such as
+            # `Python`, which updates sys.path) are given changes in order
+            if self._implements(interpfunc.__name__):
+                self.interpreter.setenv(key_, value_)
+                return
 
-        if not applied:
-            if self.interpreter.expand_env_vars:
-                key, value = expanded_key, expanded_values
-            else:
-                key, value = unexpanded_key, unexpanded_values
-            self.interpreter.setenv(key, value)
+            pending = [key_, [value_], '']
+            self._pending[expanded_key] = pending
+            self._pending_keys.append(expanded_key)
+
+        if not self.interpreter.expand_env_vars:
+            pending[2] += str(value_)
 
     def prependenv(self, key, value):
         self._pendenv(key, value, Prependenv, self.interpreter.prependenv,
@@ -405,16 +489,19 @@ class ActionManager(object):
     def alias(self, key, value):
         key = str(self._format(key))
         value = str(self._format(value))
+        self.flush()
         self.actions.append(Alias(key, value))
         self.interpreter.alias(key, value)
 
     def info(self, value=''):
         value = self._format(value)
+        self.flush()
         self.actions.append(Info(value))
         self.interpreter.info(value)
 
     def error(self, value):
         value = self._format(value)
+        self.flush()
         self.actions.append(Error(value))
         self.interpreter.error(value)
 
@@ -424,6 +511,7 @@ class ActionManager(object):
 
     def command(self, value):
         # Note: Value is deliberately not formatted in commands
+        self.flush()
         self.actions.append(Command(value))
         self.interpreter.command(value)
 
@@ -434,6 +522,7 @@ class ActionManager(object):
 
     def source(self, value):
         value = str(self._format(value))
+        self.flush()
         self.actions.append(Source(value))
         self.interpreter.source(value)
 
@@ -1059,11 +1148,14 @@ class EnvironmentDict(DictMixin):
                 be appended/prepended to as usual.
         """
         self.manager = manager
-        self._var_cache = dict((k, EnvironmentVariable(k, self))
-                               for k in manager.parent_environ.keys())
+        self._var_cache = {}
 
     def keys(self):
-        return self._var_cache.keys()
+        # variables of the parent environ are only created when accessed, so
+        # that the parent environ is not read unless needed
+        keys = dict.fromkeys(self.manager.parent_environ.keys())
+        keys.update(self._var_cache)
+        return list(keys.keys())
 
     def __repr__(self):
         return '%s(%s)' % (self.__class__.__name__, str(self._var_cache))
@@ -1077,17 +1169,17 @@ class EnvironmentDict(DictMixin):
         self[key].set(value)
 
     def __contains__(self, key):
-        return (key in self._var_cache)
+        return (key in self._var_cache or key in self.manager.parent_environ)
 
     def __delitem__(self, key):
         del self._var_cache[key]
 
     def __iter__(self):
-        for key in self._var_cache.keys():
+        for key in self.keys():
             yield key
 
     def __len__(self):
-        return len(self._var_cache)
+        return len(self.keys())
 
 
 class EnvironmentVariable(object):
@@ -1274,11 +1366,18 @@ class RexExecutor(object):
             self.globals.clear()
             self.globals.update(saved_globals)
 
-    def append_system_paths(self):
-        """Append system paths to $PATH."""
+    def append_system_paths(self, shell=None):
+        """Append system paths to $PATH.
+
+        Args:
+            shell (str): Shell type to get the system paths of. Defaults to
+                the interpreter if it is a shell, or the current shell if not.
+        """
         from rez.shells import Shell, create_shell
-        sh = self.interpreter if isinstance(self.interpreter, Shell) \
-            else create_shell()
+        if shell is None and isinstance(self.interpreter, Shell):
+            sh = self.interpreter
+        else:
+            sh = create_shell(shell)
 
         paths = sh.get_syspaths()
         paths_str = os.pathsep.join(paths)
@@ -1319,7 +1418,8 @@ class RexExecutor(object):
             if isinstance(code, SourceCode):
                 pyc = code.compiled
             else:
-                pyc = compile(code, filename, 'exec')
+                pyc = compiled_code_cache.compile(
+                    code, filename, flags=print_function.compiler_flag)
         except SourceCodeError as e:
             reraise(e, RexError)
         except:
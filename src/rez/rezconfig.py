@@ -150,6 +150,62 @@ cache_package_files = True
 # changes).
 cache_listdir = True
 
+# The path where rez caches compiled package commands (python bytecode), so
+# that environments are not recompiled every time a shell is started from the
+# same context. If this is None, compiled code is only cached in-process.
+compiled_code_cache_path = None
+
+# The path where rez caches facts about the current host that are costly to
+# determine, such as the operating system name and the standard system paths of
+# shells. Each fact is refreshed when the files it is derived from (such as
+# /etc/os-release) change. If this is None, host facts are determined once per
+# process.
+host_facts_cache_path = None
+
+# The path where rez caches the merged data of the config files, and the
+# validated value of each setting, so that config files are not re-executed by
+# every rez process. Entries are refreshed when any config file changes, and are
+# specific to the $REZ_<SETTING> environment variables set. Config files that
+# compute settings from other sources (such as environment variables that are
+# not rez settings) should not be used with this cache. Note that this setting
+# can only be set with the $REZ_CONFIG_CACHE_PATH environment variable, since it
+# is needed before any config file is loaded.
+config_cache_path = None
+
+# The path where rez caches the results of plugin discovery (the name and path
+# of each plugin, and plugin configuration), so that plugins are only imported
+# when first used, rather than on every process start. Entries are refreshed
+# when plugin paths change. If this is None, plugins are discovered in every
+# process.
+plugin_cache_path = None
+
+# The path where rez caches the environment generated by a context (the output
+# of get_shell_code and get_environ, and the code sourced by shells that rez
+# spawns), so that sourcing the same context again (for example via suite
+# wrappers, rez-env --input or rez-context --interpret) does not re-run every
+# package's commands. Entries are specific to the
+# context, the shell, the package cache state, and the value of each parent
+# environment variable that the package commands read with getenv(), defined()
+# or $VAR expansion. Package commands that read other external state (such as
+# os.environ or files directly) should not be used with this cache. If this is
+# None, the environment is generated on every activation.
+context_env_cache_path = None
+
+# The path where rez stores reverse dependency indexes of package repositories
+# (the requirements of the latest package in each family), used by rez-depends
+# and to find package plugins. Families that have had a package released or
+# removed since the index was written are reloaded when the index is next used.
+# If this is None, every package family is loaded instead.
+depends_index_path = None
+
+# The path where rez stores indexes of the package families and versions in
+# each package repository, used for shell completion (see rez-complete). When a
+# family is added to or removed from a repository, the index is refreshed in a
+# background process; versions are reloaded when their family has changed. A
+# per-user path such as "~/.rez/completion_index" is recommended. If this is
+# None, repositories are searched on every completion.
+completion_index_path = None
+
 # The size of the local (in-process) resource cache. Resources include package
 # families, packages and variants. A value of 0 disables caching; -1 sets a cache
 # of unlimited size. The size refers to the number of entries, not byte count.
@@ -540,6 +596,16 @@ rez_tools_visibility = "append"
 # scripts (such as .bashrc). If False, package commands are sourced after.
 package_commands_sourced_first = True
 
+# If True, commands run non-interactively in a resolved environment (such as
+# "rez-env foo -- bar") are run directly, rather than via a subshell, if they do
+# not need any shell features. This is the case when the command is a plain
+# program invocation (no pipes, redirections, variable references etc), the
+# context defines no aliases and sources no scripts, and the shell would not
+# source any startup scripts. This avoids spawning a shell and writing its
+# startup files for every command. Note that $REZ_CONTEXT_FILE is not set in
+# this case, since no context shell script is written.
+direct_command_execution = True
+
 # Defines paths to initially set $PATH to, if a resolve appends/prepends $PATH.
 # If this is an empty list, then this initial value is determined automatically
 # depending on the shell (for example, *nix shells create a temp clean shell and
@@ -666,6 +732,13 @@ context_tracking_context_fields = [
 # See [context_tracking_host](#context_tracking_host)
 context_tracking_extra_fields = {}
 
+# The path where AMQP messages (from context tracking and the amqp release hook)
+# that could not be sent before a process exits are stored. They are sent by the
+# next process that connects to the same broker. If this is None, a process
+# waits up to 5 seconds on exit for pending messages to be sent, and then drops
+# any that remain.
+amqp_spool_path = None
+
 
 ###############################################################################
 # Debugging
@@ -876,6 +949,12 @@ create_executable_script_mode = "single"
 # https://pip.pypa.io/en/stable/reference/pip_install/#options
 pip_extra_args = []
 
+# The path of a cache directory that rez-pip passes to pip (as --cache-dir), so
+# that downloaded and built wheels are reused by later rez-pip installs. This
+# may be shared by several users. If this is None, pip uses its own default
+# cache. It is not used if pip_extra_args contain --cache-dir or --no-cache-dir.
+pip_wheel_cache_path = None
+
 # Substitutions for re.sub when unknown parent paths are encountered in the
 # pip package distribution record: *.dist-info/RECORD
 #
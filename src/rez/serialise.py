@@ -23,7 +23,6 @@ from rez.vendor.atomicwrites import atomic_write
 from rez.vendor.enum import Enum
 from rez.vendor.six.six.moves import StringIO
 from rez.vendor.six.six import PY3
-from rez.vendor import yaml
 
 
 tmpdir_manager = TempDirs(config.tmpdir, prefix="rez_write_")
@@ -31,6 +30,15 @@ debug_print = config.debug_printer("file_loads")
 file_cache = {}
 
 
+class _FileLoadStats(threading.local):
+    def __init__(self):
+        # number of files actually read (ie, not retrieved from memcache)
+        self.num_file_reads = 0
+
+
+file_load_stats = _FileLoadStats()
+
+
 class FileFormat(Enum):
     py = ("py",)
     yaml = ("yaml",)
@@ -162,6 +170,7 @@ def _load_from_file(filepath, format_, update_data_callback):
 
 def _load_file(filepath, format_, update_data_callback, original_filepath=None):
     load_func = load_functions[format_]
+    file_load_stats.num_file_reads += 1
 
     if debug_print:
         if original_filepath:
@@ -410,6 +419,8 @@ def load_yaml(stream, **kwargs):
     # of context.
     # Get the best of both worlds, by passing it a string, then replacing
     # "<string>" with the filename if there's an error...
+    from rez.vendor import yaml
+
     content = stream.read()
     try:
         return yaml.load(content, Loader=yaml.FullLoader) or {}
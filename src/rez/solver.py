@@ -14,9 +14,6 @@ from rez.packages import iter_packages
 from rez.package_repository import package_repo_stats
 from rez.utils.logging_ import print_debug
 from rez.utils.data_utils import cached_property
-from rez.vendor.pygraph.classes.digraph import digraph
-from rez.vendor.pygraph.algorithms.cycles import find_cycle
-from rez.vendor.pygraph.algorithms.accessibility import accessibility
 from rez.exceptions import PackageNotFoundError, ResolveError, \
     PackageFamilyNotFoundError, RezSystemError
 from rez.vendor.version.version import VersionRange
@@ -633,7 +630,8 @@ class _PackageVariantSlice(_Common):
 
         self.solver.intersection_tests_count += 1
 
-        with self.solver.timed(self.solver.intersection_time):
+        with self.solver.timed(self.solver.intersection_time, "intersect", "scope",
+                               family=self.package_name, range=range_):
             # this is faster than iter_intersecting :(
             entries = [x for x in self.entries if x.version in range_]
 
@@ -667,7 +665,8 @@ class _PackageVariantSlice(_Common):
                 (package_request.name not in self.fam_requires):
             return (self, [])
 
-        with self.solver.timed(self.solver.reduction_time):
+        with self.solver.timed(self.solver.reduction_time, "reduce", "scope",
+                               family=self.package_name, request=package_request):
             return self._reduce_by(package_request)
 
     def _reduce_by(self, package_request):
@@ -761,6 +760,10 @@ class _PackageVariantSlice(_Common):
             first is the preferred slice.
         """
 
+        if self.solver.tracer:
+            self.solver.tracer.instant("split", "scope", family=self.package_name,
+                                       slice=self)
+
         # We sort here in the split in order to sort as late as possible.
         # Because splits usually happen after intersections/reductions, this
         # means there can be less entries to sort.
@@ -835,10 +838,20 @@ class _PackageVariantSlice(_Common):
         if self.sorted:
             return
 
+        with self.solver.timed(self.solver.order_time, "sort_versions", "scope",
+                               family=self.package_name):
+            self._sort_versions()
+
+    def _sort_versions(self):
+        packages = [x.package for x in self.entries]
+
         for orderer in (self.solver.package_orderers or []):
-            entries = orderer.reorder(self.entries, key=lambda x: x.package)
-            if entries is not None:
-                self.entries = entries
+            # sort keys are cached, so each set of packages is only ordered
+            # once per orderer, rather than once per slice
+            sort_keys = orderer.get_sort_keys(packages)
+
+            if sort_keys is not None:
+                self.entries = sorted(self.entries, key=lambda x: sort_keys[x.version])
                 self.sorted = True
 
                 if self.pr:
@@ -938,7 +951,9 @@ class PackageVariantCache(object):
         variant_list = self.variant_lists.get(package_name)
 
         if variant_list is None:
-            variant_list = _PackageVariantList(package_name, self.solver)
+            with self.solver.timed(self.solver.family_load_time, "load_family",
+                                   "package", family=package_name):
+                variant_list = _PackageVariantList(package_name, self.solver)
             self.variant_lists[package_name] = variant_list
 
         entries = variant_list.get_intersection(range_)
@@ -1192,6 +1207,8 @@ class _PackageScope(_Common):
 def _get_dependency_order(g, node_list):
     """Return list of nodes as close as possible to the ordering in node_list,
     but with child nodes earlier in the list than parents."""
+    from rez.vendor.pygraph.algorithms.accessibility import accessibility
+
     access_ = accessibility(g)
     deps = dict((k, set(v) - set([k])) for k, v in access_.items())
     nodes = node_list + sorted(set(g.nodes()) - set(node_list))
@@ -1282,7 +1299,7 @@ class _ResolvePhase(_Common):
                 extracted_requests = []
 
                 # perform all possible extractions
-                with self.solver.timed(self.solver.extraction_time):
+                with self.solver.timed(self.solver.extraction_time, "extract", "phase"):
                     for i in range(len(scopes)):
                         while True:
                             scope_, extracted_request = scopes[i].extract()
@@ -1293,6 +1310,12 @@ class _ResolvePhase(_Common):
                                 extractions[k] = extracted_request
                                 self.solver.extractions_count += 1
                                 scopes[i] = scope_
+
+                                if self.solver.tracer:
+                                    self.solver.tracer.instant(
+                                        "extract", "scope",
+                                        family=scopes[i].package_name,
+                                        request=extracted_request)
                             else:
                                 break
 
@@ -1315,7 +1338,8 @@ class _ResolvePhase(_Common):
                 self.pr.subheader("INTERSECTING:")
                 req_fams = []
 
-                with self.solver.timed(self.solver.intersection_test_time):
+                with self.solver.timed(self.solver.intersection_test_time,
+                                       "intersect", "phase"):
                     for i, scope in enumerate(scopes):
                         extracted_req = extracted_requests.get(scope.package_name)
 
@@ -1442,7 +1466,8 @@ class _ResolvePhase(_Common):
             # iteratively reduce until there are no more pending reductions.
             # Note that if a scope is reduced, then other scopes need to reduce
             # against it once again.
-            with self.solver.timed(self.solver.reduction_test_time):
+            with self.solver.timed(self.solver.reduction_test_time,
+                                   "reduce", "phase"):
                 while pending_reducts:
                     x, y = pending_reducts.pop()
 
@@ -1474,6 +1499,8 @@ class _ResolvePhase(_Common):
             correctly ordered; or, if cyclic dependencies were detected, a new
             phase marked as cyclic.
         """
+        from rez.vendor.pygraph.algorithms.cycles import find_cycle
+
         assert(self._is_solved())
         g = self._get_minimal_graph()
         scopes = dict((x.package_name, x) for x in self.scopes
@@ -1575,6 +1602,9 @@ class _ResolvePhase(_Common):
         Returns:
             A pygraph.digraph object.
         """
+        from rez.vendor.pygraph.classes.digraph import digraph
+        from rez.vendor.pygraph.algorithms.accessibility import accessibility
+
         g = digraph()
         scopes = dict((x.package_name, x) for x in self.scopes)
         failure_nodes = set()
@@ -1832,6 +1862,7 @@ class _ResolvePhase(_Common):
                     if not req.conflict:
                         edges.add((scope.package_name, req.name))
 
+        from rez.vendor.pygraph.classes.digraph import digraph
         g = digraph()
         g.add_nodes(nodes)
         for e in edges:
@@ -1880,7 +1911,7 @@ class Solver(_Common):
                  package_filter=None, package_orderers=None, callback=None,
                  building=False, optimised=True, verbosity=0, buf=None,
                  package_load_callback=None, prune_unfailed=True,
-                 suppress_passive=False, print_stats=False):
+                 suppress_passive=False, print_stats=False, tracer=None):
         """Create a Solver.
 
         Args:
@@ -1913,6 +1944,9 @@ class Solver(_Common):
                 has had no effect on the solve. This argument only has an
                 effect if `verbosity` > 2.
             print_stats (bool): If true, print advanced solver stats at the end.
+            tracer (`Tracer`): If provided, solver events (extractions,
+                intersections, reductions, splits, failures and package loads)
+                are recorded to this tracer.
         """
         self.package_paths = package_paths
         self.package_filter = package_filter
@@ -1923,6 +1957,7 @@ class Solver(_Common):
         self.building = building
         self.request_list = None
         self.context = context
+        self.tracer = tracer
 
         self.pr = _Printer(verbosity, buf=buf, suppress_passive=suppress_passive)
         self.print_stats = print_stats
@@ -1957,6 +1992,9 @@ class Solver(_Common):
         self.intersection_test_time = [0.0]
         self.reduction_time = [0.0]
         self.reduction_test_time = [0.0]
+        self.split_time = [0.0]
+        self.family_load_time = [0.0]
+        self.order_time = [0.0]
 
         self._init()
 
@@ -1987,12 +2025,15 @@ class Solver(_Common):
         self._push_phase(phase)
 
     @contextmanager
-    def timed(self, target):
+    def timed(self, target, event=None, category="solver", **event_args):
         t = time.time()
         yield
         secs = time.time() - t
         target[0] += secs
 
+        if event and self.tracer:
+            self.tracer.add_span(event, category, t, secs, **event_args)
+
     @property
     def status(self):
         """Return the current status of the solve.
@@ -2088,15 +2129,29 @@ class Solver(_Common):
         t1 = time.time()
         pt1 = package_repo_stats.package_load_time
 
+        if self.tracer:
+            package_repo_stats.load_listeners.append(self.tracer.package_loaded)
+
         # iteratively solve phases
-        while self.status == SolverStatus.unsolved:
-            self.solve_step()
-            if self.status == SolverStatus.unsolved and not self._do_callback():
-                break
+        try:
+            while self.status == SolverStatus.unsolved:
+                self.solve_step()
+                if self.status == SolverStatus.unsolved and not self._do_callback():
+                    break
+        finally:
+            if self.tracer:
+                package_repo_stats.load_listeners.remove(self.tracer.package_loaded)
 
         self.load_time = package_repo_stats.package_load_time - pt1
         self.solve_time = time.time() - t1
 
+        if self.tracer:
+            self.tracer.add_span("solve", "solver", t1, self.solve_time,
+                                 request=self.request_list,
+                                 status=self.status.name,
+                                 num_solves=self.num_solves,
+                                 num_fails=self.num_fails)
+
         # print stats
         if self.pr.verbosity > 2:
             from pprint import pformat
@@ -2135,7 +2190,10 @@ class Solver(_Common):
             "num_solves": self.num_solves,
             "num_fails": self.num_fails,
             "solve_time": self.solve_time,
-            "load_time": self.load_time
+            "load_time": self.load_time,
+            "family_load_time": self.family_load_time[0],
+            "split_time": self.split_time[0],
+            "order_time": self.order_time[0]
         }
 
         return {
@@ -2156,6 +2214,7 @@ class Solver(_Common):
             self.pr.header("SOLVE #%d (%d fails so far)...",
                            self.solve_count + 1, self.num_fails)
 
+        t = time.time()
         phase = self._pop_phase()
 
         if phase.status == SolverStatus.failed:  # a previously failed phase
@@ -2165,7 +2224,8 @@ class Solver(_Common):
 
         if phase.status == SolverStatus.exhausted:
             self.pr.subheader("SPLITTING:")
-            phase, next_phase = phase.split()
+            with self.timed(self.split_time, "split", "phase"):
+                phase, next_phase = phase.split()
             self._push_phase(next_phase)
             if self.pr:
                 self.pr("new phase: %s", phase)
@@ -2196,6 +2256,18 @@ class Solver(_Common):
             assert(new_phase.status == SolverStatus.exhausted)
             self._push_phase(new_phase)
 
+        if self.tracer:
+            status = self.phase_stack[-1].status
+            self.tracer.add_span("solve_step", "solver", t, time.time() - t,
+                                 step=self.solve_count,
+                                 depth=self._depth_label(),
+                                 status=status.name)
+
+            if status in (SolverStatus.failed, SolverStatus.cyclic):
+                self.tracer.instant("fail", "solver",
+                                    step=self.solve_count,
+                                    reason=self.phase_stack[-1].failure_reason)
+
     def failure_reason(self, failure_index=None):
         """Get the reason for a failure.
 
@@ -2314,6 +2386,9 @@ class Solver(_Common):
         self.intersection_test_time = [0.0]
         self.reduction_time = [0.0]
         self.reduction_test_time = [0.0]
+        self.split_time = [0.0]
+        self.family_load_time = [0.0]
+        self.order_time = [0.0]
 
     def _latest_nonfailed_phase(self):
         if self.status == SolverStatus.failed:
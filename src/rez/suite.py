@@ -8,7 +8,6 @@ from rez.utils.formatting import columnise, PackageRequest
 from rez.utils.colorize import warning, critical, Printer, alias as alias_col
 from rez.vendor import yaml
 from rez.vendor.yaml.error import YAMLError
-from rez.utils.yaml import dump_yaml
 from rez.vendor.six import six
 from collections import defaultdict
 import os
@@ -50,6 +49,7 @@ class Suite(object):
         self.tools = None
         self.tool_conflicts = None
         self.hidden_tools = None
+        self.tools_index_valid = False
 
     @property
     def context_names(self):
@@ -412,6 +412,8 @@ class Suite(object):
         s.load_path = None
         s.tools = None
         s.tool_conflicts = None
+        s.hidden_tools = None
+        s.tools_index_valid = False
         s.contexts = d["contexts"]
         if s.contexts:
             s.next_priority = max(x["priority"]
@@ -423,6 +425,10 @@ class Suite(object):
     def save(self, path, verbose=False):
         """Save the suite to disk.
 
+        Besides the suite's contexts and tool wrappers, this writes an index
+        of the suite's tools, so that loaded suites can list their tools
+        without loading every context.
+
         Args:
             path (str): Path to save the suite to. If a suite is already saved
                 at `path`, then it will be overwritten. Otherwise, if `path`
@@ -443,6 +449,8 @@ class Suite(object):
         os.makedirs(contexts_path)
 
         # write suite data
+        from rez.utils.yaml import dump_yaml
+
         data = self.to_dict()
         filepath = os.path.join(path, "suite.yaml")
         with open(filepath, "w") as f:
@@ -483,6 +491,8 @@ class Suite(object):
                                      tool_name=tool_name,
                                      prefix_char=prefix_char)
 
+        self._save_tools_index(path)
+
     @classmethod
     def load(cls, path):
         if not os.path.exists(path):
@@ -499,6 +509,7 @@ class Suite(object):
 
         s = cls.from_dict(data)
         s.load_path = os.path.realpath(path)
+        s.tools_index_valid = True
         return s
 
     @classmethod
@@ -690,6 +701,124 @@ class Suite(object):
         self.tools = None
         self.tool_conflicts = None
         self.hidden_tools = None
+        self.tools_index_valid = False
+
+    @classmethod
+    def _tools_index_stamps(cls, path, package_filepaths):
+        # the index is stale if the suite, its contexts, or the definitions of
+        # the packages providing tools have changed since it was written
+        filepaths = [os.path.join(path, "suite.yaml")]
+        contexts_path = os.path.join(path, "contexts")
+        filepaths.extend(os.path.join(contexts_path, x)
+                         for x in sorted(os.listdir(contexts_path)))
+        filepaths.extend(package_filepaths)
+
+        stamps = []
+        for filepath in filepaths:
+            try:
+                st = os.stat(filepath)
+                stamps.append([filepath, st.st_mtime, st.st_size])
+            except OSError:
+                stamps.append([filepath, None, None])
+        return stamps
+
+    def _save_tools_index(self, path):
+        """Write the tools of the suite to disk, so that they can be read
+        without loading every context of the suite.
+        """
+        from rez.utils import json
+        from rez.vendor.atomicwrites import atomic_write
+
+        package_filepaths = set()
+
+        def _variant_handle(variant):
+            resource = variant.parent.resource
+            filepath = getattr(resource, "filepath", None)
+            if filepath:
+                package_filepaths.add(filepath)
+            return variant.handle.to_dict()
+
+        def _entry(d):
+            d = d.copy()
+            variant = d["variant"]
+            if isinstance(variant, set):
+                d["variant"] = [_variant_handle(x) for x in variant]
+            else:
+                d["variant"] = _variant_handle(variant)
+            return d
+
+        self._update_tools()
+        index = dict(
+            tools=dict((k, _entry(v)) for k, v in self.tools.items()),
+            hidden_tools=[_entry(x) for x in self.hidden_tools],
+            tool_conflicts=dict((k, [_entry(x) for x in v])
+                                for k, v in self.tool_conflicts.items()))
+
+        index["package_filepaths"] = sorted(package_filepaths)
+        index["stamps"] = self._tools_index_stamps(
+            path, index["package_filepaths"])
+
+        filepath = os.path.join(path, "tools.json")
+        with atomic_write(filepath, overwrite=True) as f:
+            f.write(json.dumps(index))
+
+    def _load_tools_index(self):
+        """Read the tools of the suite from disk, if they are up to date.
+
+        Returns:
+            bool: True if the tools were loaded.
+        """
+        from rez.packages import get_variant
+        from rez.utils import json
+        from rez.exceptions import RezError
+
+        filepath = os.path.join(self.load_path, "tools.json")
+        try:
+            with open(filepath) as f:
+                index = json.loads(f.read())
+        except (IOError, OSError, ValueError):
+            return False
+
+        try:
+            stamps = self._tools_index_stamps(self.load_path,
+                                              index["package_filepaths"])
+            if stamps != index["stamps"]:
+                return False
+        except (KeyError, TypeError, OSError):
+            return False
+
+        variants = {}
+
+        def _variant(handle):
+            key = json.dumps(handle, sort_keys=True)
+            variant = variants.get(key)
+            if variant is None:
+                variant = get_variant(handle)
+                variants[key] = variant
+            return variant
+
+        def _entry(d):
+            d = d.copy()
+            variant = d["variant"]
+            if isinstance(variant, list):
+                d["variant"] = set(_variant(x) for x in variant)
+            else:
+                d["variant"] = _variant(variant)
+            return d
+
+        try:
+            tools = dict((k, _entry(v)) for k, v in index["tools"].items())
+            hidden_tools = [_entry(x) for x in index["hidden_tools"]]
+            tool_conflicts = defaultdict(list)
+            for k, v in index["tool_conflicts"].items():
+                tool_conflicts[k] = [_entry(x) for x in v]
+        except (KeyError, TypeError, RezError):
+            return False
+
+        self.tools = tools
+        self.hidden_tools = hidden_tools
+        self.tool_conflicts = tool_conflicts
+        return True
 
     def _validate_tool(self, context_name, tool_name):
         context = self.context(context_name)
@@ -703,6 +832,10 @@ class Suite(object):
     def _update_tools(self):
         if self.tools is not None:
             return
+
+        if self.tools_index_valid and self._load_tools_index():
+            return
+
         self.tools = {}
         self.hidden_tools = []
         self.tool_conflicts = defaultdict(list)
@@ -80,11 +80,20 @@ class System(object):
             import subprocess as sp
             shell = None
 
-            # check parent process via ps
+            # check parent process, via /proc if available (this avoids
+            # spawning a process), otherwise via ps
             try:
-                args = ['ps', '-o', 'args=', '-p', str(os.getppid())]
-                proc = sp.Popen(args, stdout=sp.PIPE)
-                output = proc.communicate()[0]
+                cmdline = os.path.join(os.sep, "proc", str(os.getppid()), "cmdline")
+
+                if os.path.isfile(cmdline):
+                    with open(cmdline, "rb") as f:
+                        output = f.read().split(b'\0')[0]
+                else:
+                    args = ['ps', '-o', 'args=', '-p', str(os.getppid())]
+                    proc = sp.Popen(args, stdout=sp.PIPE)
+                    output = proc.communicate()[0]
+
+                output = output.decode("utf-8", "replace")
                 shell = os.path.basename(output.strip().split()[0]).replace('-', '')
             except Exception:
                 pass
@@ -0,0 +1,121 @@
+"""
+test publishing of amqp messages
+"""
+from rez.tests.util import TestBase, TempdirMixin
+import threading
+import unittest
+import socket
+import time
+import os
+
+
+class TestAmqp(TestBase, TempdirMixin):
+    @classmethod
+    def setUpClass(cls):
+        TempdirMixin.setUpClass()
+        cls.spool_path = os.path.join(cls.root, "amqp_spool")
+        cls.settings = dict(amqp_spool_path=cls.spool_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        TempdirMixin.tearDownClass()
+
+    def test_publish(self):
+        """Test publishing messages to a stand-in broker."""
+        from rez.utils import amqp
+
+        broker = {"up": True, "connections": 0, "messages": [],
+                  "sending": threading.Event()}
+        broker["sending"].set()
+
+        class _Channel(object):
+            def basic_publish(self, msg, exchange, routing_key):
+                broker["sending"].wait()
+                if not broker["up"]:
+                    raise IOError("connection lost")
+                broker["messages"].append(routing_key)
+
+        class _Connection(object):
+            def __init__(self, **kwargs):
+                if not broker["up"]:
+                    raise socket.error("connection refused")
+                broker["connections"] += 1
+
+            def channel(self):
+                return _Channel()
+
+            def close(self):
+                pass
+
+        def _publish(routing_key, block=True):
+            return amqp.publish_message(
+                host="localhost",
+                amqp_settings={"exchange_name": "rez"},
+                routing_key=routing_key,
+                data={},
+                block=block
+            )
+
+        def _wait():
+            t = time.time()
+            while amqp._num_pending and (time.time() - t) < 5:
+                time.sleep(0.01)
+
+        connection_cls = amqp.Connection
+        amqp.Connection = _Connection
+
+        try:
+            # messages share one connection
+            self.assertTrue(_publish("a"))
+            _publish("b", block=False)
+            _publish("c", block=False)
+            _wait()
+            self.assertEqual(broker["messages"], ["a", "b", "c"])
+            self.assertEqual(broker["connections"], 1)
+
+            # messages that could not be sent are spooled at exit
+            broker["up"] = False
+            _publish("d", block=False)
+            _publish("e", block=False)
+            amqp.on_exit()
+            self.assertEqual(amqp._num_pending, 0)
+            self.assertEqual(len(os.listdir(self.spool_path)), 1)
+
+            # ... and sent once the broker is available again
+            broker["up"] = True
+            self.assertTrue(_publish("f"))
+            self.assertEqual(broker["messages"], ["a", "b", "c", "d", "e", "f"])
+            self.assertEqual(broker["connections"], 2)
+            self.assertEqual(os.listdir(self.spool_path), [])
+
+            # messages that are being sent at exit are not spooled
+            broker["sending"].clear()
+            _publish("g", block=False)
+            amqp.on_exit()
+            broker["sending"].set()
+            _wait()
+            self.assertEqual(broker["messages"].count("g"), 1)
+            self.assertEqual(os.listdir(self.spool_path), [])
+        finally:
+            amqp.Connection = connection_cls
+            amqp._publishers.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+
+# Copyright 2013-2016 Allan Johns.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
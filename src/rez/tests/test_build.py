@@ -1,7 +1,7 @@
 """
 test the build system
 """
-from rez.build_process import create_build_process
+from rez.build_process import create_build_process, BuildType
 from rez.build_system import create_build_system
 from rez.resolved_context import ResolvedContext
 from rez.exceptions import BuildError, BuildContextResolveError,\
@@ -41,22 +41,25 @@ class TestBuild(TestBase, TempdirMixin):
         TempdirMixin.tearDownClass()
 
     @classmethod
-    def _create_builder(cls, working_dir):
+    def _create_builder(cls, working_dir, max_workers=None,
+                        fresh_context=False):
         buildsys = create_build_system(working_dir)
         return create_build_process(process_type="local",
                                     working_dir=working_dir,
-                                    build_system=buildsys)
+                                    build_system=buildsys,
+                                    max_workers=max_workers,
+                                    fresh_context=fresh_context)
 
     @classmethod
     def _create_context(cls, *pkgs):
         return ResolvedContext(pkgs)
 
-    def _test_build(self, name, version=None):
+    def _test_build(self, name, version=None, max_workers=None):
         # create the builder
         working_dir = os.path.join(self.src_root, name)
         if version:
             working_dir = os.path.join(working_dir, version)
-        builder = self._create_builder(working_dir)
+        builder = self._create_builder(working_dir, max_workers=max_workers)
 
         # build the package from a clean build dir, then build it again
         builder.build(clean=True)
@@ -66,6 +69,8 @@ class TestBuild(TestBase, TempdirMixin):
         builder.build(install_path=self.install_root, install=True, clean=True)
         builder.build(install_path=self.install_root, install=True)
 
+        return builder
+
     def _test_build_build_util(self):
         """Build, install, test the build_util package."""
         self._test_build("build_util", "1")
@@ -143,6 +148,24 @@ class TestBuild(TestBase, TempdirMixin):
         self._test_build_loco()
         self._test_build_bah()
 
+    @per_available_shell()
+    @install_dependent()
+    def test_builds_parallel(self):
+        """Test building variants concurrently."""
+        self._test_build_build_util()
+        self._test_build_floob()
+        self._test_build_foo()
+
+        builder = self._test_build("bah", "2.1", max_workers=2)
+        self._create_context("bah==2.1", "foo==1.0.0")
+        self._create_context("bah==2.1", "foo==1.1.0")
+
+        # each variant's build output is written to a log in its build dir
+        self.assertEqual(len(builder.build_logs), 2)
+
+        for _, filepath in builder.build_logs:
+            self.assertTrue(os.path.isfile(filepath))
+
     @per_available_shell()
     @install_dependent()
     def test_builds_anti(self):
@@ -151,6 +174,53 @@ class TestBuild(TestBase, TempdirMixin):
         self._test_build_floob()
         self._test_build_anti()
 
+    def test_build_context_caching(self):
+        """Test that build contexts are reused by later builds."""
+        from rez.package_repository import package_repository_manager
+
+        packages_path = os.path.join(self.root, "ctxt_packages")
+        shutil.copytree(self.data_path("solver", "packages"), packages_path)
+
+        self.update_settings({
+            "packages_path": [packages_path],
+            "resolve_caching": True
+        })
+
+        working_dir = os.path.join(self.root, "src", "ctxt")
+        build_path = os.path.join(working_dir, "build")
+        os.makedirs(build_path)
+
+        with open(os.path.join(working_dir, "package.py"), 'w') as f:
+            f.write("name = 'ctxt'\n"
+                    "version = '1'\n"
+                    "requires = ['python-2.7']\n"
+                    "build_command = 'true'\n")
+
+        def _create_build_context(fresh_context=False):
+            builder = self._create_builder(working_dir,
+                                           fresh_context=fresh_context)
+            context, _ = builder.create_build_context(
+                variant=builder.package.get_variant(),
+                build_type=BuildType.local,
+                build_path=build_path)
+            return context
+
+        # the first build resolves, later builds reuse its context
+        self.assertIsNone(_create_build_context().load_path)
+        self.assertIsNotNone(_create_build_context().load_path)
+        self.assertIsNone(
+            _create_build_context(fresh_context=True).load_path)
+        self.assertIsNotNone(_create_build_context().load_path)
+
+        # modifying a package in the context invalidates it
+        filepath = os.path.join(packages_path, "python", "2.7.0", "package.py")
+        st = os.stat(filepath)
+        os.utime(filepath, (st.st_atime, st.st_mtime + 10))
+        package_repository_manager.clear_caches()
+
+        self.assertIsNone(_create_build_context().load_path)
+        self.assertIsNotNone(_create_build_context().load_path)
+
     @program_dependent("cmake")
     def test_build_cmake(self):
         """Test a cmake-based package."""
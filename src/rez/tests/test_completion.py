@@ -26,7 +26,8 @@ class TestCompletion(TestBase):
         _eq("zzz", [])
         _eq("pref", ["prefix_prompt"])
         _eq("plugin", ["plugins",
-                       "plugin_path"])
+                       "plugin_path",
+                       "plugin_cache_path"])
         _eq("plugins", ["plugins",
                         "plugins.command",
                         "plugins.package_repository",
@@ -11,7 +11,9 @@ from rez.packages import get_developer_package
 from rez.vendor.six import six
 import os
 import os.path
+import shutil
 import subprocess
+import tempfile
 
 
 class TestConfig(TestBase):
@@ -284,6 +286,51 @@ class TestConfig(TestBase):
                 print(error.stdout)
                 raise
 
+    def test_9(self):
+        """Test the config cache."""
+        tmpdir = tempfile.mkdtemp(prefix="rez_selftest_")
+        os.environ["REZ_CONFIG_CACHE_PATH"] = os.path.join(tmpdir, "cache")
+        conf = os.path.join(tmpdir, "test1.yaml")
+        shutil.copy(os.path.join(self.config_path, "test1.yaml"), conf)
+
+        def _config():
+            c = Config([self.root_config_file, conf])
+            self.assertEqual(c.sourced_filepaths, [self.root_config_file, conf])
+            return c
+
+        try:
+            c = _config()
+            self.assertFalse(c._cache.hit)
+            self.assertEqual(c.warn_all, True)
+            self.assertEqual(c.plugins.release_vcs.tag_name, "foo")
+            c._cache._write()
+
+            # config data and validated settings are read from the cache
+            c = _config()
+            self.assertTrue(c._cache.hit)
+            self.assertEqual(c._cache.get_value("warn_all"), True)
+            self.assertEqual(c.warn_all, True)
+            self.assertEqual(c.plugins.release_vcs.tag_name, "foo")
+
+            # env-var overrides use a separate cache
+            os.environ["REZ_WARN_ALL"] = "0"
+            c = _config()
+            self.assertFalse(c._cache.hit)
+            self.assertEqual(c.warn_all, False)
+            del os.environ["REZ_WARN_ALL"]
+
+            # changed config files invalidate the cache
+            with open(conf, 'a') as f:
+                f.write("\nwarn_none: true\n")
+
+            c = _config()
+            self.assertFalse(c._cache.hit)
+            self.assertEqual(c.warn_none, True)
+        finally:
+            del os.environ["REZ_CONFIG_CACHE_PATH"]
+            os.environ.pop("REZ_WARN_ALL", None)
+            shutil.rmtree(tmpdir)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,6 +4,7 @@ test resolved contexts
 from rez.tests.util import restore_os_environ, restore_sys_path, TempdirMixin, \
     TestBase
 from rez.resolved_context import ResolvedContext
+from rez.shells import create_shell
 from rez.bundle_context import bundle_context
 from rez.bind import hello_world
 from rez.utils.platform_ import platform_
@@ -12,6 +13,7 @@ import unittest
 import subprocess
 import platform
 import shutil
+import sys
 import os.path
 import os
 
@@ -88,6 +90,60 @@ class TestContext(TestBase, TempdirMixin):
 
         self.assertEqual(parts, ["covfefe", "hello"])
 
+    def test_execute_shell_direct(self):
+        """Test that commands run without a shell get the same environ."""
+        if platform_.name == "windows":
+            self.skipTest("Commands are only run directly in unix shells")
+
+        pycode = ("import os; "
+                  "print(os.getenv(\"OH_HAI_WORLD\")); "
+                  "print(os.getenv(\"PATH\")); "
+                  "print(os.getenv(\"REZ_USED_RESOLVE\")); "
+                  "print(os.getenv(\"REZ_SHELL_INTERACTIVE\"))")
+
+        args = [sys.executable, "-c", pycode]
+        r = ResolvedContext(["hello_world"])
+        sh = create_shell("sh")
+
+        self.assertEqual(r._get_direct_command_args(sh, args), args)
+        self.assertEqual(r._get_direct_command_args(sh, "foo bah"),
+                         ["foo", "bah"])
+        self.assertIsNone(r._get_direct_command_args(sh, "foo | bah"))
+        self.assertIsNone(r._get_direct_command_args(sh, "FOO=1 bah"))
+        self.assertIsNone(r._get_direct_command_args(sh, ["cd", "/"]))
+        self.assertIsNone(r._get_direct_command_args(sh, ["echo", "$HOME"]))
+
+        outputs = []
+        for direct in (True, False):
+            self.update_settings({"direct_command_execution": direct})
+            returncode, stdout, _ = r.execute_shell(
+                shell="sh", command=args, block=True,
+                stdout=subprocess.PIPE, text=True)
+
+            self.assertEqual(returncode, 0)
+            outputs.append(stdout.strip().split('\n'))
+
+        self.assertEqual(outputs[0][0], "hello")
+        self.assertEqual(outputs[0], outputs[1])
+
+        # callbacks are run once, even if they make a shell necessary
+        calls = []
+
+        def _actions_callback(executor):
+            calls.append(executor)
+            executor.env.FOO = "{bah}"
+            executor.alias("foo", "echo")
+
+        self.update_settings({"direct_command_execution": True})
+        returncode, stdout, _ = r.execute_shell(
+            shell="sh", command=["printenv", "FOO"], block=True,
+            actions_callback=_actions_callback,
+            stdout=subprocess.PIPE, text=True)
+
+        self.assertEqual(returncode, 0)
+        self.assertEqual(stdout.strip(), "{bah}")
+        self.assertEqual(len(calls), 1)
+
     def test_serialize(self):
         """Test context serialization."""
 
@@ -104,6 +160,130 @@ class TestContext(TestBase, TempdirMixin):
         env = r2.get_environ()
         self.assertEqual(env.get("OH_HAI_WORLD"), "hello")
 
+    def test_env_cache(self):
+        """Test caching of context environments."""
+        from rez.utils.context_env_cache import context_env_cache
+
+        cache_path = os.path.join(self.root, "context_env_cache")
+        self.update_settings({"context_env_cache_path": cache_path,
+                              "parent_variables": ["PATH"]})
+
+        r = ResolvedContext(["hello_world"])
+        parent_environ = {"PATH": "/foo", "UNUSED": "1"}
+
+        env = r.get_environ(parent_environ=parent_environ)
+        self.assertEqual(env.get("OH_HAI_WORLD"), "hello")
+        self.assertTrue(env["PATH"].startswith("/foo" + os.pathsep))
+        self.assertEqual(len(os.listdir(cache_path)), 1)
+
+        # a hit does not depend on variables the commands did not read
+        key = r._get_env_cache_key(r._get_cached_roots())
+        key["output"] = "environ"
+        parent_environ["UNUSED"] = "2"
+        self.assertEqual(context_env_cache.get(key, parent_environ), env)
+        self.assertEqual(r.get_environ(parent_environ=parent_environ), env)
+
+        # commands can refer to the current user
+        key2 = dict(key, user=key["user"] + "_other")
+        self.assertIsNone(context_env_cache.get(key2, parent_environ))
+
+        # a variable that was read causes a miss
+        parent_environ["PATH"] = "/bah"
+        self.assertIsNone(context_env_cache.get(key, parent_environ))
+        env2 = r.get_environ(parent_environ=parent_environ)
+        self.assertTrue(env2["PATH"].startswith("/bah" + os.pathsep))
+
+        # shell code is cached separately from the environ
+        code = r.get_shell_code(shell="sh", parent_environ=parent_environ)
+        self.assertEqual(len(os.listdir(cache_path)), 2)
+        self.assertEqual(
+            r.get_shell_code(shell="sh", parent_environ=parent_environ), code)
+
+        # so is the code that shells source
+        for _ in range(2):
+            returncode, stdout, _ = r.execute_shell(
+                shell="sh", command="echo $OH_HAI_WORLD", block=True,
+                parent_environ=parent_environ, stdout=subprocess.PIPE,
+                text=True)
+
+            self.assertEqual(returncode, 0)
+            self.assertEqual(stdout.strip(), "hello")
+            self.assertEqual(len(os.listdir(cache_path)), 3)
+
+    def test_freeze_env(self):
+        """Test use of environments stored in a context file."""
+        self.update_settings({"parent_variables": ["PATH"]})
+
+        file = os.path.join(self.root, "frozen.rxt")
+        r = ResolvedContext(["hello_world"])
+        r.save(file)
+
+        parent_environ = {"PATH": "/foo", "UNUSED": "1"}
+        r = ResolvedContext.load(file)
+        r.freeze_env(shells=["sh"], parent_environ=parent_environ)
+        r.save(file)
+
+        env = r.get_environ(parent_environ=parent_environ)
+        code = r.get_shell_code(shell="sh", parent_environ=parent_environ)
+
+        def _execute(*nargs, **kwargs):
+            raise RuntimeError("context was interpreted")
+
+        # the stored environment is used, without interpreting the context
+        r2 = ResolvedContext.load(file)
+        r2._execute = _execute
+        parent_environ["UNUSED"] = "2"
+        self.assertEqual(r2.get_environ(parent_environ=parent_environ), env)
+        self.assertEqual(
+            r2.get_shell_code(shell="sh", parent_environ=parent_environ), code)
+
+        sh = create_shell("sh")
+        changes = r2._get_direct_environ(sh, parent_environ, file)
+        self.assertEqual(changes["environ"]["OH_HAI_WORLD"], "hello")
+
+        listings = r2._get_path_listings(env["PATH"])
+        self.assertTrue(any("hello_world" in x for x in listings.values()))
+
+        # a change to a variable that was read means interpreting again
+        parent_environ["PATH"] = "/bah"
+        self.assertRaises(RuntimeError, r2.get_environ,
+                          parent_environ=parent_environ)
+
+        r2 = ResolvedContext.load(file)
+        env2 = r2.get_environ(parent_environ=parent_environ)
+        self.assertTrue(env2["PATH"].startswith("/bah" + os.pathsep))
+
+        # so do changes to settings that affect the environment
+        parent_environ["PATH"] = "/foo"
+        self.update_settings({"parent_variables": []})
+        r2._execute = _execute
+        self.assertRaises(RuntimeError, r2.get_environ,
+                          parent_environ=parent_environ)
+
+    def test_which(self):
+        """Test finding a program in a context."""
+        from rez.backport.shutilwhich import which
+
+        r = ResolvedContext(["hello_world"])
+        env = r.get_environ()
+        expected = which("hello_world", env=env)
+        self.assertTrue(expected)
+        self.assertEqual(r.which("hello_world"), expected)
+
+        # with the context env cache enabled, package directories in PATH
+        # are listed rather than searched
+        cache_path = os.path.join(self.root, "which_cache")
+        self.update_settings({"context_env_cache_path": cache_path})
+
+        r = ResolvedContext(["hello_world"])
+        self.assertEqual(r.which("hello_world"), expected)
+        self.assertIsNone(r.which("not_a_real_program"))
+
+        bin_path = os.path.dirname(expected)
+        listings = r._get_path_listings(env["PATH"])
+        self.assertEqual(listings.get(bin_path), set(["hello_world"]))
+        self.assertEqual(list(listings.keys()), [bin_path])
+
     def test_retarget(self):
         """Test that a retargeted context behaves identically."""
 
@@ -178,6 +358,46 @@ class TestContext(TestBase, TempdirMixin):
 
             _test_bundle(bundle_path3)
 
+    def test_bundled_dedupe(self):
+        """Test deduplication of identical files in a bundle."""
+        from rez.packages import create_package
+
+        packages_path = os.path.join(self.root, "dedupe_packages")
+        os.makedirs(packages_path)
+
+        roots = []
+        for name in ("foo", "bah"):
+            package = create_package(name, dict(version="1"))
+            variant = next(package.iter_variants()).install(packages_path)
+
+            bin_path = os.path.join(variant.root, "bin")
+            os.makedirs(bin_path)
+            with open(os.path.join(bin_path, "data.txt"), 'w') as f:
+                f.write("identical")
+
+            roots.append(os.path.relpath(variant.root, packages_path))
+
+        r = ResolvedContext(["foo", "bah"], package_paths=[packages_path])
+        bundle_path = os.path.join(self.root, "dedupe_bundle")
+        bundle_context(
+            context=r,
+            dest_dir=bundle_path,
+            dedupe=True,
+            max_workers=2,
+            quiet=True
+        )
+
+        stats = [
+            os.stat(os.path.join(bundle_path, "packages", x, "bin", "data.txt"))
+            for x in roots
+        ]
+        self.assertEqual(stats[0].st_ino, stats[1].st_ino)
+        self.assertEqual(stats[0].st_nlink, 2)
+
+        r2 = ResolvedContext.load(os.path.join(bundle_path, "context.rxt"))
+        self.assertEqual(set(x.name for x in r2.resolved_packages),
+                         set(["foo", "bah"]))
+
 
 if __name__ == '__main__':
     unittest.main()
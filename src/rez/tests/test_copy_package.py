@@ -325,3 +325,27 @@ class TestCopyPackage(TestBase, TempdirMixin):
         # this can only match if the include module was copied with the package
         environ = ctxt.get_environ(parent_environ={})
         self.assertEqual(environ.get("EEK"), "2")
+
+    def test_9(self):
+        """Concurrent, hardlinked copy of variant payloads."""
+        self._reset_dest_repository()
+
+        src_pkg = self._get_src_pkg("bah", "2.1")
+        result = copy_package(
+            package=src_pkg,
+            dest_repository=self.dest_install_root,
+            link_mode="hardlink",
+            max_workers=2,
+            verbose=True
+        )
+
+        self._assert_copied(result, 2, 0)
+
+        # payload files are links to the source files
+        for src_variant, dest_variant in result["copied"]:
+            relpath = os.path.join("python", "bah", "__init__.py")
+            src_stat = os.stat(os.path.join(src_variant.root, relpath))
+            dest_stat = os.stat(os.path.join(dest_variant.root, relpath))
+
+            self.assertEqual(src_stat.st_ino, dest_stat.st_ino)
+            self.assertEqual(dest_stat.st_nlink, 2)
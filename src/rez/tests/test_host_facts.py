@@ -0,0 +1,70 @@
+"""
+test the host facts cache
+"""
+from rez.tests.util import TestBase, TempdirMixin
+from rez.utils.host_facts import HostFactsCache
+import unittest
+import os
+
+
+class TestHostFactsCache(TestBase, TempdirMixin):
+    @classmethod
+    def setUpClass(cls):
+        TempdirMixin.setUpClass()
+        cls.settings = dict(host_facts_cache_path=cls.root)
+
+    @classmethod
+    def tearDownClass(cls):
+        TempdirMixin.tearDownClass()
+
+    def test_cache(self):
+        calls = []
+
+        def _fact():
+            calls.append(1)
+            return ["a", "b"]
+
+        depfile = os.path.join(self.root, "depfile")
+        with open(depfile, 'w') as f:
+            f.write("1")
+
+        cache = HostFactsCache()
+        self.assertEqual(cache.get("fact", _fact, [depfile]), ["a", "b"])
+        self.assertEqual(cache.get("fact", _fact, [depfile]), ["a", "b"])
+        self.assertEqual(len(calls), 1)
+
+        # a new cache (as in another process) reads the fact from disk
+        cache = HostFactsCache()
+        self.assertEqual(cache.get("fact", _fact, [depfile]), ["a", "b"])
+        self.assertEqual(len(calls), 1)
+
+        # fact is refreshed when the file it depends on changes
+        st = os.stat(depfile)
+        os.utime(depfile, (st.st_atime, st.st_mtime + 10))
+        self.assertEqual(cache.get("fact", _fact, [depfile]), ["a", "b"])
+        self.assertEqual(len(calls), 2)
+
+        # ... or when the file is removed
+        os.remove(depfile)
+        cache.get("fact", _fact, [depfile])
+        self.assertEqual(len(calls), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+
+# Copyright 2013-2016 Allan Johns.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
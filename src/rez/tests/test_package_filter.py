@@ -0,0 +1,144 @@
+"""
+Test package filters
+"""
+from rez.package_filter import PackageFilter, PackageFilterList, Rule, \
+    RegexRule
+from rez.packages import iter_package_families, iter_packages
+from rez.tests.util import TestBase
+import unittest
+
+
+class TestPackageFilter(TestBase):
+    @classmethod
+    def setUpClass(cls):
+        cls.py_packages_path = cls.data_path("packages", "py_packages")
+        cls.solver_packages_path = cls.data_path("solver", "packages")
+        cls.packages_path = [cls.solver_packages_path, cls.py_packages_path]
+
+        cls.settings = dict(
+            packages_path=cls.packages_path,
+            package_filter=None)
+
+    def _packages(self):
+        for family in iter_package_families():
+            for package in iter_packages(family.name):
+                yield package
+
+    def _excludes(self, package_filter, package):
+        """Apply filter rules one at a time, in cost order."""
+        def _match(rules_dict, family):
+            for rule in rules_dict.get(family, []):
+                if rule.match(package):
+                    return rule
+            return None
+
+        excl = (_match(package_filter._excludes, package.name)
+                or _match(package_filter._excludes, None))
+        if excl and (_match(package_filter._includes, package.name)
+                     or _match(package_filter._includes, None)):
+            excl = None
+        return excl
+
+    def _filter(self, excludes, includes=None):
+        package_filter = PackageFilter()
+        for rule in excludes:
+            if not isinstance(rule, Rule):
+                rule = Rule.parse_rule(rule)
+            package_filter.add_exclusion(rule)
+        for rule in (includes or []):
+            package_filter.add_inclusion(Rule.parse_rule(rule))
+        return package_filter
+
+    def test_excludes(self):
+        """Test that compiled filters match the same rules as single rules."""
+        filters = [
+            self._filter(["python"]),
+            self._filter(["python-2.6+<2.7"], ["python-2.6.0"]),
+            self._filter(["!python-2.6"]),
+            self._filter(["~python-2.6"]),
+            self._filter(["~python"]),
+            self._filter(["~python", "python-2.6"]),
+            self._filter(["!python", "pyfoo"]),
+            self._filter(["*"], ["python", "pyfoo-3.1+"]),
+            self._filter(["py*", "regex(.*\\.0$)", "glob(nopy-2.1)"]),
+            self._filter([RegexRule("(py)(foo|bah).*"), RegexRule("(?i)PYODD.*")]),
+            self._filter(["before(timestamped:1020)", "after(timestamped:1100)"]),
+            self._filter(["timestamped-2", "after(timestamped:1050)",
+                          "before(timestamped:990)"],
+                         ["regex(timestamped-1\\.1.*)"]),
+        ]
+
+        packages = list(self._packages())
+        self.assertTrue(packages)
+
+        for package_filter in filters:
+            excluded = 0
+
+            for package in packages:
+                expected = self._excludes(package_filter, package)
+                rule = package_filter.excludes(package)
+                self.assertIs(rule, expected, "%s: %s" % (package_filter, package))
+
+                if rule:
+                    excluded += 1
+
+            self.assertTrue(excluded, str(package_filter))
+
+    def test_weak_and_conflict_rules(self):
+        """Test rules for weak and conflict requirements without versions."""
+        package = next(iter_packages("python", "2.5"))
+
+        rule = Rule.parse_rule("~python")
+        self.assertIs(self._filter([rule]).excludes(package), rule)
+        self.assertIsNone(self._filter(["!python"]).excludes(package))
+
+    def test_add_rule(self):
+        """Test that adding rules to a used filter is taken into account."""
+        package_filter = self._filter(["python-2.6"])
+        package = next(iter_packages("python", "2.5"))
+        self.assertIsNone(package_filter.excludes(package))
+
+        copy = package_filter.copy()
+        copy.add_exclusion(Rule.parse_rule("python-2.5"))
+        self.assertIsNotNone(copy.excludes(package))
+        self.assertIsNone(package_filter.excludes(package))
+
+        copy.add_inclusion(Rule.parse_rule("python-2.5.2"))
+        self.assertIsNone(copy.excludes(package))
+
+    def test_excludes_family(self):
+        """Test excluding entire package families."""
+        self.assertTrue(self._filter(["python"]).excludes_family("python"))
+        self.assertTrue(self._filter(["pyth*"]).excludes_family("python"))
+        self.assertTrue(self._filter(["*"]).excludes_family("python"))
+        self.assertFalse(self._filter(["python-2"]).excludes_family("python"))
+        self.assertFalse(self._filter(["!python"]).excludes_family("python"))
+        self.assertFalse(self._filter(["python*"]).excludes_family("pyth"))
+        self.assertFalse(self._filter(["*"], ["python-2.5"]).excludes_family("python"))
+
+        flist = PackageFilterList()
+        flist.add_filter(self._filter(["nopy"]))
+        flist.add_filter(self._filter(["pyfoo*"]))
+        self.assertTrue(flist.excludes_family("pyfoo"))
+        self.assertEqual(list(flist.iter_packages("pyfoo")), [])
+        self.assertEqual(len(list(flist.iter_packages("python"))), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+
+# Copyright 2013-2016 Allan Johns.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
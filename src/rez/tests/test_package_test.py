@@ -0,0 +1,142 @@
+"""
+test running package tests
+"""
+from rez.tests.util import TestBase, TempdirMixin
+from rez.package_test import PackageTestRunner
+import unittest
+import tempfile
+import textwrap
+import os.path
+import os
+
+
+class TestPackageTest(TestBase, TempdirMixin):
+    @classmethod
+    def setUpClass(cls):
+        TempdirMixin.setUpClass()
+
+        cls.packages_path = os.path.join(cls.root, "packages")
+
+        for version in ("1", "2"):
+            cls._write_package("dep", version, "")
+
+        cls._write_package("pkg", "1.0", textwrap.dedent(
+            """
+            variants = [["dep-1"], ["dep-2"]]
+
+            tests = {
+                "a_echo": {
+                    "command": "echo hello",
+                    "on_variants": True
+                },
+                "b_once": {
+                    "command": "echo once",
+                    "on_variants": False
+                },
+                "c_fail": {
+                    "command": "exit 3",
+                    "on_variants": True
+                },
+                "d_echo": {
+                    "command": "echo goodbye",
+                    "on_variants": True
+                }
+            }
+            """))
+
+        cls.settings = dict(
+            packages_path=[cls.packages_path],
+            package_filter=None,
+            implicit_packages=[],
+            default_shell="sh",
+            warn_untimestamped=False,
+            resolve_caching=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        TempdirMixin.tearDownClass()
+
+    @classmethod
+    def _write_package(cls, name, version, body):
+        path = os.path.join(cls.packages_path, name, version)
+        os.makedirs(path)
+
+        with open(os.path.join(path, "package.py"), 'w') as f:
+            f.write("name = %r\nversion = %r\ntimestamp = 1\n%s"
+                    % (name, version, body))
+
+    def _run_tests(self, test_names, max_workers, **kwargs):
+        with tempfile.TemporaryFile(mode="w+") as f:
+            runner = PackageTestRunner(
+                "pkg",
+                package_paths=[self.packages_path],
+                stdout=f,
+                stderr=f,
+                **kwargs
+            )
+
+            exitcode = runner.run_tests(test_names, max_workers=max_workers)
+
+            f.seek(0)
+            output = f.read()
+
+        rows = [
+            (x["test_name"], x["variant"].index, x["status"], x["description"])
+            for x in runner.test_results.test_results
+        ]
+
+        return runner, exitcode, rows, output
+
+    @unittest.skipIf(os.name == "nt", "Test commands are written for sh")
+    def test_run_tests_parallel(self):
+        """Test that running tests concurrently gives the same results."""
+        test_names = ["a_echo", "b_once", "c_fail", "d_echo"]
+
+        _, exitcode, rows, _ = self._run_tests(test_names, max_workers=1)
+        _, exitcode2, rows2, output = self._run_tests(test_names,
+                                                      max_workers=3)
+
+        self.assertEqual(exitcode, 3)
+        self.assertEqual(exitcode2, exitcode)
+        self.assertEqual(rows2, rows)
+
+        self.assertEqual(
+            [x[:3] for x in rows],
+            [
+                ("a_echo", 0, "success"),
+                ("a_echo", 1, "success"),
+                ("b_once", 1, "success"),
+                ("c_fail", 0, "failed"),
+                ("c_fail", 1, "failed"),
+                ("d_echo", 0, "success"),
+                ("d_echo", 1, "success")
+            ]
+        )
+
+        lines = output.splitlines()
+        for line in ("[a_echo:0] hello", "[a_echo:1] hello",
+                     "[b_once:1] once", "[d_echo:0] goodbye",
+                     "[d_echo:1] goodbye"):
+            self.assertIn(line, lines)
+
+    @unittest.skipIf(os.name == "nt", "Test commands are written for sh")
+    def test_run_tests_parallel_stop_on_fail(self):
+        """Test that no new tests are started after a failure."""
+        runner, exitcode, rows, _ = self._run_tests(
+            ["c_fail", "a_echo", "d_echo"],
+            max_workers=2,
+            stop_on_fail=True
+        )
+
+        self.assertEqual(exitcode, 3)
+        self.assertTrue(runner.stopped_on_fail)
+
+        # either variant's run may not have started before the other one
+        # failed, but no later tests are run
+        self.assertTrue(rows)
+        self.assertEqual(set(x[:3:2] for x in rows),
+                         set([("c_fail", "failed")]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -388,6 +388,40 @@ class TestPackages(TestBase, TempdirMixin):
             data_ = _data(installed_package)
             self.assertDictEqual(data, data_)
 
+    def test_timestamp_index(self):
+        """Test the filesystem repository timestamp index."""
+        pkg_name = "timestamped"
+        repo_path = os.path.join(self.root, "tmp_timestamp_packages")
+        shutil.copytree(os.path.join(self.py_packages_path, pkg_name),
+                        os.path.join(repo_path, pkg_name))
+
+        repo = package_repository_manager.get_repository(repo_path)
+        expected = dict(
+            (str(p.version), p.timestamp)
+            for p in iter_packages(pkg_name, paths=[repo_path])
+        )
+
+        # build index of already released packages
+        n = repo.update_timestamp_index(pkg_name)
+        self.assertEqual(n, len(expected))
+        self.assertEqual(repo.get_timestamp_index(pkg_name), expected)
+
+        # timestamps should come from the index, without loading packages
+        repo.clear_caches()
+        for package in iter_packages(pkg_name, paths=[repo_path]):
+            self.assertEqual(package.timestamp, expected[str(package.version)])
+            self.assertNotIn("_data", package.resource.__dict__)
+
+        # installing a variant updates the index
+        package = get_package(pkg_name, "1.0.5", paths=[repo_path])
+        package_ = create_package(pkg_name, dict(version="3.0", timestamp=5000))
+        variant = next(package_.iter_variants())
+        variant.install(repo_path)
+
+        index = repo.get_timestamp_index(pkg_name)
+        self.assertEqual(index.get("3.0"), 5000)
+        self.assertEqual(index.get("1.0.5"), package.timestamp)
+
     def test_expand_requirement(self):
         """test expand_requirement function."""
         tests = (
@@ -565,6 +599,110 @@ class TestPackages(TestBase, TempdirMixin):
         i = repo.unignore_package(pkg_name, pkg_version)
         self.assertEqual(i, -1)
 
+    def test_depends_index(self):
+        """Test reverse dependency lookups using the depends index."""
+        from rez.package_search import get_reverse_dependency_tree
+        from rez.utils.depends_index import depends_index
+
+        repo_path = os.path.join(self.root, "tmp6_packages")
+        shutil.copytree(self.solver_packages_path, repo_path)
+
+        self.update_settings({
+            "depends_index_path": os.path.join(self.root, "depends_index")
+        })
+
+        def _test(package_name, **kwargs):
+            expected = get_reverse_dependency_tree(
+                package_name, paths=[repo_path], use_index=False, **kwargs)
+            result = get_reverse_dependency_tree(
+                package_name, paths=[repo_path], use_index=True, **kwargs)
+
+            self.assertEqual(result[0], expected[0])
+            return result[0]
+
+        self.assertIn("pydad", _test("pymum")[1])
+        _test("python")
+        _test("pyfoo", build_requires=True, private_build_requires=True)
+
+        entries = depends_index.get_families(repo_path, refresh=False)
+        self.assertEqual(set(entries.keys()), _to_names(
+            iter_package_families(paths=[repo_path])))
+        self.assertEqual(entries["pydad"]["version"], "3")
+
+        # removing the latest package updates the index
+        remove_package("pydad", Version("3"), repo_path)
+        entries = depends_index.get_families(repo_path, refresh=False)
+        self.assertEqual(entries["pydad"]["version"], "2")
+        self.assertIn("pydad", _test("pyson")[1])
+
+        # so does installing a package
+        package = create_package("pydad", dict(version="4", requires=["nada"]))
+        next(package.iter_variants()).install(repo_path)
+        self.assertIn("pydad", _test("nada")[1])
+
+    def test_resource_search(self):
+        """Test searching for packages and variants."""
+        from rez.package_search import ResourceSearcher
+
+        paths = [self.solver_packages_path]
+
+        searcher = ResourceSearcher(package_paths=paths, max_workers=1)
+        resource_type, results = searcher.search("py*")
+        self.assertEqual(resource_type, "family")
+        self.assertEqual([x.resource for x in results],
+                         sorted(x for x in _to_names(iter_package_families(
+                             paths=paths)) if x.startswith("py")))
+
+        searcher = ResourceSearcher(package_paths=paths,
+                                    resource_type="variant", max_workers=1)
+        _, results = searcher.search("py*")
+        expected = [x.resource.qualified_name for x in results]
+        self.assertTrue(expected)
+
+        # the same results are found in parallel, optionally as they complete
+        for ordered in (True, False):
+            searcher = ResourceSearcher(package_paths=paths,
+                                        resource_type="variant", max_workers=4)
+            _, it = searcher.iter_resources("py*", ordered=ordered)
+            names = [x.resource.qualified_name for x in it]
+
+            if ordered:
+                self.assertEqual(names, expected)
+            else:
+                self.assertEqual(sorted(names), sorted(expected))
+
+    def test_completion_index(self):
+        """Test package completion using the completion index."""
+        from rez.packages import get_completions
+        from rez.utils.completion_index import completion_index
+
+        repo_path = os.path.join(self.root, "tmp7_packages")
+        shutil.copytree(self.solver_packages_path, repo_path)
+        prefixes = ("", "py", "pyd", "pydad-", "!pyfoo", "nada")
+
+        self.update_settings({"completion_index_path": None})
+        expected = [get_completions(x, paths=[repo_path]) for x in prefixes]
+
+        self.update_settings({
+            "completion_index_path": os.path.join(self.root, "completion")
+        })
+
+        result = [get_completions(x, paths=[repo_path]) for x in prefixes]
+        self.assertEqual(result, expected)
+        self.assertIn("pydad-3", get_completions("pydad-", paths=[repo_path]))
+
+        # a release into a completed family is seen immediately
+        package = create_package("pydad", dict(version="4"))
+        next(package.iter_variants()).install(repo_path)
+        self.assertIn("pydad-4", get_completions("pydad-", paths=[repo_path]))
+
+        # a new family is seen once the index has been refreshed
+        package = create_package("pynew", dict(version="1"))
+        next(package.iter_variants()).install(repo_path)
+        completion_index.refresh(repo_path)
+        self.assertEqual(get_completions("pyn", paths=[repo_path]),
+                         set(["pynew", "pynew-1"]))
+
 
 class TestMemoryPackages(TestBase):
     def test_1_memory_variant_parent(self):
@@ -267,6 +267,20 @@ class TestTimestampPackageOrder(_BaseTestPackagesOrder):
         expected = ['1.0.6', '1.0.5', '1.1.1', '1.1.0', '1.2.0', '2.0.0', '2.1.5', '2.1.0']
         self._test_reorder(timestamp_orderer, "timestamped", expected)
 
+    def test_sort_keys(self):
+        """Validate sort keys match reordering, and are cached."""
+        orderer = TimestampPackageOrder(timestamp=3001, rank=3)
+        packages = sorted(iter_packages("timestamped"), key=lambda x: x.version)
+
+        sort_keys = orderer.get_sort_keys(packages)
+        ordered = sorted(packages, key=lambda x: sort_keys[x.version])
+        self.assertEqual(ordered, orderer.reorder(packages))
+        self.assertIs(orderer.get_sort_keys(packages), sort_keys)
+
+        # all packages before timestamp, so the orderer does not apply
+        orderer = TimestampPackageOrder(timestamp=9999999999)
+        self.assertIsNone(orderer.get_sort_keys(packages))
+
     def test_comparison(self):
         """Validate we can compare TimestampPackageOrder."""
         inst1 = TimestampPackageOrder(timestamp=1, rank=1)
@@ -13,6 +13,7 @@ from rez.exceptions import PackageRequestError
 from rez.tests.util import TestBase
 
 import rez.utils.pip
+import rez.pip
 
 
 class TestPipUtils(TestBase):
@@ -342,6 +343,42 @@ class TestPipUtils(TestBase):
             [set(["test"])]
         )
 
+    def test_pip_install_command(self):
+        """Test the pip install command, and its wheel cache dir."""
+        def _get_command(extra_args=None):
+            return rez.pip.get_pip_install_command(
+                "python", "foo", "/tmp/target", extra_args=extra_args)
+
+        self.update_settings({"pip_wheel_cache_path": None,
+                              "pip_extra_args": []})
+
+        self.assertEqual(
+            _get_command(),
+            ["python", "-m", "pip", "install", "--use-pep517",
+             "--target=/tmp/target", "foo"]
+        )
+
+        self.update_settings({"pip_wheel_cache_path": "/tmp/pip_cache",
+                              "pip_extra_args": []})
+
+        self.assertEqual(
+            _get_command(),
+            ["python", "-m", "pip", "install", "--use-pep517",
+             "--target=/tmp/target", "--cache-dir=/tmp/pip_cache", "foo"]
+        )
+
+        # the cache dir is not added if given in the extra args
+        for extra_args in (["--cache-dir", "/tmp/other"],
+                           ["--cache-dir=/tmp/other"],
+                           ["--no-cache-dir"]):
+            cmd = _get_command(extra_args)
+            self.assertNotIn("--cache-dir=/tmp/pip_cache", cmd)
+            self.assertEqual(cmd[-len(extra_args) - 1:-1], extra_args)
+
+            self.update_settings({"pip_wheel_cache_path": "/tmp/pip_cache",
+                                  "pip_extra_args": extra_args})
+            self.assertEqual(_get_command(), cmd)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,7 +2,8 @@
 test rezplugins manager behaviors
 """
 from rez.tests.util import TestBase, TempdirMixin, restore_sys_path
-from rez.plugin_managers import plugin_manager, uncache_rezplugins_module_paths
+from rez.plugin_managers import plugin_manager, plugin_cache, \
+    uncache_rezplugins_module_paths
 from rez.package_repository import package_repository_manager
 import sys
 import unittest
@@ -20,6 +21,7 @@ class TestPluginManagers(TestBase, TempdirMixin):
         package_repository_manager.pool.resource_classes.clear()
         # for resetting new-style plugins
         uncache_rezplugins_module_paths()
+        plugin_cache.clear()
 
         plugin_types = []
         for singleton in plugin_manager._plugin_types.values():
@@ -35,11 +37,13 @@ class TestPluginManagers(TestBase, TempdirMixin):
 
     @classmethod
     def setUpClass(cls):
+        TempdirMixin.setUpClass()
         cls.settings = {"debug_plugins": True}
 
     @classmethod
     def tearDownClass(cls):
         cls._reset_plugin_manager()
+        TempdirMixin.tearDownClass()
 
     def setUp(self):
         TestBase.setUp(self)
@@ -97,6 +101,29 @@ class TestPluginManagers(TestBase, TempdirMixin):
                 "package_repository", "memory")
             self.assertEqual("bar", mem_cls.on_test)
 
+    def test_plugin_cache(self):
+        """Test that cached plugins are imported on first use"""
+        self.update_settings(dict(
+            plugin_cache_path=self.root
+        ))
+
+        shells = sorted(plugin_manager.get_plugins("shell"))
+        config_data = plugin_manager.get_plugin_config_data("shell")
+        self.assertFalse(plugin_manager._get_plugin_type("shell").from_cache)
+
+        # as in a new process
+        self._reset_plugin_manager()
+
+        self.assertEqual(sorted(plugin_manager.get_plugins("shell")), shells)
+        self.assertEqual(plugin_manager.get_plugin_config_data("shell"),
+                         config_data)
+        self.assertTrue(plugin_manager._get_plugin_type("shell").from_cache)
+        self.assertNotIn("rezplugins.shell.bash", sys.modules)
+
+        bash_cls = plugin_manager.get_plugin_class("shell", "bash")
+        self.assertEqual(bash_cls.name(), "bash")
+        self.assertIn("rezplugins.shell.bash", sys.modules)
+
 
 if __name__ == '__main__':
     unittest.main()
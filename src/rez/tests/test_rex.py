@@ -11,12 +11,17 @@ from rez.config import config
 import unittest
 from rez.vendor.version.version import Version
 from rez.vendor.version.requirement import Requirement
-from rez.tests.util import TestBase
+from rez.tests.util import TestBase, restore_os_environ, restore_sys_path
 from rez.utils.backcompat import convert_old_commands
+from rez.utils.sourcecode import SourceCode, CompiledCodeCache
 from rez.package_repository import package_repository_manager
 from rez.packages import iter_package_families
 import inspect
+import subprocess
 import textwrap
+import tempfile
+import shutil
+import sys
 import os
 
 
@@ -517,6 +522,102 @@ class TestRex(TestBase):
         self.assertRaises(RuntimeError,  # no default
                           intersects, ephemerals.get_range("foo.bar"), "0")
 
+    def test_compiled_code_cache(self):
+        """Test caching of compiled code, in memory and on disk."""
+        path = tempfile.mkdtemp(prefix="rez_selftest_")
+        self.addCleanup(shutil.rmtree, path)
+        config.override("compiled_code_cache_path", path)
+
+        code = SourceCode("setenv('FOO', 'foo')")
+        cache = CompiledCodeCache()
+        pyc = cache.compile(code.evaluated_code, code.sourcename)
+        self.assertIs(cache.compile(code.evaluated_code, code.sourcename), pyc)
+
+        # a new cache (as in another process) reads the code from disk
+        cache2 = CompiledCodeCache()
+        pyc2 = cache2.compile(code.evaluated_code, code.sourcename)
+        self.assertEqual(pyc2, pyc)
+        self.assertIsNot(pyc2, pyc)
+
+        # a different filename is cached separately
+        pyc3 = cache.compile(code.evaluated_code, "<other>")
+        self.assertEqual(pyc3.co_filename, "<other>")
+
+        # commands from cache behave the same
+        ex = self._create_executor({})
+        ex.execute_code(code)
+        self.assertEqual(ex.actions, [Setenv('FOO', 'foo')])
+
+        self.assertRaises(SyntaxError, cache.compile, "if:", "<string>")
+
+    def test_batched_env_changes(self):
+        """Test that batched path changes give the same environ in a shell."""
+        from rez.shells import create_shell
+        from rez.utils.platform_ import platform_
+
+        if platform_.name == "windows":
+            self.skipTest("Test needs a unix shell")
+
+        def _rex():
+            env.A = "/a"
+            env.A.prepend("/b")
+            env.A.append("/c")
+            env.B = "${A}/x"         # refers to A
+            env.A.prepend("/d")
+            env.C.append("/e")       # parent variable
+            env.C.append("${B}")     # refers to B, which is changed next
+            env.B = "/f"
+            env.D = "/g"
+            env.D.prepend("/h")
+            unsetenv("D")
+            env.E = "/i"
+            env.E.append("/j")
+            command("true")          # the shell may read E
+            env.E.append("/k")
+
+        parent_environ = {"C": "/c0"}
+        ex = RexExecutor(interpreter=create_shell("sh"),
+                         parent_environ=parent_environ,
+                         parent_variables=["C"], shebang=False)
+        ex.execute_function(_rex)
+        code = ex.get_output()
+
+        # path changes to A are batched, but not past the point where B
+        # refers to A
+        self.assertEqual(code.count("export A="), 3)
+
+        py_ex = self._create_executor(parent_environ, parent_variables=["C"])
+        py_ex.execute_function(_rex)
+        expected = py_ex.get_output()
+
+        code += "\necho \"$A|$B|$C|${D-unset}|$E\""
+        p = subprocess.Popen(["sh", "-c", code], env=parent_environ,
+                             stdout=subprocess.PIPE, universal_newlines=True)
+        out, _ = p.communicate()
+
+        self.assertEqual(
+            out.strip().split('|'),
+            [expected["A"], expected["B"], expected["C"], "unset", expected["E"]])
+
+    def test_apply_path_changes(self):
+        """Test that path changes are applied in order to sys.path."""
+        with restore_os_environ(), restore_sys_path():
+            os.environ.pop("PYTHONPATH", None)
+
+            interp = Python(target_environ=os.environ)
+            ex = RexExecutor(interpreter=interp, parent_variables=[],
+                             shebang=False)
+            ex.env.PYTHONPATH.append("/a")  # first reference sets the var
+            ex.env.PYTHONPATH.append("/b")
+            ex.env.PYTHONPATH.prepend("/c")
+            interp.apply_environ()
+
+            pythonpath = os.environ["PYTHONPATH"]
+            sys_path = list(sys.path)
+
+        self.assertEqual(pythonpath, os.pathsep.join(["/c", "/a", "/b"]))
+        self.assertEqual(sys_path, ["/c", "/a", "/b"])
+
 
 if __name__ == '__main__':
     unittest.main()
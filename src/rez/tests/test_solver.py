@@ -6,6 +6,8 @@ from __future__ import print_function
 from rez.vendor.version.requirement import Requirement
 from rez.solver import Solver, Cycle, SolverStatus
 from rez.config import config
+from rez.utils.tracing import Tracer
+from rez.utils import json
 import unittest
 from rez.tests.util import TestBase
 import itertools
@@ -244,6 +246,35 @@ class TestSolver(TestBase):
                      "test_variant_split_mid2-2.0[0]",
                      "test_variant_split_start-1.0[1]"])
 
+    def test_12_tracing(self):
+        """Test that solver events are recorded to a tracer."""
+        tracer = Tracer()
+        reqs = [Requirement(x) for x in ("pybah", "!python-2.5")]
+        s = Solver(reqs, self.packages_path, tracer=tracer)
+        s.solve()
+        self.assertEqual(s.status, SolverStatus.solved)
+
+        names = set((x["cat"], x["name"]) for x in tracer.events)
+        self.assertIn(("solver", "solve"), names)
+        self.assertIn(("solver", "solve_step"), names)
+        self.assertIn(("phase", "extract"), names)
+        self.assertIn(("scope", "intersect"), names)
+        self.assertIn(("package", "load_family"), names)
+
+        # export must be json compatible
+        data = json.loads(json.dumps(tracer.to_dict()))
+        self.assertEqual(len(data["traceEvents"]), len(tracer.events) + 1)
+
+        tracer = Tracer()
+        reqs = [Requirement(x) for x in ("pyfoo-3.1", "python-2.7+")]
+        s = Solver(reqs, self.packages_path, tracer=tracer)
+        s.solve()
+        self.assertEqual(s.status, SolverStatus.failed)
+
+        fails = [x for x in tracer.events if x["name"] == "fail"]
+        self.assertTrue(fails)
+        self.assertEqual(fails[-1]["args"]["reason"], s.failure_reason())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -137,6 +137,36 @@ class TestRezSuites(TestBase, TempdirMixin):
 
         self._test_serialization(s)
 
+    def test_tools_index(self):
+        """Test that saved suites read tools without loading contexts."""
+        c_foo = ResolvedContext(["foo"])
+        c_bah = ResolvedContext(["bah"])
+        s = Suite()
+        s.add_context("foo", c_foo)
+        s.add_context("bah", c_bah)
+        s.add_context("bah2", c_bah)
+        s.hide_tool("foo", "fooer")
+
+        path = os.path.join(self.root, uuid.uuid4().hex)
+        s.save(path)
+        self.assertTrue(os.path.isfile(os.path.join(path, "tools.json")))
+
+        s2 = Suite.load(path)
+        self.assertEqual(s2.get_tools(), s.get_tools())
+        self.assertEqual(s2.get_hidden_tools(), s.get_hidden_tools())
+        self.assertEqual(set(s2.get_conflicting_aliases()),
+                         set(s.get_conflicting_aliases()))
+        self.assertFalse(any("context" in x for x in s2.contexts.values()))
+
+        # a stale index is ignored
+        context_path = s2._context_path("bah2")
+        st = os.stat(context_path)
+        os.utime(context_path, (st.st_atime, st.st_mtime + 10))
+
+        s3 = Suite.load(path)
+        self.assertEqual(s3.get_tools(), s.get_tools())
+        self.assertTrue(all("context" in x for x in s3.contexts.values()))
+
     @per_available_shell()
     @install_dependent()
     def test_executable(self):
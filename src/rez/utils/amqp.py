@@ -1,11 +1,26 @@
+"""
+Publish AMQP messages, as used by context tracking and the amqp release hook.
+
+Messages are published over one persistent connection per broker. Messages
+that are published asynchronously are sent in batches by a background thread,
+which reconnects with increasing delays while the broker is unavailable.
+
+Messages that have not been sent when the process exits are written to an
+on-disk spool (see `config.amqp_spool_path`), and are sent by the next process
+that connects to the same broker.
+"""
+from __future__ import print_function
+
 import atexit
-import socket
+from hashlib import sha1
+import os
+import os.path
 import time
 import threading
 
 from rez.utils import json
 from rez.utils.data_utils import remove_nones
-from rez.utils.logging_ import print_error
+from rez.utils.logging_ import print_error, print_debug
 from rez.vendor.amqp import Connection, basic_message
 from rez.vendor.six.six.moves import queue
 
@@ -14,6 +29,16 @@ _lock = threading.Lock()
 _queue = queue.Queue()
 _thread = None
 _num_pending = 0
+_sending = False
+_unsent = []
+_publishers = {}
+
+# maximum number of messages that are sent at once
+max_batch_size = 100
+
+# bounds of the delay between connection attempts, in seconds
+min_retry_delay = 0.5
+max_retry_delay = 60
 
 
 def publish_message(host, amqp_settings, routing_key, data, block=True):
@@ -25,15 +50,21 @@ def publish_message(host, amqp_settings, routing_key, data, block=True):
     global _thread
     global _num_pending
 
-    kwargs = {
-        "host": host,
-        "amqp_settings": amqp_settings,
-        "routing_key": routing_key,
-        "data": data
-    }
+    if host == "stdout":
+        print("Published to %s: %s" % (routing_key, data))
+        return True
+
+    publisher = _get_publisher(host, amqp_settings)
+
+    message = remove_nones(
+        exchange_name=amqp_settings["exchange_name"],
+        routing_key=routing_key,
+        data=data,
+        delivery_mode=amqp_settings.get("message_delivery_mode")
+    )
 
     if block:
-        return _publish_message(**kwargs)
+        return (publisher.publish([message], block=True) == 1)
 
     if _thread is None:
         with _lock:
@@ -45,78 +76,303 @@ def publish_message(host, amqp_settings, routing_key, data, block=True):
     with _lock:
         _num_pending += 1
 
-    _queue.put(kwargs)
+    _queue.put((publisher, message))
     return True
 
 
-def _publish_message(host, amqp_settings, routing_key, data):
-    """Publish an AMQP message.
-
-    Returns:
-        bool: True if message was sent successfully.
+class _Publisher(object):
+    """Publishes messages over a persistent connection to a broker.
     """
-    if host == "stdout":
-        print("Published to %s: %s" % (routing_key, data))
-        return True
-
-    try:
-        conn = Connection(**remove_nones(
+    def __init__(self, host, amqp_settings):
+        self.host = host
+        self.connection_kwargs = remove_nones(
             host=host,
             userid=amqp_settings.get("userid"),
             password=amqp_settings.get("password"),
             connect_timeout=amqp_settings.get("connect_timeout")
-        ))
-    except socket.error as e:
-        print_error("Cannot connect to the message broker: %s" % (e))
-        return False
+        )
 
-    channel = conn.channel()
+        self.lock = threading.Lock()
+        self.conn = None
+        self.channel = None
+        self.retry_delay = 0
+        self.retry_time = 0
 
-    # build the message
-    msg = basic_message.Message(**remove_nones(
-        body=json.dumps(data),
-        delivery_mode=amqp_settings.get("message_delivery_mode"),
-        content_type="application/json",
-        content_encoding="utf-8"
-    ))
+    @property
+    def connected(self):
+        return (self.conn is not None)
 
-    # publish the message
-    try:
-        channel.basic_publish(
-            msg,
-            amqp_settings["exchange_name"],
-            routing_key
-        )
-    except Exception as e:
-        print_error("Failed to publish message: %s" % (e))
-        return False
-    finally:
-        conn.close()
+    def publish(self, messages, block=False):
+        """Publish messages, in order.
 
-    return True
+        Args:
+            messages (list of dict): Messages to publish.
+            block (bool): If True, connect to the broker even if a previous
+                connection attempt failed recently.
+
+        Returns:
+            int: Number of messages published. These are always the first
+            messages in `messages`.
+        """
+        num_sent = 0
+
+        with self.lock:
+            for attempt in range(2):
+                # the broker may have dropped an idle connection, in which
+                # case we reconnect straight away
+                was_connected = self.connected
+                force = (block or attempt > 0)
+
+                if not self._connect(force=force):
+                    break
+
+                num_sent += self._send(messages[num_sent:])
+                if num_sent == len(messages):
+                    break
+
+                if not was_connected:
+                    self._backoff()
+                    break
+
+        return num_sent
+
+    def _connect(self, force=False):
+        if self.connected:
+            return True
+
+        if not force and time.time() < self.retry_time:
+            return False
+
+        try:
+            self.conn = Connection(**self.connection_kwargs)
+            self.channel = self.conn.channel()
+        except Exception as e:
+            print_error("Cannot connect to the message broker: %s" % (e))
+            self._disconnect()
+            self._backoff()
+            return False
+
+        self.retry_delay = 0
+
+        # send messages that earlier processes failed to send
+        messages = _claim_spooled_messages(self.host)
+        if messages:
+            num_sent = self._send(messages)
+            if num_sent < len(messages):
+                _spool_messages(self.host, messages[num_sent:])
+                self._backoff()
+                return False
+
+        return True
+
+    def _send(self, messages):
+        for i, message in enumerate(messages):
+            msg = basic_message.Message(**remove_nones(
+                body=json.dumps(message["data"]),
+                delivery_mode=message.get("delivery_mode"),
+                content_type="application/json",
+                content_encoding="utf-8"
+            ))
+
+            try:
+                self.channel.basic_publish(
+                    msg,
+                    message["exchange_name"],
+                    message["routing_key"]
+                )
+            except Exception as e:
+                print_error("Failed to publish message: %s" % (e))
+                self._disconnect()
+                return i
+
+        return len(messages)
+
+    def _disconnect(self):
+        conn = self.conn
+        self.conn = None
+        self.channel = None
+
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _backoff(self):
+        self.retry_delay = min(max(self.retry_delay * 2, min_retry_delay),
+                               max_retry_delay)
+        self.retry_time = time.time() + self.retry_delay
+
+
+def _get_publisher(host, amqp_settings):
+    key = (
+        host,
+        amqp_settings.get("userid"),
+        amqp_settings.get("password"),
+        amqp_settings.get("connect_timeout")
+    )
+
+    with _lock:
+        publisher = _publishers.get(key)
+        if publisher is None:
+            publisher = _Publisher(host, amqp_settings)
+            _publishers[key] = publisher
+
+    return publisher
 
 
 def _publish_messages_async():
     global _num_pending
+    global _sending
 
     while True:
-        kwargs = _queue.get()
+        # wait for messages, unless sending previous messages failed
+        if not _unsent:
+            item = _queue.get()
+            with _lock:
+                _unsent.append(item)
+
+        with _lock:
+            while len(_unsent) < max_batch_size:
+                try:
+                    _unsent.append(_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            batch = list(_unsent)
+            _sending = True
+
+        # publish messages in order, per broker
+        batches = {}
+        for publisher, message in batch:
+            batches.setdefault(publisher, []).append(message)
+
+        unsent = []
+        for publisher, messages in batches.items():
+            num_sent = publisher.publish(messages)
+            unsent.extend((publisher, x) for x in messages[num_sent:])
+
+        with _lock:
+            _num_pending -= (len(batch) - len(unsent))
+            _unsent[:] = unsent
+            _sending = False
+
+        if unsent:
+            retry_time = min(x.retry_time for x, _ in unsent)
+            time.sleep(max(retry_time - time.time(), min_retry_delay))
+
+
+def _get_spool_path():
+    from rez.config import config  # avoiding circular import
+
+    path = config.amqp_spool_path
+    return os.path.expanduser(path) if path else None
+
+
+def _get_spool_prefix(host):
+    return sha1(host.encode("utf-8")).hexdigest() + '-'
+
+
+def _spool_messages(host, messages):
+    from rez.vendor.atomicwrites import atomic_write
+
+    path = _get_spool_path()
+    if not path:
+        return False
+
+    filename = "%s%d-%d.json" % (_get_spool_prefix(host), os.getpid(),
+                                 int(time.time() * 1000000))
+    filepath = os.path.join(path, filename)
+
+    try:
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+        with atomic_write(filepath, overwrite=True) as f:
+            f.write(json.dumps(messages))
+    except (IOError, OSError) as e:
+        print_debug("Failed to write AMQP spool file %s: %s"
+                    % (filepath, str(e)))
+        return False
+
+    return True
+
+
+def _claim_spooled_messages(host):
+    path = _get_spool_path()
+    if not path or not os.path.isdir(path):
+        return []
+
+    prefix = _get_spool_prefix(host)
+    messages = []
+
+    for name in sorted(os.listdir(path)):
+        if not (name.startswith(prefix) and name.endswith(".json")):
+            continue
+
+        # another process may be claiming the same file
+        filepath = os.path.join(path, name)
+        claimed_filepath = "%s.%d" % (filepath, os.getpid())
 
         try:
-            _publish_message(**kwargs)
-        finally:
-            with _lock:
-                _num_pending -= 1
+            os.rename(filepath, claimed_filepath)
+        except OSError:
+            continue
+
+        try:
+            with open(claimed_filepath) as f:
+                messages.extend(json.loads(f.read()))
+            os.remove(claimed_filepath)
+        except (IOError, OSError, ValueError) as e:
+            print_debug("Failed to read AMQP spool file %s: %s"
+                        % (claimed_filepath, str(e)))
+
+    return messages
 
 
 @atexit.register
 def on_exit():
+    global _num_pending
+
     # Give pending messages a chance to publish, otherwise a command like
-    # 'rez-env --output ...' could exit before the publish.
+    # 'rez-env --output ...' could exit before the publish. If messages can
+    # be spooled, don't wait for a broker that is failing to connect.
     #
+    spool = bool(_get_spool_path())
     t = time.time()
-    maxtime = 5
-    timeinc = 0.1
+    maxtime = 1 if spool else 5
+    timeinc = 0.01
 
     while _num_pending and (time.time() - t) < maxtime:
+        if spool and _unsent and not _sending and \
+                all(x.retry_delay for x, _ in _unsent):
+            break
         time.sleep(timeinc)
+
+    if not (spool and _num_pending):
+        return
+
+    # Messages that are being sent are left to the background thread,
+    # otherwise they could be sent again from the spool
+    #
+    with _lock:
+        if _sending:
+            pending = []
+        else:
+            pending = list(_unsent)
+            del _unsent[:]
+
+        while True:
+            try:
+                pending.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        _num_pending -= len(pending)
+
+    messages = {}
+    for publisher, message in pending:
+        messages.setdefault(publisher.host, []).append(message)
+
+    for host, messages_ in messages.items():
+        _spool_messages(host, messages_)
@@ -0,0 +1,239 @@
+"""
+Persistent index of package names, used for shell completion.
+
+Completing a package request (see `rez-complete`) means listing every family
+in every repository, and every package in the completed family. On a network
+filesystem this is too slow to do on every TAB press. This index stores, per
+repository, the family names and qualified package names (see
+`config.completion_index_path`).
+
+When a repository's modification time changes (a family was added or
+removed), the stale index is still used, and is refreshed by a background
+process. Versions of a family are validated against the family's last release
+time whenever that family is completed, which costs a single stat.
+"""
+import os
+import os.path
+import sys
+import time
+
+from rez.utils.filesystem import JsonFileCache
+from rez.utils.logging_ import print_debug
+
+
+class CompletionIndex(JsonFileCache):
+    """Completion index of package repositories.
+
+    An index looks like:
+
+        {
+            "time": 1600000000,           # mtime of the repository
+            "families": {
+                "foo": {
+                    "time": 1600000000,   # last release time of the family
+                    "packages": ["foo-1.0.0", "foo-1.1.0"]
+                }
+            }
+        }
+
+    Only repositories whose location is a directory on disk can be indexed.
+    """
+
+    path_setting = "completion_index_path"
+    description = "completion index"
+
+    # seconds after which a background refresh is assumed to have failed
+    refresh_timeout = 300
+
+    def get_family_names(self, path):
+        """Get the names of the package families in a repository.
+
+        Args:
+            path (str): Package repository path.
+
+        Returns:
+            List of str, or None if the repository cannot be indexed.
+        """
+        index = self._get_index(path)
+        if index is None:
+            return None
+
+        return list(index["families"].keys())
+
+    def get_qualified_names(self, path, name):
+        """Get the qualified names of the packages in a family.
+
+        If the family has changed since the index was written, its packages
+        are loaded again, and the index is updated.
+
+        Args:
+            path (str): Package repository path.
+            name (str): Package family name.
+
+        Returns:
+            List of str, or None if the repository cannot be indexed.
+        """
+        from rez.package_repository import package_repository_manager
+
+        index = self._get_index(path)
+        if index is None:
+            return None
+
+        repo = package_repository_manager.get_repository(path)
+        family = repo.get_package_family(name)
+        entry = index["families"].get(name)
+
+        if family is None:
+            return []
+
+        release_time = repo.get_last_release_time(family)
+        if entry is None or not release_time \
+                or entry.get("time") != release_time:
+            entry = self._get_entry(path, name, release_time)
+            index["families"][name] = entry
+            self._write(self._get_filepath(str(repo.uid)), index)
+
+        return entry["packages"]
+
+    def refresh(self, path):
+        """Bring the index of a repository up to date.
+
+        Families that have changed since the index was written are loaded
+        again.
+
+        Args:
+            path (str): Package repository path.
+
+        Returns:
+            dict: The index, or None if the repository cannot be indexed.
+        """
+        from rez.package_repository import package_repository_manager
+
+        repo = package_repository_manager.get_repository(path)
+        filepath = self._get_filepath(str(repo.uid))
+        repo_time = self._get_repository_time(repo)
+
+        if not filepath or repo_time is None:
+            return None
+
+        index = self._read(filepath)
+        entries = index.get("families", {})
+        families = {}
+
+        for family in repo.iter_package_families():
+            release_time = repo.get_last_release_time(family)
+            entry = entries.get(family.name)
+
+            if not release_time or entry is None \
+                    or entry.get("time") != release_time:
+                entry = self._get_entry(path, family.name, release_time)
+
+            families[family.name] = entry
+
+        index = {
+            "time": repo_time,
+            "families": families
+        }
+
+        self._write(filepath, index)
+
+        try:
+            os.remove(filepath + ".refresh")
+        except OSError:
+            pass
+
+        return index
+
+    def _get_index(self, path):
+        from rez.package_repository import package_repository_manager
+
+        repo = package_repository_manager.get_repository(path)
+        filepath = self._get_filepath(str(repo.uid))
+        repo_time = self._get_repository_time(repo)
+
+        if not filepath or repo_time is None:
+            return None
+
+        index = self._read(filepath)
+
+        # the first use of the index has to wait for it to be built
+        if not index:
+            return self.refresh(path)
+
+        if index.get("time") != repo_time:
+            self._refresh_in_background(path, filepath)
+
+        return index
+
+    def _refresh_in_background(self, path, filepath):
+        from rez.utils.execution import Popen
+
+        # don't start another refresh if one is already running
+        lockpath = filepath + ".refresh"
+        try:
+            if time.time() - os.path.getmtime(lockpath) < self.refresh_timeout:
+                return
+        except OSError:
+            pass
+
+        try:
+            with open(lockpath, 'w'):
+                pass
+
+            rez_path = os.path.dirname(os.path.dirname(
+                os.path.dirname(os.path.abspath(__file__))))
+
+            env = os.environ.copy()
+            env["PYTHONPATH"] = os.pathsep.join(
+                [rez_path] + env.get("PYTHONPATH", "").split(os.pathsep))
+
+            with open(os.devnull, "r+") as devnull:
+                Popen(
+                    [sys.executable, "-m", "rez.utils.completion_index", path],
+                    env=env,
+                    stdin=devnull,
+                    stdout=devnull,
+                    stderr=devnull,
+                    close_fds=(os.name == "posix")
+                )
+        except (IOError, OSError) as e:
+            print_debug("Failed to refresh completion index %s: %s"
+                        % (filepath, str(e)))
+
+    @classmethod
+    def _get_repository_time(cls, repo):
+        location = getattr(repo, "location", None)
+        if not location or not os.path.isdir(location):
+            return None
+
+        try:
+            return os.path.getmtime(location)
+        except OSError:
+            return None
+
+    @classmethod
+    def _get_entry(cls, path, name, release_time):
+        from rez.packages import iter_packages
+
+        it = iter_packages(name=name, paths=[path])
+        return {
+            "time": release_time,
+            "packages": sorted(x.qualified_name for x in it)
+        }
+
+    @classmethod
+    def _read(cls, filepath):
+        index = super(CompletionIndex, cls)._read(filepath)
+        if not isinstance(index.get("families"), dict):
+            return {}
+
+        return index
+
+
+# singleton
+completion_index = CompletionIndex()
+
+
+if __name__ == "__main__":
+    for path_ in sys.argv[1:]:
+        completion_index.refresh(path_)
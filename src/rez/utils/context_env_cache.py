@@ -0,0 +1,115 @@
+"""
+Persistent cache of the environment generated by resolved contexts.
+
+Interpreting a context runs the commands of every resolved package. The result
+depends only on the context, the target shell, the package cache state and the
+parent environment variables that the commands read, so it can be cached to
+disk (see `config.context_env_cache_path`) and reused when the same context is
+activated again.
+"""
+from rez.utils import json
+from rez.utils.filesystem import JsonFileCache
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # py2
+    from collections import Mapping
+
+
+class TrackedEnviron(Mapping):
+    """Read-only environ mapping that records which variables were read.
+
+    Variables that were read but are not present are recorded with a value of
+    None. If the environ is iterated over (so that the result may depend on
+    any variable), `all_keys_read` is set.
+    """
+    def __init__(self, environ):
+        self.environ = environ
+        self.reads = {}
+        self.all_keys_read = False
+
+    def __getitem__(self, key):
+        value = self.environ.get(key)
+        self.reads[key] = value
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __iter__(self):
+        self.all_keys_read = True
+        return iter(self.environ)
+
+    def __len__(self):
+        self.all_keys_read = True
+        return len(self.environ)
+
+
+class ContextEnvCache(JsonFileCache):
+    """A cache of context environments, stored as a json file per key.
+
+    A key identifies everything a context's environment depends on, other than
+    the parent environ. Each file holds the outputs generated for the same key
+    in different parent environments, along with the values of the parent
+    environ variables that were read when generating each output.
+    """
+    path_setting = "context_env_cache_path"
+    description = "context env cache"
+
+    max_entries = 8
+
+    def get(self, key, parent_environ):
+        """Get a cached output.
+
+        Args:
+            key (dict): Json-compatible data identifying the output.
+            parent_environ (dict): Environ the output is generated within.
+
+        Returns:
+            The cached output, or None if there is no matching entry.
+        """
+        filepath = self._get_filepath(key)
+        if not filepath:
+            return None
+
+        for entry in self._read(filepath, type_=list):
+            reads = entry.get("reads", {})
+            if all(parent_environ.get(k) == v for k, v in reads.items()):
+                return entry.get("output")
+
+        return None
+
+    def set(self, key, environ, output):
+        """Cache an output.
+
+        Args:
+            key (dict): Json-compatible data identifying the output.
+            environ (`TrackedEnviron`): Parent environ that the output was
+                generated within.
+            output: Json-compatible output.
+        """
+        filepath = self._get_filepath(key)
+        if not filepath or environ.all_keys_read:
+            return
+
+        entry = {"reads": environ.reads, "output": output}
+        try:
+            if json.loads(json.dumps(entry)) != entry:
+                return
+        except (TypeError, ValueError):
+            return
+
+        # replace the entry for this parent environ, keeping the others (which
+        # may have been added by other processes since the file was read)
+        entries = [x for x in self._read(filepath, type_=list)
+                   if x.get("reads") != environ.reads]
+        entries.insert(0, entry)
+        del entries[self.max_entries:]
+
+        self._write(filepath, entries)
+
+
+# singleton
+context_env_cache = ContextEnvCache()
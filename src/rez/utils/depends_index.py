@@ -0,0 +1,176 @@
+"""
+Persistent index of package requirements, used for reverse dependency lookups.
+
+Finding the packages that depend on a package (see `rez-depends`) means
+loading the latest package of every family in every repository. This index
+stores, per repository, the requirements of the latest package of each family
+(see `config.depends_index_path`). Each entry is validated against the
+family's last release time, so only families that have changed since the index
+was written are loaded again.
+"""
+import os
+import os.path
+
+from rez.utils.filesystem import JsonFileCache
+
+
+class DependsIndex(JsonFileCache):
+    """Reverse dependency index of package repositories.
+
+    An entry looks like:
+
+        {
+            "time": 1600000000,        # last release time of the family
+            "version": "1.2.0",        # latest version, None if no packages
+            "requires": ["foo"],       # names, from all variants
+            "build_requires": ["bah"],
+            "private_build_requires": [],
+            "plugin_for": [],
+            "has_plugins": False
+        }
+
+    Conflict requirements (such as '!foo') are not included.
+    """
+    path_setting = "depends_index_path"
+    description = "depends index"
+
+    def get_families(self, path, refresh=True):
+        """Get the index entries of every family in a repository.
+
+        Args:
+            path (str): Package repository path.
+            refresh (bool): If True, families that have changed since the
+                index was written are loaded again, and the index is updated.
+
+        Returns:
+            dict: Family name -> entry.
+        """
+        from rez.package_repository import package_repository_manager
+        from rez.util import ProgressBar
+
+        repo = package_repository_manager.get_repository(path)
+        filepath = self._get_filepath(str(repo.uid))
+        index = self._read(filepath) if filepath else {}
+
+        if not refresh:
+            return index
+
+        # find new and changed families
+        stale = []
+        families = {}
+
+        for family in repo.iter_package_families():
+            release_time = repo.get_last_release_time(family)
+            families[family.name] = release_time
+
+            entry = index.get(family.name)
+            if not release_time or entry is None \
+                    or entry.get("time") != release_time:
+                stale.append(family.name)
+
+        removed = set(index.keys()) - set(families.keys())
+        if not (stale or removed):
+            return index
+
+        for name in removed:
+            del index[name]
+
+        bar = ProgressBar("Indexing", len(stale))
+        for name in stale:
+            index[name] = self._get_entry(path, name, families[name])
+            bar.next()
+        bar.finish()
+
+        if filepath:
+            self._write(filepath, index)
+
+        return index
+
+    def update_family(self, path, name):
+        """Update the index entry of a package family.
+
+        This is done when a package is installed or removed. It has no effect
+        if the index of the repository does not exist yet.
+
+        Args:
+            path (str): Package repository path.
+            name (str): Package family name.
+        """
+        from rez.package_repository import package_repository_manager
+
+        repo = package_repository_manager.get_repository(path)
+        filepath = self._get_filepath(str(repo.uid))
+        if not filepath or not os.path.exists(filepath):
+            return
+
+        index = self._read(filepath)
+        family = repo.get_package_family(name)
+
+        if family is None:
+            index.pop(name, None)
+        else:
+            release_time = repo.get_last_release_time(family)
+            index[name] = self._get_entry(path, name, release_time)
+
+        self._write(filepath, index)
+
+    def rebuild(self, path):
+        """Rebuild the index of a repository from scratch.
+
+        Args:
+            path (str): Package repository path.
+
+        Returns:
+            int: Number of families in the index.
+        """
+        from rez.package_repository import package_repository_manager
+
+        repo = package_repository_manager.get_repository(path)
+        filepath = self._get_filepath(str(repo.uid))
+        if filepath and os.path.exists(filepath):
+            os.remove(filepath)
+
+        return len(self.get_families(path))
+
+    @classmethod
+    def _get_entry(cls, path, name, release_time):
+        from rez.packages import iter_packages
+
+        entry = {
+            "time": release_time,
+            "version": None,
+            "requires": [],
+            "build_requires": [],
+            "private_build_requires": [],
+            "plugin_for": [],
+            "has_plugins": False
+        }
+
+        packages = list(iter_packages(name=name, paths=[path]))
+        if not packages:
+            return entry
+
+        pkg = max(packages, key=lambda x: x.version)
+
+        def _names(requires):
+            names = set(x.name for x in (requires or []) if not x.conflict)
+            return sorted(names)
+
+        requires = []
+        for variant in pkg.iter_variants():
+            requires += variant.get_requires()
+
+        entry.update({
+            "version": str(pkg.version),
+            "requires": _names(requires),
+            "build_requires": _names(pkg.build_requires),
+            "private_build_requires": _names(pkg.private_build_requires),
+            "plugin_for": list(pkg.plugin_for or []),
+            "has_plugins": bool(pkg.has_plugins)
+        })
+
+        return entry
+
+
+# singleton
+depends_index = DependsIndex()
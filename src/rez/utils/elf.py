@@ -1,6 +1,7 @@
 """
 Functions that wrap readelf/patchelf utils on linux.
 """
+from contextlib import contextmanager
 import os
 import pipes
 import subprocess
@@ -19,20 +20,66 @@ def get_rpaths(elfpath):
 
     # parse out rpath/runpath
     for line in out.split('\n'):
-        parts = line.strip().split()
-        if "(RPATH)" in parts or "(RUNPATH)" in parts:
-            txt = parts[-1]
-            txt = txt[1:-1]  # strip [ and ]
-            rpaths = txt.split(':')
-
-            return rpaths or []
+        rpaths = _parse_rpaths(line)
+        if rpaths is not None:
+            return rpaths
 
     return []
 
 
+def get_rpaths_batch(elfpaths):
+    """Get rpaths/runpaths from the headers of several files.
+
+    This runs readelf once for all the files. Files that are not elfs (or that
+    cannot be read) are not present in the result.
+
+    Returns:
+        2-tuple:
+            dict: Filepath -> list of rpaths;
+            List of str: Errors for files that could not be read, other than
+                files that are not elfs (such as executable scripts).
+    """
+    if len(elfpaths) == 1:
+        try:
+            return {elfpaths[0]: get_rpaths(elfpaths[0])}, []
+        except RuntimeError as e:
+            return {}, _filter_errors([str(e)])
+
+    # readelf exits with an error if any file is not an elf. Its output
+    # contains a 'File: {path}' header for each file it could read, and it
+    # writes a line to stderr for each file it could not.
+    #
+    _, out, err = _communicate("readelf", "-d", *elfpaths)
+
+    result = {}
+    elfpath = None
+
+    for line in out.split('\n'):
+        if line.startswith("File: "):
+            elfpath = line[len("File: "):]
+            result[elfpath] = []
+            continue
+
+        if elfpath is not None:
+            rpaths = _parse_rpaths(line)
+            if rpaths is not None:
+                result[elfpath] = rpaths
+
+    return result, _filter_errors(err.strip().split('\n'))
+
+
 def patch_rpaths(elfpath, rpaths):
     """Replace an elf's rpath header with those provided.
     """
+    patch_rpaths_batch([elfpath], rpaths)
+
+
+def patch_rpaths_batch(elfpaths, rpaths):
+    """Replace the rpath header of several elfs with those provided.
+
+    This runs patchelf once for all the files. Note that older versions of
+    patchelf only accept a single file.
+    """
 
     # this is a hack to get around https://github.com/nerdvegas/rez/issues/1074
     # I actually hit a case where patchelf was installed as a rez suite tool,
@@ -42,29 +89,73 @@ def patch_rpaths(elfpath, rpaths):
     env = os.environ.copy()
     env["ORIGIN"] = "$ORIGIN"
 
-    with make_path_writable(elfpath):
+    with _make_paths_writable(elfpaths):
         if rpaths:
-            _run("patchelf", "--set-rpath", ':'.join(rpaths), elfpath, env=env)
+            _run("patchelf", "--set-rpath", ':'.join(rpaths), *elfpaths,
+                 env=env)
         else:
-            _run("patchelf", "--remove-rpath")
+            _run("patchelf", "--remove-rpath", *elfpaths)
 
 
-def _run(*nargs, **popen_kwargs):
-    proc = subprocess.Popen(
-        nargs,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        **popen_kwargs
-    )
+def _filter_errors(errors):
+    # there can be lots of false positives (not an elf) due to executable
+    # shebanged scripts. Ignore these.
+    #
+    return [
+        x for x in errors
+        if x and "Not an ELF file" not in x
+        and "Failed to read file header" not in x
+    ]
 
-    out, err = proc.communicate()
 
-    if proc.returncode:
+def _parse_rpaths(line):
+    # lines look like:
+    # 0x000000000000000f (RPATH) Library rpath: [/xxx:/yyy]
+    #
+    parts = line.strip().split()
+    if "(RPATH)" in parts or "(RUNPATH)" in parts:
+        txt = parts[-1]
+        txt = txt[1:-1]  # strip [ and ]
+        rpaths = txt.split(':')
+
+        return rpaths or []
+
+    return None
+
+
+@contextmanager
+def _make_paths_writable(paths):
+    if not paths:
+        yield
+        return
+
+    with make_path_writable(paths[0]):
+        with _make_paths_writable(paths[1:]):
+            yield
+
+
+def _run(*nargs, **popen_kwargs):
+    returncode, out, err = _communicate(*nargs, **popen_kwargs)
+
+    if returncode:
         cmd_ = ' '.join(pipes.quote(x) for x in nargs)
 
         raise RuntimeError(
             "Command %s - failed with exitcode %d: %s"
-            % (cmd_, proc.returncode, err.strip().replace('\n', "\\n"))
+            % (cmd_, returncode, err.strip().replace('\n', "\\n"))
         )
 
     return out
+
+
+def _communicate(*nargs, **popen_kwargs):
+    proc = subprocess.Popen(
+        nargs,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        **popen_kwargs
+    )
+
+    out, err = proc.communicate()
+    return proc.returncode, out, err
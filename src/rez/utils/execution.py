@@ -3,7 +3,6 @@ Utilities related to process/script execution.
 """
 
 from rez.vendor.six import six
-from rez.utils.yaml import dump_yaml
 from rez.vendor.enum import Enum
 from contextlib import contextmanager
 from io import UnsupportedOperation
@@ -255,5 +254,7 @@ def create_forwarding_script(filepath, module, func_name, *nargs, **kwargs):
     if kwargs:
         doc["kwargs"] = kwargs
 
+    from rez.utils.yaml import dump_yaml
+
     body = dump_yaml(doc)
     create_executable_script(filepath, body, "_rez_fwd")
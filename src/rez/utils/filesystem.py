@@ -7,6 +7,7 @@ from threading import Lock
 from tempfile import mkdtemp
 from contextlib import contextmanager
 from uuid import uuid4
+from hashlib import sha1
 import errno
 import weakref
 import atexit
@@ -20,6 +21,8 @@ import stat
 import platform
 
 from rez.vendor.six import six
+from rez.utils import json
+from rez.utils.logging_ import print_debug
 from rez.utils.platform_ import platform_
 
 
@@ -115,6 +118,41 @@ def make_path_writable(path):
             os.chmod(path, orig_mode)
 
 
+# see `make_shared_path_writable`
+_writable_paths = {}
+_writable_paths_lock = Lock()
+
+
+@contextmanager
+def make_shared_path_writable(path):
+    """Temporarily make `path` writable, if possible.
+
+    Unlike `make_path_writable`, this can be used on the same path by several
+    threads at once. The path is made writable by the first thread, and its
+    mode is restored by the last.
+
+    Args:
+        path (str): Path to make temporarily writable
+    """
+    with _writable_paths_lock:
+        entry = _writable_paths.get(path)
+        if entry is None:
+            ctxt = make_path_writable(path)
+            ctxt.__enter__()
+            entry = _writable_paths[path] = [ctxt, 0]
+
+        entry[1] += 1
+
+    try:
+        yield
+    finally:
+        with _writable_paths_lock:
+            entry[1] -= 1
+            if not entry[1]:
+                del _writable_paths[path]
+                entry[0].__exit__(None, None, None)
+
+
 @contextmanager
 def retain_cwd():
     """Context manager that keeps cwd unchanged afterwards.
@@ -201,6 +239,102 @@ def safe_remove(path):
             raise
 
 
+def read_json_file(filepath, type_=dict):
+    """Read a json file, such as a cache written by `write_json_file`.
+
+    Args:
+        filepath (str): File to read.
+        type_ (type): Expected type of the file's content.
+
+    Returns:
+        The file's content, or an empty `type_` instance if the file is
+        missing, cannot be read, or does not contain a `type_` instance.
+    """
+    try:
+        with open(filepath) as f:
+            data = json.loads(f.read())
+    except (IOError, OSError, ValueError):
+        return type_()
+
+    return data if isinstance(data, type_) else type_()
+
+
+def write_json_file(filepath, data, description="file", **kwargs):
+    """Atomically write a json file, such as a cache.
+
+    The parent directory is created if necessary. Failure to write the file
+    is not an error, it is only reported as a debug message.
+
+    Args:
+        filepath (str): File to write.
+        data: Json-compatible data.
+        description (str): Description of the file, for the debug message.
+        kwargs: Passed to `json.dumps`.
+    """
+    from rez.vendor.atomicwrites import atomic_write
+
+    try:
+        safe_makedirs(os.path.dirname(filepath))
+
+        with atomic_write(filepath, overwrite=True) as f:
+            f.write(json.dumps(data, **kwargs))
+    except (IOError, OSError) as e:
+        print_debug("Failed to write %s %s: %s"
+                    % (description, filepath, str(e)))
+
+
+def get_json_cache_filename(key):
+    """Get the name of a json cache file identified by `key` and the rez
+    version.
+
+    Args:
+        key: Json-compatible data.
+
+    Returns:
+        str: File name.
+    """
+    from rez import __version__
+
+    data = json.dumps([__version__, key], sort_keys=True)
+    return sha1(data.encode("utf-8")).hexdigest() + ".json"
+
+
+class JsonFileCache(object):
+    """Base class of caches that store a json file per key, in the directory
+    given by a config setting.
+
+    Subclasses set `path_setting` to the name of that setting, and
+    `description` to a description of the cache used in debug messages.
+    """
+    path_setting = None
+    description = "cache"
+
+    @property
+    def enabled(self):
+        return bool(self.path)
+
+    @property
+    def path(self):
+        from rez.config import config  # avoiding circular import
+
+        path = getattr(config, self.path_setting)
+        return os.path.expanduser(path) if path else None
+
+    def _get_filepath(self, key):
+        path = self.path
+        if not path:
+            return None
+
+        return os.path.join(path, get_json_cache_filename(key))
+
+    @classmethod
+    def _read(cls, filepath, type_=dict):
+        return read_json_file(filepath, type_=type_)
+
+    def _write(self, filepath, data):
+        write_json_file(filepath, data, description=self.description)
+
+
 def forceful_rmtree(path):
     """Like shutil.rmtree, but may change permissions.
 
@@ -245,7 +379,7 @@ def replacing_symlink(source, link_name):
         replace_file_or_dir(link_name, tmp_link_name)
 
 
-def replacing_copy(src, dest, follow_symlinks=False):
+def replacing_copy(src, dest, follow_symlinks=False, copy_function=None):
     """Perform copy that overwrites any existing target.
 
     Will copy/copytree `src` to `dest`, and will remove `dest` if it exists,
@@ -254,6 +388,9 @@ def replacing_copy(src, dest, follow_symlinks=False):
     If `follow_symlinks` is False, symlinks are preserved, otherwise their
     contents are copied.
 
+    If `copy_function` is given, it is used to copy each file, in place of
+    `shutil.copy2`.
+
     Note that this behavior is different to `shutil.copy`, which copies src
     into dest if dest is an existing dir.
     """
@@ -264,10 +401,14 @@ def replacing_copy(src, dest, follow_symlinks=False):
             os.symlink(src_, tmp_dest)
         elif os.path.isdir(src):
             # copy a dir
-            shutil.copytree(src, tmp_dest, symlinks=(not follow_symlinks))
+            if copy_function:
+                copytree(src, tmp_dest, symlinks=(not follow_symlinks),
+                         copy_function=copy_function)
+            else:
+                shutil.copytree(src, tmp_dest, symlinks=(not follow_symlinks))
         else:
             # copy a file
-            shutil.copy2(src, tmp_dest)
+            (copy_function or shutil.copy2)(src, tmp_dest)
 
         replace_file_or_dir(dest, tmp_dest)
 
@@ -411,8 +552,9 @@ def copy_or_replace(src, dst):
             shutil.move(dst_temp, dst)
 
 
-def copytree(src, dst, symlinks=False, ignore=None, hardlinks=False):
-    '''copytree that supports hard-linking
+def copytree(src, dst, symlinks=False, ignore=None, hardlinks=False,
+             copy_function=None):
+    '''copytree that supports hard-linking, and a custom file copy function
     '''
     names = os.listdir(src)
     if ignore is not None:
@@ -420,7 +562,9 @@ def copytree(src, dst, symlinks=False, ignore=None, hardlinks=False):
     else:
         ignored_names = set()
 
-    if hardlinks:
+    if copy_function:
+        copy = copy_function
+    elif hardlinks:
         def copy(srcname, dstname):
             try:
                 # try hard-linking first
@@ -444,7 +588,8 @@ def copytree(src, dst, symlinks=False, ignore=None, hardlinks=False):
                 linkto = os.readlink(srcname)
                 os.symlink(linkto, dstname)
             elif os.path.isdir(srcname):
-                copytree(srcname, dstname, symlinks, ignore)
+                copytree(srcname, dstname, symlinks, ignore,
+                         hardlinks=hardlinks, copy_function=copy_function)
             else:
                 copy(srcname, dstname)
         # XXX What about devices, sockets etc.?
@@ -465,6 +610,60 @@ def copytree(src, dst, symlinks=False, ignore=None, hardlinks=False):
         raise shutil.Error(errors)
 
 
+def link_file(src, dest, link_mode=None):
+    """Copy a file, linking it instead where possible.
+
+    Args:
+        src (str): File to copy.
+        dest (str): Path to copy to. Must not exist.
+        link_mode (str): One of:
+            - "hardlink": Hardlink `dest` to `src`. Note that the files then
+              share their contents and permissions - a change to one is a
+              change to the other;
+            - "reflink": Make `dest` a copy-on-write clone of `src`. This is
+              only supported on some linux filesystems (such as btrfs and
+              xfs);
+            - None: Copy the file.
+            If linking is not possible, the file is copied.
+    """
+    if link_mode == "hardlink":
+        try:
+            os.link(src, dest)
+            return
+        except OSError:
+            pass
+
+    elif link_mode == "reflink":
+        if _reflink_file(src, dest):
+            return
+
+    shutil.copy2(src, dest)
+
+
+# ioctl request that clones a file, see 'man ioctl_ficlone'
+_FICLONE = 0x40049409
+
+
+def _reflink_file(src, dest):
+    if platform_.name != "linux":
+        return False
+
+    import fcntl
+
+    try:
+        with open(src, "rb") as fsrc:
+            with open(dest, "wb") as fdest:
+                fcntl.ioctl(fdest.fileno(), _FICLONE, fsrc.fileno())
+
+        shutil.copystat(src, dest)
+        return True
+
+    except (IOError, OSError):
+        if os.path.exists(dest):
+            os.remove(dest)
+        return False
+
+
 def movetree(src, dst):
     """Attempts a move, and falls back to a copy+delete if this fails
     """
@@ -8,11 +8,9 @@ import sys
 import tempfile
 from ast import literal_eval
 from rez.config import config
-from rez.vendor.pydot import pydot
 from rez.utils.execution import Popen
 from rez.utils.formatting import PackageRequest
 from rez.exceptions import PackageRequestError
-from rez.vendor.pygraph.readwrite.dot import read as read_dot
 from rez.vendor.pygraph.algorithms.accessibility import accessibility
 from rez.vendor.pygraph.classes.digraph import digraph
 from rez.vendor.six import six
@@ -29,6 +27,7 @@ def read_graph_from_string(txt):
         `pygraph.digraph`: Graph object.
     """
     if not txt.startswith('{'):
+        from rez.vendor.pygraph.readwrite.dot import read as read_dot
         return read_dot(txt)  # standard dot format
 
     def conv(value):
@@ -165,6 +164,8 @@ def prune_graph(graph_str, package_name):
     Returns:
         Pruned graph, as a string.
     """
+    from rez.vendor.pygraph.readwrite.dot import read as read_dot
+
     # find nodes of interest
     g = read_dot(graph_str)
     nodes = set()
@@ -215,6 +216,8 @@ def save_graph(graph_str, dest_file, fmt=None, image_ratio=None):
         String representing format that was written, such as 'png'.
     """
 
+    from rez.vendor.pydot import pydot
+
     # Disconnected edges can result in multiple graphs. We should never see
     # this - it's a bug in graph generation if we do.
     #
@@ -0,0 +1,100 @@
+"""
+Persistent cache of facts about the current host.
+
+Some host facts, such as the operating system name or a shell's standard
+system paths, can only be determined by spawning subprocesses. These facts
+rarely change, so they can be cached to disk and shared by every rez process
+on the host (see `config.host_facts_cache_path`).
+"""
+import socket
+import os
+import os.path
+
+from rez import __version__
+
+
+class HostFactsCache(object):
+    """A cache of host facts, stored in a json file per host and rez version.
+
+    Each fact can be associated with a list of files it was derived from (for
+    example '/etc/os-release'). A cached fact is discarded if the modification
+    time of any of these files changes.
+    """
+    def __init__(self):
+        self._filepath = None
+        self._facts = {}
+
+    def get(self, key, func, filepaths=None):
+        """Get a host fact, computing and caching it if necessary.
+
+        Args:
+            key (str): Name of the fact, eg 'os'.
+            func (callable): Function that determines the fact. The returned
+                value must be json-compatible.
+            filepaths (list of str): Files the fact is derived from.
+
+        Returns:
+            The value of the fact.
+        """
+        filepath = self.filepath
+        if not filepath:
+            return func()
+
+        if filepath != self._filepath:
+            self._filepath = filepath
+            self._facts = self._read(filepath)
+
+        stamps = [[x, self._mtime(x)] for x in (filepaths or [])]
+
+        entry = self._facts.get(key)
+        if entry and entry.get("stamps") == stamps:
+            return entry["value"]
+
+        value = func()
+        self._facts[key] = {"value": value, "stamps": stamps}
+        self._write(filepath)
+        return value
+
+    @property
+    def filepath(self):
+        from rez.config import config  # avoiding circular import
+
+        path = config.host_facts_cache_path
+        if not path:
+            return None
+
+        filename = "%s-%s.json" % (socket.gethostname(), __version__)
+        return os.path.join(os.path.expanduser(path), filename)
+
+    def clear(self):
+        """Clear facts cached in memory."""
+        self._filepath = None
+        self._facts = {}
+
+    @classmethod
+    def _mtime(cls, filepath):
+        try:
+            return os.stat(filepath).st_mtime
+        except OSError:
+            return None
+
+    @classmethod
+    def _read(cls, filepath):
+        from rez.utils.filesystem import read_json_file  # avoiding circular import
+
+        return read_json_file(filepath)
+
+    def _write(self, filepath):
+        from rez.utils.filesystem import write_json_file
+
+        # merge with facts written by other processes in the meantime
+        facts = self._read(filepath)
+        facts.update(self._facts)
+        self._facts = facts
+
+        write_json_file(filepath, facts, description="host facts cache",
+                        indent=2)
+
+
+# singleton
+host_facts = HostFactsCache()
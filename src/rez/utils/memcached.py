@@ -1,8 +1,6 @@
 from __future__ import print_function
 
 from rez.config import config
-from rez.vendor.memcache.memcache import Client as Client_, \
-    SERVER_MAX_KEY_LENGTH, __version__ as memcache_client_version
 from rez.utils import py23
 from threading import local
 from contextlib import contextmanager
@@ -65,6 +63,7 @@ class Client(object):
             `memcache.Client` instance.
         """
         if self._client is None:
+            from rez.vendor.memcache.memcache import Client as Client_
             self._client = Client_(self.servers)
         return self._client
 
@@ -74,6 +73,8 @@ class Client(object):
         Returns:
             set: URIs of servers that are responding.
         """
+        from rez.vendor.memcache.memcache import Client as Client_
+
         responders = set()
         for server in self.servers:
             client = Client_([server])
@@ -174,6 +175,9 @@ class Client(object):
         * we're shielded from potential compatibility bugs in newer versions of
           python-memcached
         """
+        from rez.vendor.memcache.memcache import \
+            __version__ as memcache_client_version
+
         return "%s:%s:%s:%s" % (
             memcache_client_version,
             cache_interface_version,
@@ -191,6 +195,8 @@ class Client(object):
     @classmethod
     def _debug_key_hash(cls, key):
         import re
+        from rez.vendor.memcache.memcache import SERVER_MAX_KEY_LENGTH
+
         h = cls._key_hash(key)[:16]
         value = "%s:%s" % (h, key)
         value = value[:SERVER_MAX_KEY_LENGTH]
@@ -0,0 +1,105 @@
+"""
+Run functions over a sequence of items in a pool of threads.
+
+This is used for work that is bound by filesystem or network latency (such as
+scanning package repositories), where threads give a substantial speedup
+despite the GIL.
+"""
+import multiprocessing
+import sys
+import threading
+
+from rez.vendor.six import six
+from rez.vendor.six.six.moves import queue
+
+
+def get_default_max_workers():
+    """Get the default number of worker threads.
+
+    Returns:
+        int: Number of threads, this is the same default as python-3's
+        `concurrent.futures.ThreadPoolExecutor`.
+    """
+    try:
+        num_cpus = multiprocessing.cpu_count()
+    except NotImplementedError:
+        num_cpus = 1
+
+    return min(32, num_cpus + 4)
+
+
+def iter_parallel(func, items, max_workers=None, ordered=True):
+    """Call a function on each item, in a pool of threads.
+
+    Results are yielded as soon as they are available. If `func` raises an
+    exception, it is raised in the caller, and no further items are started.
+    Items that are already in progress are completed in the background.
+
+    Args:
+        func (callable): Function that takes a single item.
+        items (iterable): Items to call `func` on.
+        max_workers (int): Maximum number of threads. If None, see
+            `get_default_max_workers`. If 1, items are processed serially in
+            the calling thread.
+        ordered (bool): If True, results are yielded in the same order as
+            `items`. If False, they are yielded in order of completion.
+
+    Yields:
+        2-tuple: Item, and the result of `func` on that item.
+    """
+    items = list(items)
+
+    if max_workers is None:
+        max_workers = get_default_max_workers()
+
+    num_workers = min(max_workers, len(items))
+
+    if num_workers <= 1:
+        for item in items:
+            yield item, func(item)
+        return
+
+    in_queue = queue.Queue()
+    out_queue = queue.Queue()
+    stopped = threading.Event()
+
+    for i, item in enumerate(items):
+        in_queue.put((i, item))
+
+    def _worker():
+        while not stopped.is_set():
+            try:
+                i, item = in_queue.get_nowait()
+            except queue.Empty:
+                return
+
+            try:
+                out_queue.put((i, item, func(item), None))
+            except:
+                out_queue.put((i, item, None, sys.exc_info()))
+
+    for _ in range(num_workers):
+        th = threading.Thread(target=_worker)
+        th.daemon = True
+        th.start()
+
+    pending = {}
+    next_index = 0
+
+    try:
+        for _ in range(len(items)):
+            i, item, result, exc_info = out_queue.get()
+
+            if exc_info:
+                six.reraise(*exc_info)
+
+            if not ordered:
+                yield item, result
+                continue
+
+            pending[i] = (item, result)
+            while next_index in pending:
+                yield pending.pop(next_index)
+                next_index += 1
+    finally:
+        stopped.set()
@@ -8,6 +8,7 @@ from rez.util import which
 from rez.utils.execution import Popen
 from rez.utils.data_utils import cached_property
 from rez.utils.platform_mapped import platform_mapped
+from rez.utils.host_facts import host_facts
 from rez.exceptions import RezSystemError
 from tempfile import gettempdir
 
@@ -17,6 +18,10 @@ class Platform(object):
     """
     name = None
 
+    # files that the os name is derived from. If not empty, the os name is
+    # stored in the host facts cache, and refreshed when these files change
+    os_filepaths = []
+
     def __init__(self):
         pass
 
@@ -30,6 +35,8 @@ class Platform(object):
     @platform_mapped
     def os(self):
         """Returns the name of the operating system."""
+        if self.os_filepaths:
+            return host_facts.get("os", self._os, self.os_filepaths)
         return self._os()
 
     @cached_property
@@ -180,6 +187,7 @@ class _UnixPlatform(Platform):
 
 class LinuxPlatform(_UnixPlatform):
     name = "linux"
+    os_filepaths = ["/etc/lsb-release", "/etc/os-release"]
 
     def _os(self):
         """
@@ -407,6 +415,7 @@ class LinuxPlatform(_UnixPlatform):
 
 class OSXPlatform(_UnixPlatform):
     name = "osx"
+    os_filepaths = ["/System/Library/CoreServices/SystemVersion.plist"]
 
     def _os(self):
         release = platform.mac_ver()[0]
@@ -6,7 +6,10 @@ from inspect import getsourcelines
 from textwrap import dedent
 from glob import glob
 import traceback
+import platform
+import marshal
 import os.path
+import sys
 
 
 def early():
@@ -190,7 +193,7 @@ class SourceCode(object):
     @cached_property
     def compiled(self):
         try:
-            pyc = compile(self.evaluated_code, self.sourcename, 'exec')
+            pyc = compiled_code_cache.compile(self.evaluated_code, self.sourcename)
         except Exception as e:
             stack = traceback.format_exc()
             raise SourceCodeCompileError(
@@ -283,6 +286,106 @@ class SourceCode(object):
         return "%s(%r)" % (self.__class__.__name__, self.source)
 
 
+class CompiledCodeCache(object):
+    """Manages a cache of compiled python code objects.
+
+    Code objects are cached in memory, keyed by a hash of the source, filename
+    and compile flags. If `config.compiled_code_cache_path` is set, they are
+    also written to disk, so that other processes (such as every shell started
+    from the same context) don't need to compile the same package commands
+    again. Cache files are stored under a subdirectory per python version,
+    since marshalled code objects are specific to the interpreter.
+    """
+    def __init__(self):
+        self.code_objects = {}
+
+    def compile(self, source, filename, flags=0):
+        """Compile python source, or return the cached result.
+
+        Args:
+            source (str): Source code to compile in 'exec' mode.
+            filename (str): Filename associated with the code.
+            flags (int): `__future__` compiler flags. Flags are not inherited
+                from the calling code.
+
+        Returns:
+            Code object.
+        """
+        from hashlib import sha1
+
+        key_str = "%s\n%d\n%s" % (filename, flags, source)
+        if not isinstance(key_str, bytes):
+            key_str = key_str.encode("utf-8")
+        key = sha1(key_str).hexdigest()
+
+        pyc = self.code_objects.get(key)
+        if pyc is not None:
+            return pyc
+
+        filepath = self._get_filepath(key)
+        if filepath:
+            pyc = self._read(filepath)
+
+        if pyc is None:
+            pyc = compile(source, filename, 'exec', flags, True)
+
+            if filepath:
+                self._write(filepath, pyc)
+
+        self.code_objects[key] = pyc
+        return pyc
+
+    def _get_filepath(self, key):
+        from rez.config import config  # avoiding circular import
+
+        path = config.compiled_code_cache_path
+        if not path:
+            return None
+
+        subdir = "%s-%d%d" % ((platform.python_implementation().lower(),)
+                              + tuple(sys.version_info[:2]))
+        return os.path.join(os.path.expanduser(path), subdir, key[:2], key)
+
+    def _read(self, filepath):
+        try:
+            with open(filepath, "rb") as f:
+                data = f.read()
+        except (IOError, OSError):
+            return None
+
+        if not data.startswith(self.magic):
+            return None
+
+        try:
+            return marshal.loads(data[len(self.magic):])
+        except (EOFError, ValueError, TypeError):
+            print_debug("Corrupt compiled code cache file: %s" % filepath)
+            return None
+
+    def _write(self, filepath, pyc):
+        from rez.vendor.atomicwrites import atomic_write
+
+        try:
+            path = os.path.dirname(filepath)
+            if not os.path.exists(path):
+                os.makedirs(path)
+
+            with atomic_write(filepath, mode="wb", overwrite=True) as f:
+                f.write(self.magic + marshal.dumps(pyc))
+        except (IOError, OSError) as e:
+            print_debug("Failed to write compiled code cache file %s: %s"
+                        % (filepath, str(e)))
+
+    @cached_property
+    def magic(self):
+        try:
+            from importlib.util import MAGIC_NUMBER
+            return MAGIC_NUMBER
+        except ImportError:  # py2
+            import imp
+            return imp.get_magic()
+
+
 class IncludeModuleManager(object):
     """Manages a cache of modules imported via '@include' decorator.
     """
@@ -354,5 +457,6 @@ class IncludeModuleManager(object):
         return module
 
 
-# singleton
+# singletons
+compiled_code_cache = CompiledCodeCache()
 include_module_manager = IncludeModuleManager()
@@ -0,0 +1,163 @@
+"""
+Lightweight event recording, exported in Chrome trace-event format.
+
+The resulting json files can be opened in chrome://tracing, or in
+https://ui.perfetto.dev.
+"""
+from contextlib import contextmanager
+import threading
+import time
+import os
+
+from rez.utils import json
+from rez.vendor.six import six
+
+
+class Tracer(object):
+    """Records timed events.
+
+    Events are stored in Chrome's 'trace event' format, where timestamps and
+    durations are in microseconds, relative to the creation of the tracer.
+
+    Example:
+
+        >>> tracer = Tracer()
+        >>> with tracer.span("extract", "phase"):
+        >>>     do_something()
+        >>> tracer.instant("fail", "solver", reason="conflict")
+        >>> tracer.save("out.json")
+    """
+    def __init__(self, name=None):
+        """Create a tracer.
+
+        Args:
+            name (str): Process name to display in trace viewers.
+        """
+        self.name = name or "rez"
+        self.events = []
+        self.start_time = time.time()
+        self.pid = os.getpid()
+
+    def __nonzero__(self):
+        return True
+
+    __bool__ = __nonzero__  # py3 compat
+
+    @contextmanager
+    def span(self, name, category, **args):
+        """Record the duration of a block of code as a single event."""
+        t = time.time()
+        try:
+            yield
+        finally:
+            self.add_span(name, category, t, time.time() - t, **args)
+
+    def add_span(self, name, category, start, duration, **args):
+        """Add a complete event.
+
+        Args:
+            name (str): Event name, eg 'intersect'.
+            category (str): Event category, eg 'scope'.
+            start (float): Epoch time the event started at.
+            duration (float): Duration of the event in seconds.
+            args: Extra event data. Values that are not json-compatible are
+                converted to string on export.
+        """
+        self.events.append({
+            "name": name,
+            "cat": category,
+            "ph": 'X',
+            "ts": self._us(start - self.start_time),
+            "dur": self._us(duration),
+            "tid": threading.current_thread().ident,
+            "args": args
+        })
+
+    def instant(self, name, category, **args):
+        """Add an event that has no duration."""
+        self.events.append({
+            "name": name,
+            "cat": category,
+            "ph": 'i',
+            "s": 't',
+            "ts": self._us(time.time() - self.start_time),
+            "tid": threading.current_thread().ident,
+            "args": args
+        })
+
+    def package_loaded(self, uri, start, duration, source=None):
+        """Record a package load.
+
+        This has the signature expected by
+        `PackageRepositoryGlobalStats.load_listeners`.
+        """
+        self.add_span("load", "package", start, duration,
+                      uri=uri, source=source)
+
+    def summary(self, key="family"):
+        """Summarize total event durations.
+
+        Args:
+            key (str): Event arg to group by, in addition to event category
+                and name.
+
+        Returns:
+            List of (category, name, key-value, count, seconds) tuples,
+            sorted by descending seconds.
+        """
+        totals = {}
+
+        for event in self.events:
+            if event["ph"] != 'X':
+                continue
+
+            value = event["args"].get(key)
+            k = (event["cat"], event["name"], None if value is None else str(value))
+            entry = totals.setdefault(k, [0, 0])
+            entry[0] += 1
+            entry[1] += event["dur"]
+
+        rows = [
+            (cat, name, value, count, us / 1e6)
+            for (cat, name, value), (count, us) in totals.items()
+        ]
+        return sorted(rows, key=lambda x: x[-1], reverse=True)
+
+    def to_dict(self):
+        events = [{
+            "name": "process_name",
+            "ph": 'M',
+            "pid": self.pid,
+            "args": {"name": self.name}
+        }]
+
+        for event in self.events:
+            event = event.copy()
+            event["pid"] = self.pid
+            event["args"] = dict(
+                (k, _jsonable(v)) for k, v in event["args"].items()
+            )
+            events.append(event)
+
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms"
+        }
+
+    def save(self, filepath):
+        """Write the trace to a json file."""
+        with open(filepath, 'w') as f:
+            f.write(json.dumps(self.to_dict()))
+
+    @classmethod
+    def _us(cls, secs):
+        return int(secs * 1e6)
+
+
+_json_types = (bool, float) + six.integer_types + six.string_types
+
+
+def _jsonable(value):
+    if value is None or isinstance(value, _json_types):
+        return value
+    return str(value)
@@ -11,7 +11,7 @@ from rez.utils.logging_ import print_warning
 from rez.utils.base26 import create_unique_base26_symlink
 from rez.utils.colorize import Printer, warning
 from rez.utils.filesystem import safe_makedirs, copy_or_replace, \
-    make_path_writable, get_existing_path, forceful_rmtree
+    make_shared_path_writable, get_existing_path, forceful_rmtree
 from rez.utils.sourcecode import IncludeModuleManager
 from rez.utils.filesystem import TempDirs
 from rez.package_test import PackageTestRunner, PackageTestResults
@@ -21,12 +21,18 @@ import json
 import shutil
 import os
 import os.path
+import threading
 
 
 class LocalBuildProcess(BuildProcessHelper):
     """The default build process.
 
-    This process builds a package's variants sequentially and on localhost.
+    This process builds a package's variants on localhost. Variants are built
+    sequentially, or concurrently if `max_workers` is greater than one. In the
+    latter case, the output of each variant's build is written to a 'build.log'
+    file in its build directory, and the steps that resolve build environments,
+    run tests and install into the package repository are run one variant at a
+    time.
     """
 
     # see `self._run_tests`
@@ -40,9 +46,14 @@ class LocalBuildProcess(BuildProcessHelper):
         super(LocalBuildProcess, self).__init__(*nargs, **kwargs)
         self.ran_test_names = set()
         self.all_test_results = PackageTestResults()
+        self.build_logs = []
+
+        # serializes the non-concurrent steps of variant builds
+        self._lock = threading.RLock()
 
     def build(self, install_path=None, clean=False, install=False, variants=None):
         self._print_header("Building %s..." % self.package.qualified_name)
+        self.build_logs = []
 
         # build variants
         num_visited, build_env_scripts = self.visit_variants(
@@ -61,6 +72,8 @@ class LocalBuildProcess(BuildProcessHelper):
             self._print('\n'.join(build_env_scripts))
             self._print('')
 
+        self._print_build_logs()
+
         if self.all_test_results.num_tests:
             self.all_test_results.print_summary()
             print('')
@@ -69,6 +82,7 @@ class LocalBuildProcess(BuildProcessHelper):
 
     def release(self, release_message=None, variants=None):
         self._print_header("Releasing %s..." % self.package.qualified_name)
+        self.build_logs = []
 
         # test that we're in a state to release
         self.pre_release()
@@ -119,6 +133,8 @@ class LocalBuildProcess(BuildProcessHelper):
         else:
             self._print(msg)
 
+        self._print_build_logs()
+
         if self.all_test_results.num_tests:
             print('')
             self.all_test_results.print_summary()
@@ -153,7 +169,7 @@ class LocalBuildProcess(BuildProcessHelper):
                                      topmost_path=install_path)
 
         if last_dir and config.make_package_temporarily_writable:
-            ctxt = make_path_writable(last_dir)
+            ctxt = make_shared_path_writable(last_dir)
         else:
             ctxt = with_noop()
 
@@ -161,7 +177,8 @@ class LocalBuildProcess(BuildProcessHelper):
             if install:
                 # inform package repo that a variant is about to be built/installed
                 pkg_repo = package_repository_manager.get_repository(install_path)
-                pkg_repo.pre_variant_install(variant.resource)
+                with self._lock:
+                    pkg_repo.pre_variant_install(variant.resource)
 
                 if not os.path.exists(variant_install_path):
                     safe_makedirs(variant_install_path)
@@ -209,11 +226,15 @@ class LocalBuildProcess(BuildProcessHelper):
             })
             re_evaluated_variant = re_evaluated_package.get_variant(variant.index)
 
-            # create build environment (also creates build.rxt file)
-            context, rxt_filepath = self.create_build_context(
-                variant=re_evaluated_variant,
-                build_type=build_type,
-                build_path=variant_build_path)
+            # create build environment (also creates build.rxt file). When
+            # variants are built concurrently, resolves are still done one at a
+            # time, so that their output is not interleaved
+            #
+            with self._lock:
+                context, rxt_filepath = self.create_build_context(
+                    variant=re_evaluated_variant,
+                    build_type=build_type,
+                    build_path=variant_build_path)
 
             # list of extra files (build.rxt etc) that are installed if an
             # installation is taking place
@@ -241,20 +262,36 @@ class LocalBuildProcess(BuildProcessHelper):
             build_system_name = self.build_system.name()
             self._print("\nInvoking %s build system...", build_system_name)
 
-            build_result = self.build_system.build(
-                context=context,
-                variant=variant,
-                build_path=variant_build_path,
-                install_path=variant_install_path,
-                install=install,
-                build_type=build_type)
+            if self.max_workers > 1:
+                log_filepath = os.path.join(variant_build_path, "build.log")
+                self.build_logs.append((variant, log_filepath))
+                self._print("Writing build output of variant %s to %s",
+                            self._n_of_m(variant), log_filepath)
+
+                log_ctxt = self.build_system.log_output(log_filepath)
+            else:
+                log_filepath = None
+                log_ctxt = with_noop()
+
+            with log_ctxt:
+                build_result = self.build_system.build(
+                    context=context,
+                    variant=variant,
+                    build_path=variant_build_path,
+                    install_path=variant_install_path,
+                    install=install,
+                    build_type=build_type)
 
             if not build_result.get("success"):
                 # delete the possibly partially installed variant payload
                 if install:
                     self._rmtree(variant_install_path)
 
-                raise BuildError("The %s build system failed." % build_system_name)
+                msg = "The %s build system failed." % build_system_name
+                if log_filepath:
+                    msg += " See %s" % log_filepath
+
+                raise BuildError(msg)
 
             if install:
                 # add some installation details to build result
@@ -276,7 +313,8 @@ class LocalBuildProcess(BuildProcessHelper):
                 # Install include modules. Note that this doesn't need to be done
                 # multiple times, but for subsequent variants it has no effect.
                 #
-                self._install_include_modules(install_path)
+                with self._lock:
+                    self._install_include_modules(install_path)
 
             return build_result
 
@@ -307,6 +345,15 @@ class LocalBuildProcess(BuildProcessHelper):
             with open(sha1_filepath, "w") as f:  # overwrite if exists
                 f.write(uuid)
 
+    def _print_build_logs(self):
+        if not self.build_logs:
+            return
+
+        self._print("\nThe build output of each variant was written to:")
+        for variant, filepath in self.build_logs:
+            self._print("%s: %s", self._n_of_m(variant), filepath)
+        self._print('')
+
     def _rmtree(self, path):
         try:
             forceful_rmtree(path)
@@ -326,7 +373,8 @@ class LocalBuildProcess(BuildProcessHelper):
         def cancel_variant_install():
             if install:
                 pkg_repo = package_repository_manager.get_repository(install_path)
-                pkg_repo.on_variant_install_cancelled(variant.resource)
+                with self._lock:
+                    pkg_repo.on_variant_install_cancelled(variant.resource)
 
         try:
             build_result = self._build_variant_base(
@@ -344,11 +392,12 @@ class LocalBuildProcess(BuildProcessHelper):
         if install:
             # run any tests that are configured to run pre-install
             try:
-                self._run_tests(
-                    variant,
-                    run_on=["pre_install"],
-                    package_install_path=build_result["package_install_path"]
-                )
+                with self._lock:
+                    self._run_tests(
+                        variant,
+                        run_on=["pre_install"],
+                        package_install_path=build_result["package_install_path"]
+                    )
             except PackageTestError:
                 # delete the installed variant payload
                 self._rmtree(build_result["variant_install_path"])
@@ -359,7 +408,8 @@ class LocalBuildProcess(BuildProcessHelper):
                 raise
 
             # install variant into package repository (ie update target package.py)
-            variant.install(install_path)
+            with self._lock:
+                variant.install(install_path)
 
         return build_result.get("build_env_script")
 
@@ -367,7 +417,8 @@ class LocalBuildProcess(BuildProcessHelper):
         release_path = self.package.config.release_packages_path
 
         # test if variant has already been released
-        variant_ = variant.install(release_path, dry_run=True)
+        with self._lock:
+            variant_ = variant.install(release_path, dry_run=True)
         if variant_ is not None:
             print_warning(
                 "Skipping %s: destination variant already exists (%r)",
@@ -377,7 +428,8 @@ class LocalBuildProcess(BuildProcessHelper):
 
         def cancel_variant_install():
             pkg_repo = package_repository_manager.get_repository(release_path)
-            pkg_repo.on_variant_install_cancelled(variant.resource)
+            with self._lock:
+                pkg_repo.on_variant_install_cancelled(variant.resource)
 
         if variant.index is not None:
             self._print_header("Releasing variant %s..." % self._n_of_m(variant))
@@ -398,11 +450,12 @@ class LocalBuildProcess(BuildProcessHelper):
 
         # run any tests that are configured to run pre-install
         try:
-            self._run_tests(
-                variant,
-                run_on=["pre_release"],
-                package_install_path=build_result["package_install_path"]
-            )
+            with self._lock:
+                self._run_tests(
+                    variant,
+                    run_on=["pre_release"],
+                    package_install_path=build_result["package_install_path"]
+                )
         except PackageTestError:
             # delete the installed variant payload
             self._rmtree(build_result["variant_install_path"])
@@ -415,7 +468,8 @@ class LocalBuildProcess(BuildProcessHelper):
         # add release info to variant, and install it into package repository
         release_data = self.get_release_data()
         release_data["release_message"] = release_message
-        variant_ = variant.install(release_path, overrides=release_data)
+        with self._lock:
+            variant_ = variant.install(release_path, overrides=release_data)
         return variant_
 
     def _run_tests(self, variant, run_on, package_install_path):
@@ -179,7 +179,8 @@ class CMakeBuildSystem(BuildSystem):
             block=True,
             cwd=build_path,
             actions_callback=actions_callback,
-            post_actions_callback=post_actions_callback
+            post_actions_callback=post_actions_callback,
+            **self.get_shell_output_args()
         )
 
         ret = {}
@@ -231,7 +232,8 @@ class CMakeBuildSystem(BuildSystem):
             block=True,
             cwd=build_path,
             actions_callback=actions_callback,
-            post_actions_callback=post_actions_callback
+            post_actions_callback=post_actions_callback,
+            **self.get_shell_output_args()
         )
 
         if not retcode and install and "install" not in cmd:
@@ -244,7 +246,8 @@ class CMakeBuildSystem(BuildSystem):
                 block=True,
                 cwd=build_path,
                 actions_callback=actions_callback,
-                post_actions_callback=post_actions_callback
+                post_actions_callback=post_actions_callback,
+                **self.get_shell_output_args()
             )
 
         ret["success"] = (not retcode)
@@ -203,7 +203,8 @@ class CustomBuildSystem(BuildSystem):
             block=True,
             cwd=build_path,
             actions_callback=_actions_callback,
-            post_actions_callback=post_actions_callback
+            post_actions_callback=post_actions_callback,
+            **self.get_shell_output_args()
         )
 
         ret["success"] = (not retcode)
@@ -9,12 +9,12 @@ import errno
 import time
 import shutil
 
-from rez.package_repository import PackageRepository
+from rez.package_repository import PackageRepository, package_repo_stats
 from rez.package_resources import PackageFamilyResource, VariantResourceHelper, \
     PackageResourceHelper, package_pod_schema, \
     package_release_keys, package_build_only_keys
 from rez.serialise import clear_file_caches, open_file_for_write, load_from_file, \
-    FileFormat
+    FileFormat, file_load_stats
 from rez.package_serialise import dump_package_data
 from rez.exceptions import PackageMetadataError, ResourceError, RezSystemError, \
     ConfigurationError, PackageRepositoryError
@@ -26,9 +26,10 @@ from rez.utils.memcached import memcached, pool_memcached_connections
 from rez.utils.filesystem import make_path_writable, \
     canonical_path, is_subdirectory
 from rez.utils.platform_ import platform_
-from rez.utils.yaml import load_yaml
+from rez.utils import json
 from rez.config import config
 from rez.backport.lru_cache import lru_cache
+from rez.vendor.atomicwrites import atomic_write
 from rez.vendor.schema.schema import Schema, Optional, And, Use, Or
 from rez.vendor.six import six
 from rez.vendor.version.version import Version, VersionRange
@@ -66,6 +67,27 @@ def check_format_version(filename, data):
                 "format version (%d)" % (filename, format_version_, format_version))
 
 
+def _load_package_file(filepath, format_, disable_memcache=False):
+    """Load a package definition file, recording the load in
+    `package_repo_stats`.
+    """
+    with package_repo_stats.package_loading(filepath) as info:
+        num_file_reads = file_load_stats.num_file_reads
+
+        data = load_from_file(
+            filepath,
+            format_,
+            disable_memcache=disable_memcache
+        )
+
+        if file_load_stats.num_file_reads > num_file_reads:
+            info["source"] = "disk"
+        else:
+            info["source"] = "memcache"
+
+    return data
+
+
 # ------------------------------------------------------------------------------
 # utilities
 # ------------------------------------------------------------------------------
@@ -154,6 +176,17 @@ class FileSystemPackageResource(PackageResourceHelper):
             return os.path.getmtime(self.filepath)
         return None
 
+    @cached_property
+    def timestamp(self):
+        # use the family's timestamp index if possible, this avoids loading
+        # the package definition file
+        if "_data" not in self.__dict__:
+            timestamp = self._repository._get_indexed_timestamp(self)
+            if timestamp is not None:
+                return timestamp
+
+        return self._timestamp
+
     @property
     def base(self):
         # Note: '_redirected_base' is a special attribute set by the build
@@ -189,7 +222,7 @@ class FileSystemPackageResource(PackageResourceHelper):
             raise PackageDefinitionFileMissing(
                 "Missing package definition file: %r" % self)
 
-        data = load_from_file(
+        data = _load_package_file(
             self.filepath,
             self.file_format,
             disable_memcache=self._repository.disable_memcache
@@ -331,7 +364,7 @@ class FileSystemCombinedPackageFamilyResource(PackageFamilyResource):
 
     def _load(self):
         format_ = FileFormat[self.ext]
-        data = load_from_file(
+        data = _load_package_file(
             self.filepath,
             format_,
             disable_memcache=self._repository.disable_memcache
@@ -464,10 +497,12 @@ class FileSystemPackageRepository(PackageRepository):
     schema_dict = {"file_lock_timeout": int,
                    "file_lock_dir": Or(None, str),
                    "file_lock_type": Or("default", "link", "mkdir"),
-                   "package_filenames": [basestring]}
+                   "package_filenames": [basestring],
+                   "timestamp_index": bool}
 
     building_prefix = ".building"
     ignore_prefix = ".ignore"
+    timestamp_index_filename = ".timestamps.json"
 
     package_file_mode = (
         None if os.name == "nt" else
@@ -501,6 +536,7 @@ class FileSystemPackageRepository(PackageRepository):
         local_settings = {}
         settings_filepath = os.path.join(location, "settings.yaml")
         if os.path.exists(settings_filepath):
+            from rez.utils.yaml import load_yaml
             local_settings.update(load_yaml(settings_filepath))
 
         self.disable_pkg_ignore = disable_pkg_ignore
@@ -527,6 +563,7 @@ class FileSystemPackageRepository(PackageRepository):
         self.get_packages = lru_cache(maxsize=None)(self._get_packages)
         self.get_variants = lru_cache(maxsize=None)(self._get_variants)
         self.get_file = lru_cache(maxsize=None)(self._get_file)
+        self.get_timestamp_index = lru_cache(maxsize=None)(self._get_timestamp_index)
 
         # decorate with memcachemed memoizers unless told otherwise
         if not self.disable_memcache:
@@ -974,6 +1011,7 @@ class FileSystemPackageRepository(PackageRepository):
         self.get_packages.cache_clear()
         self.get_variants.cache_clear()
         self.get_file.cache_clear()
+        self.get_timestamp_index.cache_clear()
 
         if not self.disable_memcache:
             self._get_family_dirs.forget()
@@ -990,6 +1028,56 @@ class FileSystemPackageRepository(PackageRepository):
 
         return path
 
+    def update_timestamp_index(self, pkg_name, timestamps=None):
+        """Update the release timestamp index of a package family.
+
+        The index is a small file in the family directory, mapping package
+        versions to their release timestamp. It allows timestamped resolves,
+        and the 'soft_timestamp' package orderer, to read package timestamps
+        without loading package definition files.
+
+        The index is updated automatically when a variant is installed. Use
+        this method to create the index for packages released before the index
+        existed. Packages missing from the index are still supported - their
+        definition file is loaded to determine the timestamp.
+
+        Args:
+            pkg_name (str): Package family name.
+            timestamps (dict): {version: timestamp} entries to add to the
+                index. If None, the index is rebuilt from every package in
+                the family.
+
+        Returns:
+            int: Number of entries in the index, or -1 if the family is not
+            a directory (eg, a 'combined' package file).
+        """
+        family_path = os.path.join(self.location, pkg_name)
+        if not os.path.isdir(family_path):
+            return -1
+
+        filepath = os.path.join(family_path, self.timestamp_index_filename)
+
+        if timestamps is None:
+            index = {}
+            family = self.get_package_family(pkg_name)
+
+            for package in self.iter_packages(family):
+                if package.timestamp:
+                    index[package.get("version") or ''] = package.timestamp
+        else:
+            index = self._read_timestamp_index(family_path)
+            for version, timestamp in timestamps.items():
+                index[str(version)] = int(timestamp)
+
+        content = json.dumps({"timestamps": index}, indent=0, sort_keys=True)
+
+        with make_path_writable(family_path):
+            with atomic_write(filepath, overwrite=True) as f:
+                f.write(content)
+
+        self.get_timestamp_index.cache_clear()
+        return len(index)
+
     # -- internal
 
     def _get_family_dirs__key(self):
@@ -1083,6 +1171,30 @@ class FileSystemPackageRepository(PackageRepository):
 
         return list(dirs)
 
+    def _get_timestamp_index(self, pkg_name):
+        if not _settings.timestamp_index:
+            return {}
+
+        family_path = os.path.join(self.location, pkg_name)
+        return self._read_timestamp_index(family_path)
+
+    def _read_timestamp_index(self, family_path):
+        filepath = os.path.join(family_path, self.timestamp_index_filename)
+
+        try:
+            with open(filepath) as f:
+                data = json.loads(f.read())
+            return data["timestamps"]
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            return {}
+
+    def _get_indexed_timestamp(self, package_resource):
+        index = self.get_timestamp_index(package_resource.name)
+        if not index:
+            return None
+
+        return index.get(package_resource.get("version") or '')
+
     # True if `path` contains package.py or similar
     def _is_valid_package_directory(self, path):
         return bool(self._get_file(path, "package")[0])
@@ -1419,6 +1531,18 @@ class FileSystemPackageRepository(PackageRepository):
         except:
             pass
 
+        # record the release timestamp, so that timestamped resolves don't
+        # need to load this package to know when it was released
+        if variant_version and _settings.timestamp_index:
+            try:
+                self.update_timestamp_index(
+                    variant_name,
+                    {variant_version: package_data["timestamp"]}
+                )
+            except (IOError, OSError) as e:
+                print_warning("Could not update timestamp index of %r: %s"
+                              % (family_path, str(e)))
+
         self._on_changed(variant_name)
 
         # load new variant. Note that we load it from a copy of this repo, with
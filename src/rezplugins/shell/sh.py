@@ -6,7 +6,9 @@ import os.path
 import pipes
 import subprocess
 from rez.config import config
+from rez.util import which
 from rez.utils.execution import Popen
+from rez.utils.host_facts import host_facts
 from rez.utils.platform_ import platform_
 from rez.shells import UnixShell
 from rez.rex import EscapedString
@@ -34,6 +36,15 @@ class SH(UnixShell):
             cls.syspaths = config.standard_system_paths
             return cls.syspaths
 
+        # detecting system paths means spawning a shell, so the result is
+        # cached per host, and refreshed if the shell executable changes
+        filepaths = [x for x in [which(cls.name())] if x]
+        cls.syspaths = host_facts.get("syspaths.%s" % cls.name(),
+                                      cls._detect_syspaths, filepaths)
+        return cls.syspaths
+
+    @classmethod
+    def _detect_syspaths(cls):
         # detect system paths using registry
         cmd = "cmd=`which %s`; unset PATH; $cmd %s %s 'echo __PATHS_ $PATH'" \
               % (cls.name(), cls.norc_arg, cls.command_arg)
@@ -50,8 +61,8 @@ class SH(UnixShell):
         for path in os.defpath.split(os.path.pathsep):
             if path not in paths:
                 paths.append(path)
-        cls.syspaths = [x for x in paths if x]
-        return cls.syspaths
+
+        return [x for x in paths if x]
 
     @classmethod
     def startup_capabilities(cls, rcfile=False, norc=False, stdin=False,